@@ -0,0 +1,5 @@
+"""Ponto de entrada ASGI (modo assíncrono opcional, ver assincrono.py): `uvicorn asgi:app --workers N`."""
+from app import create_app
+from assincrono import AplicacaoAssincrona
+
+app = AplicacaoAssincrona(create_app())
@@ -0,0 +1,347 @@
+from extensions import db, cache, limiter
+from estatisticas import (
+    consulta_resumo, consulta_metas, consulta_serie_mensal, montar_estatisticas, chave_estatisticas,
+    formatar_serie_mensal, consulta_distribuicao_categorias, formatar_distribuicao
+)
+from listagem import consulta_pagina, dividir_pagina, transacao_para_json
+from filtros import FiltroTransacoes
+from identidade import consulta_usuario, usuario_em_cache, guardar_usuario
+from exportacao import CABECALHO_CSV, linha_csv
+from banco import pragmas_sqlite, registrar_pragmas
+from rotas.dashboard import (
+    dashboard_para_json, validadores_estatisticas, preparar_resposta_estatisticas, parametros_categorias
+)
+from flask import Response
+from flask_limiter import RateLimitExceeded
+from itsdangerous import BadSignature
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from werkzeug.wrappers import Request
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+import asyncio
+import csv
+import io
+import sys
+import time
+
+# Drivers asyncio de cada banco suportado
+DRIVERS_ASSINCRONOS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+
+def criar_engine_assincrono(app):
+    """
+    Engine asyncio para o mesmo banco do engine principal (aiosqlite no SQLite,
+    com os mesmos PRAGMAs; asyncpg no PostgreSQL) e as mesmas opções de pool.
+    """
+    with app.app_context():
+        url = db.engine.url
+    backend = url.get_backend_name()
+    if backend not in DRIVERS_ASSINCRONOS:
+        raise ValueError(f'Modo assíncrono não suporta o banco {backend!r}.')
+    engine = create_async_engine(url.set(drivername=DRIVERS_ASSINCRONOS[backend]), **app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+    if backend == 'sqlite':
+        registrar_pragmas(engine.sync_engine, pragmas_sqlite(app.config))
+    return engine
+
+
+def environ_asgi(scope):
+    """Environ WSGI (sem corpo) de uma requisição ASGI, para ler args, cookies e cabeçalhos com o Request do werkzeug."""
+    servidor = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode().decode('latin1'),
+        'PATH_INFO': scope['path'].encode().decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('latin1'),
+        'SERVER_NAME': servidor[0],
+        'SERVER_PORT': str(servidor[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': scope['client'][0] if scope.get('client') else '',
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+    }
+    for nome, valor in scope['headers']:
+        nome = nome.decode('latin1').upper().replace('-', '_')
+        chave = nome if nome in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{nome}'
+        environ[chave] = f'{environ[chave]},{valor.decode("latin1")}' if chave in environ else valor.decode('latin1')
+    return environ
+
+
+def executar_wsgi(app, environ):
+    """Roda o app WSGI numa thread do pool e junta o corpo. Retorna (status, cabeçalhos, corpo)."""
+    inicio = {}
+
+    def start_response(status, cabecalhos, exc_info=None):
+        inicio['status'], inicio['cabecalhos'] = status, cabecalhos
+
+    iteravel = app(environ, start_response)
+    try:
+        corpo = b''.join(iteravel)
+    finally:
+        if hasattr(iteravel, 'close'):
+            iteravel.close()
+    return int(inicio['status'].split(' ', 1)[0]), inicio['cabecalhos'], corpo
+
+
+async def enviar_resposta(send, resposta):
+    """Envia um Response do Flask/werkzeug (corpo já pronto) pela conexão ASGI."""
+    await send({
+        'type': 'http.response.start',
+        'status': resposta.status_code,
+        'headers': [(nome.encode('latin1'), valor.encode('latin1')) for nome, valor in resposta.headers.items()],
+    })
+    await send({'type': 'http.response.body', 'body': resposta.get_data()})
+
+
+class AplicacaoAssincrona:
+    """
+    Modo de execução ASGI opcional (`uvicorn asgi:app`). As rotas de leitura
+    pesada (/api/dashboard, /api/stats/*, /api/transacoes e /export/csv) são
+    atendidas aqui com o engine asyncio do SQLAlchemy, e as consultas
+    independentes rodam em paralelo com asyncio.gather. Enquanto uma consulta
+    espera o banco, o worker atende outras requisições. As demais rotas
+    (formulários, escrita, PDF) e as requisições sem sessão válida vão para o
+    Flask, que roda num pool de ASGI_THREADS_WSGI threads por worker (a resposta
+    é montada inteira na thread antes de ser enviada).
+
+    Sessão, limites de requisição (mesmo armazenamento e chaves do
+    Flask-Limiter), cache de estatísticas e cache de identidade são os mesmos
+    do Flask. O Server-Timing da instrumentação vale só para as rotas do Flask.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.threads_wsgi = ThreadPoolExecutor(app.config['ASGI_THREADS_WSGI'], thread_name_prefix='wsgi')
+        self.engine = criar_engine_assincrono(app)
+        self.sessoes = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.rotas = {
+            '/api/dashboard': ('dashboard.api_dashboard', self.dashboard),
+            '/api/stats/mensal': ('dashboard.api_stats_mensal', self.stats_mensal),
+            '/api/stats/categorias': ('dashboard.api_stats_categorias', self.stats_categorias),
+            '/api/transacoes': ('transacoes.api_transacoes', self.transacoes),
+            '/export/csv': ('exportacoes.export_csv', self.export_csv),
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.ciclo_de_vida(receive, send)
+        if scope['type'] != 'http':
+            return await self.recusar(scope, receive, send)
+        rota = self.rotas.get(scope['path']) if scope['method'] == 'GET' else None
+        if rota is None:
+            return await self.wsgi(scope, receive, send)
+
+        endpoint, tratar = rota
+        requisicao = Request(environ_asgi(scope))
+        if endpoint == 'transacoes.api_transacoes' and requisicao.args.get('html'):
+            # O fragmento HTML usa url_for e precisa do contexto de requisição do Flask
+            return await self.wsgi(scope, receive, send)
+
+        with self.app.app_context():
+            usuario = await self.usuario_da_sessao(requisicao)
+            if usuario is None:
+                # Sem sessão (ou com lembrar-me): o Flask-Login decide (redireciona para o login)
+                return await self.wsgi(scope, receive, send)
+            # Depois do desvio para o Flask, que já conta a requisição no before_request
+            if not await self.dentro_do_limite(scope):
+                resposta = self.app.json.response({'erro': 'Muitas requisições.'})
+                resposta.status_code = 429
+                return await enviar_resposta(send, resposta)
+            await tratar(requisicao, usuario, send)
+
+    async def wsgi(self, scope, receive, send):
+        """Entrega a requisição ao Flask, com o corpo já lido, numa thread do pool."""
+        corpo = bytearray()
+        while True:
+            mensagem = await receive()
+            if mensagem['type'] == 'http.disconnect':
+                return
+            corpo += mensagem.get('body', b'')
+            if not mensagem.get('more_body'):
+                break
+        environ = environ_asgi(scope)
+        environ.update({
+            'wsgi.input': io.BytesIO(bytes(corpo)),
+            'wsgi.errors': sys.stderr,
+            'wsgi.version': (1, 0),
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        })
+        status, cabecalhos, conteudo = await asyncio.get_running_loop().run_in_executor(
+            self.threads_wsgi, executar_wsgi, self.app, environ
+        )
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(nome.encode('latin1'), valor.encode('latin1')) for nome, valor in cabecalhos],
+        })
+        await send({'type': 'http.response.body', 'body': conteudo})
+
+    async def ciclo_de_vida(self, receive, send):
+        while True:
+            mensagem = await receive()
+            if mensagem['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensagem['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                self.threads_wsgi.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def dentro_do_limite(self, scope):
+        """
+        Aplica os limites do Flask-Limiter como o before_request dele faria na
+        rota do Flask: mesmo endpoint, mesma key_func, mesmo prefixo e mesmas
+        isenções, logo o mesmo contador para a rota servida aqui ou pelo Flask.
+        """
+        if not self.app.config.get('RATELIMIT_ENABLED', True):
+            return True
+
+        def verificar():
+            with self.app.request_context(environ_asgi(scope)):
+                try:
+                    limiter._check_request_limit()
+                except RateLimitExceeded:
+                    return False
+                return True
+
+        # O armazenamento (SQLite local ou Redis) é síncrono: roda fora do loop
+        return await asyncio.to_thread(verificar)
+
+    async def recusar(self, scope, receive, send):
+        """
+        O app não atende WebSocket: responde 404 quando o servidor aceita
+        resposta HTTP na negociação, senão fecha a conexão. Outros tipos de
+        conexão são recusados com erro, como pede a especificação ASGI.
+        """
+        if scope['type'] != 'websocket':
+            raise ValueError(f"Tipo de conexão ASGI não suportado: {scope['type']!r}.")
+        mensagem = await receive()
+        if mensagem['type'] != 'websocket.connect':
+            return
+        if 'websocket.http.response' in scope.get('extensions', {}):
+            await send({'type': 'websocket.http.response.start', 'status': 404, 'headers': []})
+            await send({'type': 'websocket.http.response.body', 'body': b''})
+        else:
+            await send({'type': 'websocket.close', 'code': 1000})
+
+    async def usuario_da_sessao(self, requisicao):
+        """Usuário logado pelo cookie de sessão do Flask, pelo cache de identidade ou por uma consulta assíncrona."""
+        cookie = requisicao.cookies.get(self.app.config['SESSION_COOKIE_NAME'])
+        serializador = self.app.session_interface.get_signing_serializer(self.app)
+        if not cookie or serializador is None:
+            return None
+        try:
+            sessao = serializador.loads(cookie, max_age=int(self.app.permanent_session_lifetime.total_seconds()))
+        except BadSignature:
+            return None
+        if '_user_id' not in sessao:
+            return None
+
+        usuario_id = int(sessao['_user_id'])
+        usuario = usuario_em_cache(usuario_id, sessao.get('ultima_escrita', 0))
+        if usuario is None:
+            guardado_em = time.time()
+            async with self.sessoes() as sessao_banco:
+                linha = (await sessao_banco.execute(consulta_usuario(usuario_id))).first()
+            usuario = guardar_usuario(usuario_id, linha, guardado_em)
+        return usuario
+
+    async def linhas(self, stmt):
+        """Todas as linhas de uma consulta, numa sessão (e conexão) própria: várias podem rodar ao mesmo tempo."""
+        async with self.sessoes() as sessao:
+            return (await sessao.execute(stmt)).all()
+
+    async def entidades(self, stmt):
+        async with self.sessoes() as sessao:
+            return (await sessao.scalars(stmt)).all()
+
+    async def dashboard(self, requisicao, usuario, send):
+        filtro = FiltroTransacoes.de_args(usuario.id, requisicao.args)
+        limite = self.app.config['TAMANHO_PAGINA']
+        consultas = [self.entidades(consulta_pagina(filtro, limite=limite))]
+        if filtro.precisa_totais:
+            consultas.append(self.linhas(filtro.consulta_totais()))
+
+        # Cache do Flask-Caching: o mesmo das estatísticas do dashboard síncrono
+        chave = chave_estatisticas(usuario)
+        calculadas = cache.get(chave)
+        if calculadas is None:
+            consultas += [
+                self.linhas(consulta_resumo(usuario.id).statement),
+                self.linhas(consulta_metas(usuario.id).statement),
+                self.linhas(consulta_serie_mensal(usuario.id)),
+            ]
+        resultados = await asyncio.gather(*consultas)
+
+        transacoes, proximo_cursor = dividir_pagina(resultados[0], limite)
+        totais = resultados[1][0] if filtro.precisa_totais else None
+        if calculadas is None:
+            calculadas = montar_estatisticas(*resultados[-3:])
+            cache.set(chave, calculadas)
+        estatisticas, relatorio_mensal, categorias_disponiveis = calculadas
+
+        await enviar_resposta(send, self.app.json.response(dashboard_para_json(
+            filtro, estatisticas, relatorio_mensal, categorias_disponiveis, totais, transacoes, proximo_cursor
+        )))
+
+    async def resposta_estatisticas(self, requisicao, usuario, send, calcular):
+        """Como rotas.dashboard.resposta_estatisticas(): 304 sem consultar o banco se o cliente já tem a versão atual."""
+        etag, alterado_em, atual = validadores_estatisticas(usuario, requisicao)
+        resposta = Response('', 304) if atual else self.app.json.response(await calcular())
+        await enviar_resposta(send, preparar_resposta_estatisticas(resposta, etag, alterado_em))
+
+    async def stats_mensal(self, requisicao, usuario, send):
+        async def calcular():
+            return {'meses': formatar_serie_mensal(await self.linhas(consulta_serie_mensal(usuario.id)))}
+        await self.resposta_estatisticas(requisicao, usuario, send, calcular)
+
+    async def stats_categorias(self, requisicao, usuario, send):
+        tipo, mes, erro = parametros_categorias(requisicao.args)
+        if erro:
+            resposta = self.app.json.response({'erro': erro})
+            resposta.status_code = 400
+            return await enviar_resposta(send, resposta)
+
+        async def calcular():
+            linhas = await self.linhas(consulta_distribuicao_categorias(usuario.id, tipo, mes))
+            return {'tipo': tipo, 'mes': mes, 'categorias': formatar_distribuicao(linhas)}
+        await self.resposta_estatisticas(requisicao, usuario, send, calcular)
+
+    async def transacoes(self, requisicao, usuario, send):
+        filtro = FiltroTransacoes.de_args(usuario.id, requisicao.args)
+        limite = max(min(requisicao.args.get('limite', self.app.config['TAMANHO_PAGINA'], type=int) or 1, 100), 1)
+        transacoes, proximo_cursor = dividir_pagina(
+            await self.entidades(consulta_pagina(filtro, requisicao.args.get('cursor'), limite)), limite
+        )
+        await enviar_resposta(send, self.app.json.response({
+            'transacoes': [transacao_para_json(t) for t in transacoes],
+            'proximo_cursor': proximo_cursor
+        }))
+
+    async def export_csv(self, requisicao, usuario, send):
+        """CSV em blocos de TAMANHO_LOTE_EXPORTACAO linhas, lidos do banco por streaming assíncrono."""
+        filtro = FiltroTransacoes.de_args(usuario.id, requisicao.args)
+        tamanho_lote = self.app.config['TAMANHO_LOTE_EXPORTACAO']
+        nome = f"transacoes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/csv; charset=utf-8'),
+                (b'content-disposition', f'attachment; filename={nome}'.encode()),
+            ],
+        })
+
+        si = StringIO()
+        writer = csv.writer(si)
+        writer.writerow(CABECALHO_CSV)
+        async with self.sessoes() as sessao:
+            resultado = await sessao.stream(filtro.consulta_exportacao(), execution_options={'yield_per': tamanho_lote})
+            async for lote in resultado.partitions(tamanho_lote):
+                writer.writerows(linha_csv(*linha) for linha in lote)
+                await send({'type': 'http.response.body', 'body': si.getvalue().encode(), 'more_body': True})
+                si.seek(0)
+                si.truncate(0)
+        await send({'type': 'http.response.body', 'body': si.getvalue().encode()})
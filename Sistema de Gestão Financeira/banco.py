@@ -0,0 +1,63 @@
+from extensions import db
+from sqlalchemy import event
+
+
+def url_banco(url):
+    """Normaliza a URL do banco (DATABASE_URL de provedores ainda usa o esquema 'postgres://')."""
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def opcoes_engine(config):
+    """
+    Opções do engine para SQLALCHEMY_ENGINE_OPTIONS. Bancos servidor (PostgreSQL)
+    usam QueuePool dimensionado pela configuração; o SQLite mantém o padrão do
+    SQLAlchemy e é ajustado pelos PRAGMAs de configurar_banco().
+    """
+    if config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        return {}
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': True,
+    }
+
+
+def pragmas_sqlite(config):
+    """PRAGMAs aplicados a cada nova conexão SQLite, na ordem em que são executados."""
+    pragmas = [
+        ('busy_timeout', config['SQLITE_BUSY_TIMEOUT']),
+        ('synchronous', config['SQLITE_SYNCHRONOUS']),
+        ('cache_size', config['SQLITE_CACHE_SIZE']),
+        ('mmap_size', config['SQLITE_MMAP_SIZE']),
+    ]
+    if config['SQLITE_WAL']:
+        # WAL permite leituras simultâneas a uma escrita; com ele, synchronous=NORMAL é seguro
+        pragmas.insert(0, ('journal_mode', 'WAL'))
+    return pragmas
+
+
+def aplicar_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for nome, valor in pragmas:
+            cursor.execute(f'PRAGMA {nome}={valor}')
+    finally:
+        cursor.close()
+
+
+def registrar_pragmas(engine, pragmas):
+    """Aplica `pragmas` a toda conexão aberta por `engine`."""
+    event.listen(engine, 'connect', lambda dbapi_connection, registro: aplicar_pragmas(dbapi_connection, pragmas))
+
+
+def configurar_banco(app):
+    """Registra os PRAGMAs do SQLite nos engines da aplicação. Chamar após db.init_app()."""
+    pragmas = pragmas_sqlite(app.config)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                registrar_pragmas(engine, pragmas)
@@ -0,0 +1 @@
+"""Benchmarks do sistema. Rodar a partir da pasta do sistema com `python -m benchmarks.<nome>`."""
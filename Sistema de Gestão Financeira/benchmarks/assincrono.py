@@ -0,0 +1,267 @@
+"""
+Concorrência do modo síncrono (gunicorn wsgi:app, workers sync) contra o
+modo assíncrono (uvicorn asgi:app) nas rotas de leitura, com o mesmo
+orçamento de memória: cada modo roda primeiro com 1 worker para medir o RSS
+de um worker, e depois com quantos workers couberem em --memoria-mib. Para
+cada nível de concorrência (clientes HTTP simultâneos) mede vazão, latência
+p50/p95/p99 e RSS total, e grava o resultado em JSON.
+
+Uso, a partir da pasta do sistema (precisa de gunicorn, uvicorn e aiosqlite):
+    python -m benchmarks.assincrono --transacoes 50000 --memoria-mib 400 --concorrencia 8 --concorrencia 32
+"""
+from benchmarks.carga import percentil, commit_atual
+from datetime import date, datetime, timedelta
+from http.client import HTTPConnection
+from urllib.parse import urlencode
+import argparse
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+MODOS = ('sincrono', 'assincrono')
+CENARIOS = ('dashboard', 'stats', 'transacoes', 'export_csv')
+
+
+def url_cenario(cenario):
+    hoje = date.today()
+    if cenario == 'dashboard':
+        inicio = (hoje - timedelta(days=90)).isoformat()
+        return f'/api/dashboard?data_inicial={inicio}&data_final={hoje.isoformat()}&tipo=despesa'
+    if cenario == 'stats':
+        return '/api/stats/categorias?tipo=despesa'
+    if cenario == 'transacoes':
+        return '/api/transacoes?limite=50&busca=mercado'
+    return '/export/csv?tipo=despesa'
+
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def rss_arvore_kib(pid):
+    """RSS somado do processo e de todos os descendentes (master + workers), lido de /proc."""
+    pais = {}
+    for entrada in os.listdir('/proc'):
+        if not entrada.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entrada}/stat') as arquivo:
+                pais[int(entrada)] = int(arquivo.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    arvore, pendentes = [], [pid]
+    while pendentes:
+        atual = pendentes.pop()
+        arvore.append(atual)
+        pendentes += [filho for filho, pai in pais.items() if pai == atual]
+
+    total = 0
+    for processo in arvore:
+        try:
+            with open(f'/proc/{processo}/status') as arquivo:
+                total += next(int(linha.split()[1]) for linha in arquivo if linha.startswith('VmRSS:'))
+        except (OSError, StopIteration):
+            continue
+    return total
+
+
+class Servidor:
+    """Sobe gunicorn (síncrono) ou uvicorn (assíncrono) com `workers` processos e espera responder."""
+
+    def __init__(self, modo, workers, ambiente):
+        self.porta = porta_livre()
+        if modo == 'sincrono':
+            comando = [sys.executable, '-m', 'gunicorn', 'wsgi:app', '--workers', str(workers),
+                       '--worker-class', 'sync', '--bind', f'127.0.0.1:{self.porta}', '--log-level', 'warning']
+        else:
+            comando = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--workers', str(workers),
+                       '--port', str(self.porta), '--log-level', 'warning', '--no-access-log']
+        self.processo = subprocess.Popen(comando, env=ambiente)
+        limite = time.time() + 60
+        while True:
+            try:
+                conexao = HTTPConnection('127.0.0.1', self.porta, timeout=5)
+                conexao.request('GET', '/login')
+                if conexao.getresponse().status == 200:
+                    return
+            except OSError:
+                pass
+            if time.time() > limite or self.processo.poll() is not None:
+                self.parar()
+                raise RuntimeError(f'Servidor {modo} não respondeu.')
+            time.sleep(0.3)
+
+    def rss_kib(self):
+        return rss_arvore_kib(self.processo.pid)
+
+    def parar(self):
+        self.processo.terminate()
+        try:
+            self.processo.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.processo.kill()
+
+
+def cookie_sessao(porta, email, senha):
+    """Faz login (com o token CSRF do formulário) e retorna o cabeçalho Cookie da sessão."""
+    conexao = HTTPConnection('127.0.0.1', porta, timeout=30)
+    conexao.request('GET', '/login')
+    resposta = conexao.getresponse()
+    cookie = resposta.getheader('Set-Cookie', '').split(';')[0]
+    token = re.search(r'name="csrf_token" value="([^"]+)"', resposta.read().decode()).group(1)
+    conexao.request('POST', '/login', urlencode({'email': email, 'senha': senha, 'csrf_token': token}), {
+        'Content-Type': 'application/x-www-form-urlencoded', 'Cookie': cookie
+    })
+    resposta = conexao.getresponse()
+    resposta.read()
+    if resposta.status != 302 or '/dashboard' not in (resposta.getheader('Location') or ''):
+        raise RuntimeError('Login do benchmark falhou.')
+    return resposta.getheader('Set-Cookie').split(';')[0]
+
+
+def medir(porta, cookie, url, concorrencia, duracao):
+    """`concorrencia` clientes repetindo GET `url` por `duracao` segundos. Retorna (latências, erros, segundos)."""
+    latencias, erros = [], [0]
+    trava = threading.Lock()
+    fim = time.time() + duracao
+
+    def cliente():
+        conexao = HTTPConnection('127.0.0.1', porta, timeout=120)
+        minhas, meus_erros = [], 0
+        while time.time() < fim:
+            t0 = time.perf_counter()
+            try:
+                conexao.request('GET', url, headers={'Cookie': cookie})
+                resposta = conexao.getresponse()
+                resposta.read()
+                if resposta.status != 200:
+                    meus_erros += 1
+            except OSError:
+                meus_erros += 1
+                conexao.close()
+            minhas.append(time.perf_counter() - t0)
+        with trava:
+            latencias.extend(minhas)
+            erros[0] += meus_erros
+
+    inicio = time.time()
+    threads = [threading.Thread(target=cliente) for _ in range(concorrencia)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencias), erros[0], time.time() - inicio
+
+
+def aquecer(porta, cookie, cenarios):
+    for cenario in cenarios:
+        medir(porta, cookie, url_cenario(cenario), 2, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--transacoes', type=int, default=20000, help='Transações do usuário de teste.')
+    parser.add_argument('--meses', type=int, default=24)
+    parser.add_argument('--banco', help='SQLite já populado com benchmarks.dados (padrão: um banco temporário novo).')
+    parser.add_argument('--memoria-mib', type=float, default=300, help='Orçamento de RSS dos workers de cada modo.')
+    parser.add_argument('--concorrencia', type=int, action='append', help='Clientes simultâneos; pode repetir (padrão 4, 16 e 64).')
+    parser.add_argument('--duracao', type=float, default=5, help='Segundos de medição por cenário e concorrência.')
+    parser.add_argument('--cenario', action='append', choices=CENARIOS, help='Cenários a medir; pode repetir.')
+    parser.add_argument('--modo', action='append', choices=MODOS, help='Modos a medir; pode repetir.')
+    parser.add_argument('--saida', help='Arquivo JSON do resultado (padrão: instance/benchmarks/).')
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp()
+    caminho_banco = os.path.abspath(args.banco) if args.banco else os.path.join(diretorio, 'benchmark.db')
+    ambiente = {
+        **os.environ,
+        'DATABASE_URL': f'sqlite:///{caminho_banco}',
+        'SECRET_KEY': os.environ.get('SECRET_KEY', 'benchmark'),
+        'RATELIMIT_STORAGE_URI': 'memory://',
+        'RATELIMIT_DEFAULT': '1000000 per hour',
+    }
+    os.environ.update(ambiente)
+
+    from app import create_app
+    from benchmarks.dados import popular_banco, SENHA_PADRAO
+    from flask_migrate import upgrade
+
+    app = create_app()
+    if not args.banco:
+        inicio = time.perf_counter()
+        with app.app_context():
+            upgrade()
+            popular_banco(1, args.transacoes, args.meses)
+        print(f'{args.transacoes} transações geradas em {time.perf_counter() - inicio:.1f}s')
+
+    cenarios = args.cenario or CENARIOS
+    concorrencias = args.concorrencia or [4, 16, 64]
+    resultados = {}
+    print(f"{'modo':<11} {'workers':>7} {'cenário':<11} {'conc.':>5} {'req/s':>8} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'p99 ms':>8} {'RSS MiB':>8} {'erros':>6}")
+    for modo in args.modo or MODOS:
+        # Calibração: RSS de um worker já aquecido define quantos cabem no orçamento
+        servidor = Servidor(modo, 1, ambiente)
+        try:
+            cookie = cookie_sessao(servidor.porta, 'bench0@exemplo.com', SENHA_PADRAO)
+            aquecer(servidor.porta, cookie, cenarios)
+            rss_worker = servidor.rss_kib()
+        finally:
+            servidor.parar()
+        workers = max(1, int(args.memoria_mib * 1024 // rss_worker))
+
+        servidor = Servidor(modo, workers, ambiente)
+        resultados[modo] = {'workers': workers, 'rss_worker_kib': rss_worker, 'cenarios': {}}
+        try:
+            cookie = cookie_sessao(servidor.porta, 'bench0@exemplo.com', SENHA_PADRAO)
+            aquecer(servidor.porta, cookie, cenarios)
+            for cenario in cenarios:
+                resultados[modo]['cenarios'][cenario] = {}
+                for concorrencia in concorrencias:
+                    latencias, erros, segundos = medir(servidor.porta, cookie, url_cenario(cenario), concorrencia, args.duracao)
+                    r = {
+                        'requisicoes': len(latencias),
+                        'erros': erros,
+                        'vazao_rps': round(len(latencias) / segundos, 2),
+                        'p50_ms': round(percentil(latencias, 50) * 1000, 2),
+                        'p95_ms': round(percentil(latencias, 95) * 1000, 2),
+                        'p99_ms': round(percentil(latencias, 99) * 1000, 2),
+                        'rss_total_kib': servidor.rss_kib(),
+                    }
+                    resultados[modo]['cenarios'][cenario][str(concorrencia)] = r
+                    print(f"{modo:<11} {workers:>7} {cenario:<11} {concorrencia:>5} {r['vazao_rps']:>8.1f} {r['p50_ms']:>8.1f} "
+                          f"{r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['rss_total_kib'] / 1024:>8.1f} {erros:>6}")
+        finally:
+            servidor.parar()
+
+    commit = commit_atual()
+    saida = args.saida or os.path.join(
+        app.instance_path, 'benchmarks', f"assincrono_{commit or 'sem-commit'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as arquivo:
+        json.dump({
+            'commit': commit,
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'parametros': {
+                'transacoes': args.transacoes if not args.banco else None,
+                'banco': args.banco,
+                'memoria_mib': args.memoria_mib,
+                'duracao': args.duracao,
+                'cpus': os.cpu_count(),
+            },
+            'resultados': resultados,
+        }, arquivo, ensure_ascii=False, indent=2)
+    print(f'Resultado gravado em {saida}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""
+Teste de carga das rotas principais (/login, /dashboard com e sem filtros,
+/export/csv, /export/pdf e /nova) pelo cliente de teste do Flask, em um
+processo ou em vários workers (processos com fork, como o gunicorn) sobre o
+mesmo banco. Mede latência p50/p95/p99, vazão e memória (RSS) e grava o
+resultado em JSON para comparar entre commits. Cada cenário roda em processos
+novos (fork), com o pico de RSS zerado antes da medição: o pico e o
+acréscimo são só daquele cenário, sem a geração dos dados, os cenários
+anteriores e o login/aquecimento. Só Linux (lê /proc/self).
+
+Uso, a partir da pasta do sistema:
+    python -m benchmarks.carga --transacoes 100000 --requisicoes 50 --workers 4
+    python -m benchmarks.carga --comparar antes.json depois.json
+"""
+from datetime import date, datetime, timedelta
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import subprocess
+import tempfile
+import time
+
+# Ordem de execução: /nova por último, pois invalida o cache de estatísticas
+CENARIOS = ('login', 'dashboard', 'dashboard_filtrado', 'export_csv', 'export_pdf', 'nova')
+
+
+def requisicao(cenario, email, senha):
+    """Retorna (método, url, formulário) do cenário."""
+    hoje = date.today()
+    if cenario == 'login':
+        return 'POST', '/login', {'email': email, 'senha': senha}
+    if cenario == 'dashboard':
+        return 'GET', '/dashboard', None
+    if cenario == 'dashboard_filtrado':
+        inicio = (hoje - timedelta(days=90)).isoformat()
+        return 'GET', f'/dashboard?data_inicial={inicio}&data_final={hoje.isoformat()}&tipo=despesa&busca=mercado', None
+    if cenario == 'export_csv':
+        return 'GET', '/export/csv', None
+    if cenario == 'export_pdf':
+        return 'GET', '/export/pdf', None
+    return 'POST', '/nova', {
+        'descricao': 'Compra benchmark', 'categoria': 'Mercado', 'tipo': 'despesa',
+        'valor': '42.50', 'data': hoje.isoformat()
+    }
+
+
+def percentil(amostras, p):
+    """Percentil por posição mais próxima de uma lista ordenada."""
+    return amostras[max(0, math.ceil(p / 100 * len(amostras)) - 1)]
+
+
+def memoria_kib(campo):
+    """Campo de memória de /proc/self/status em KiB (VmRSS: atual; VmHWM: pico)."""
+    with open('/proc/self/status') as arquivo:
+        return next(int(linha.split()[1]) for linha in arquivo if linha.startswith(f'{campo}:'))
+
+
+def zerar_pico_rss():
+    """Zera o pico de RSS (VmHWM) do processo, que passa a contar a partir de agora (Linux 4.0+)."""
+    with open('/proc/self/clear_refs', 'w') as arquivo:
+        arquivo.write('5')
+
+
+def _medir(app, cenario, email, senha, requisicoes, aquecimento):
+    """
+    Faz login e mede `requisicoes` chamadas do cenário, com o pico de RSS
+    zerado depois do login e do aquecimento. Retorna (latências em s, erros,
+    início, fim, RSS inicial, pico de RSS), memória em KiB.
+    """
+    cliente = app.test_client()
+    cliente.post('/login', data={'email': email, 'senha': senha})
+    metodo, url, dados = requisicao(cenario, email, senha)
+
+    for _ in range(aquecimento):
+        cliente.open(url, method=metodo, data=dados).close()
+
+    zerar_pico_rss()
+    rss_inicial = memoria_kib('VmRSS')
+    latencias = []
+    erros = 0
+    inicio = time.time()
+    for _ in range(requisicoes):
+        t0 = time.perf_counter()
+        resposta = cliente.open(url, method=metodo, data=dados)
+        resposta.get_data()  # consome respostas em streaming (CSV)
+        latencias.append(time.perf_counter() - t0)
+        if resposta.status_code >= 400 or (resposta.location or '').startswith('/login'):
+            erros += 1
+        resposta.close()
+    return latencias, erros, inicio, time.time(), rss_inicial, memoria_kib('VmHWM')
+
+
+def _worker(app, cenario, email, senha, requisicoes, aquecimento, resultados):
+    from extensions import db
+
+    # Conexões herdadas do processo pai (fork) não podem ser reutilizadas
+    with app.app_context():
+        db.engine.dispose(close=False)
+    resultados.put(_medir(app, cenario, email, senha, requisicoes, aquecimento))
+
+
+def executar_cenario(app, cenario, email, senha, requisicoes, workers, aquecimento):
+    """Mede um cenário em `workers` processos novos (fork) simultâneos; workers=1 é o modo de um processo."""
+    contexto = multiprocessing.get_context('fork')
+    resultados = contexto.Queue()
+    processos = [
+        contexto.Process(target=_worker, args=(app, cenario, email, senha, requisicoes, aquecimento, resultados))
+        for _ in range(workers)
+    ]
+    for processo in processos:
+        processo.start()
+    medidas = [resultados.get() for _ in processos]
+    for processo in processos:
+        processo.join()
+
+    latencias = sorted(latencia for medida in medidas for latencia in medida[0])
+    duracao = max(medida[3] for medida in medidas) - min(medida[2] for medida in medidas)
+    return {
+        'requisicoes': len(latencias),
+        'erros': sum(medida[1] for medida in medidas),
+        'p50_ms': round(percentil(latencias, 50) * 1000, 2),
+        'p95_ms': round(percentil(latencias, 95) * 1000, 2),
+        'p99_ms': round(percentil(latencias, 99) * 1000, 2),
+        'media_ms': round(sum(latencias) / len(latencias) * 1000, 2),
+        'vazao_rps': round(len(latencias) / duracao, 2) if duracao else None,
+        # Por worker: RSS ao começar a medição (depois do login e do aquecimento), pico durante ela e o acréscimo
+        'rss_inicial_kib': max(medida[4] for medida in medidas),
+        'rss_pico_kib': max(medida[5] for medida in medidas),
+        'rss_acrescimo_kib': max(medida[5] - medida[4] for medida in medidas),
+    }
+
+
+def commit_atual():
+    """Hash curto do commit atual, ou None fora de um repositório git."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(caminho_antes, caminho_depois):
+    """Imprime a variação de p50, p95 e vazão de cada cenário entre dois resultados."""
+    with open(caminho_antes, encoding='utf-8') as arquivo:
+        antes = json.load(arquivo)
+    with open(caminho_depois, encoding='utf-8') as arquivo:
+        depois = json.load(arquivo)
+
+    def variacao(a, b):
+        return f'{(b - a) / a * 100:+.1f}%' if a and b is not None else '-'
+
+    print(f"{antes.get('commit')} -> {depois.get('commit')}")
+    print(f"{'modo/cenário':<30} {'p50':>9} {'p95':>9} {'vazão':>9}")
+    for modo, cenarios in depois['resultados'].items():
+        for cenario, b in cenarios.items():
+            a = antes['resultados'].get(modo, {}).get(cenario)
+            if a is None:
+                continue
+            print(f"{modo + '/' + cenario:<30} {variacao(a['p50_ms'], b['p50_ms']):>9} "
+                  f"{variacao(a['p95_ms'], b['p95_ms']):>9} {variacao(a['vazao_rps'], b['vazao_rps']):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--transacoes', type=int, default=10000, help='Transações do usuário de teste (1k a 1M).')
+    parser.add_argument('--meses', type=int, default=24)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--banco', help='SQLite já populado com benchmarks.dados (padrão: um banco temporário novo).')
+    parser.add_argument('--requisicoes', type=int, default=30, help='Requisições medidas por cenário e por worker.')
+    parser.add_argument('--aquecimento', type=int, default=2, help='Requisições descartadas antes da medição.')
+    parser.add_argument('--workers', type=int, default=4, help='Processos no modo multi-worker (1 desliga).')
+    parser.add_argument('--cenario', action='append', choices=CENARIOS, help='Cenários a medir; pode repetir.')
+    parser.add_argument('--saida', help='Arquivo JSON do resultado (padrão: instance/benchmarks/).')
+    parser.add_argument('--comparar', nargs=2, metavar=('ANTES', 'DEPOIS'), help='Compara dois resultados e sai.')
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar(*args.comparar)
+        return
+
+    diretorio = tempfile.mkdtemp()
+    caminho_banco = os.path.abspath(args.banco) if args.banco else os.path.join(diretorio, 'benchmark.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{caminho_banco}'
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ.setdefault('RATELIMIT_STORAGE_URI', 'memory://')
+
+    from app import create_app
+    from benchmarks.dados import popular_banco, SENHA_PADRAO
+    from flask_migrate import upgrade
+
+    app = create_app({'WTF_CSRF_ENABLED': False, 'RATELIMIT_ENABLED': False})
+
+    email = 'bench0@exemplo.com'
+    if not args.banco:
+        inicio = time.perf_counter()
+        with app.app_context():
+            upgrade()
+            popular_banco(1, args.transacoes, args.meses, args.semente)
+        print(f'{args.transacoes} transações geradas em {time.perf_counter() - inicio:.1f}s')
+
+    modos = {'cliente': 1}
+    if args.workers > 1:
+        modos[f'workers_{args.workers}'] = args.workers
+
+    resultados = {}
+    print(f"{'modo':<12} {'cenário':<20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} "
+          f"{'pico MiB':>9} {'+MiB':>7} {'erros':>6}")
+    for modo, workers in modos.items():
+        resultados[modo] = {}
+        for cenario in args.cenario or CENARIOS:
+            r = executar_cenario(app, cenario, email, SENHA_PADRAO, args.requisicoes, workers, args.aquecimento)
+            resultados[modo][cenario] = r
+            print(f"{modo:<12} {cenario:<20} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} "
+                  f"{r['vazao_rps'] or 0:>8.1f} {r['rss_pico_kib'] / 1024:>9.1f} {r['rss_acrescimo_kib'] / 1024:>7.1f} "
+                  f"{r['erros']:>6}")
+
+    commit = commit_atual()
+    saida = args.saida or os.path.join(
+        app.instance_path, 'benchmarks', f"carga_{commit or 'sem-commit'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as arquivo:
+        json.dump({
+            'commit': commit,
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'parametros': {
+                'transacoes': args.transacoes if not args.banco else None,
+                'banco': args.banco,
+                'requisicoes': args.requisicoes,
+                'aquecimento': args.aquecimento,
+                'workers': args.workers,
+                'cpus': os.cpu_count(),
+            },
+            'resultados': resultados,
+        }, arquivo, ensure_ascii=False, indent=2)
+    print(f'Resultado gravado em {saida}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark de concorrência no SQLite: leitores e escritores em processos
+separados (como workers do gunicorn) sobre o mesmo arquivo, comparando o
+modo padrão (rollback journal) com WAL + os PRAGMAs de banco.py.
+
+Uso, a partir da pasta do sistema:
+    python -m benchmarks.concorrencia --segundos 5 --leitores 4 --escritores 1
+"""
+from extensions import db
+from models import Transacao
+from banco import pragmas_sqlite, registrar_pragmas
+from datetime import date, timedelta
+from sqlalchemy import create_engine, select, insert, func
+from sqlalchemy.exc import OperationalError
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+# Mesmos valores padrão de config.py
+CONFIG_WAL = {
+    'SQLITE_WAL': True,
+    'SQLITE_SYNCHRONOUS': 'NORMAL',
+    'SQLITE_BUSY_TIMEOUT': 5000,
+    'SQLITE_CACHE_SIZE': -20000,
+    'SQLITE_MMAP_SIZE': 256 * 1024 * 1024,
+}
+
+
+def criar_engine(caminho, modo):
+    engine = create_engine(f'sqlite:///{caminho}')
+    if modo == 'wal':
+        registrar_pragmas(engine, pragmas_sqlite(CONFIG_WAL))
+    return engine
+
+
+def preparar_banco(caminho, modo, quantidade):
+    """Cria o esquema e `quantidade` transações do usuário 1."""
+    engine = criar_engine(caminho, modo)
+    db.metadata.create_all(engine)
+    hoje = date.today()
+    linhas = [
+        {
+            'descricao': f'Transação {i}',
+            'valor': round(random.uniform(1, 500), 2),
+            'tipo': 'despesa' if i % 3 else 'receita',
+            'categoria': ('Alimentação', 'Lazer', 'Transporte')[i % 3],
+            'data': hoje - timedelta(days=i % 365),
+            'usuario_id': 1,
+        }
+        for i in range(quantidade)
+    ]
+    with engine.begin() as conexao:
+        conexao.execute(insert(Transacao.__table__), linhas)
+    engine.dispose()
+
+
+def _leitor(caminho, modo, segundos, resultados):
+    engine = criar_engine(caminho, modo)
+    consulta = select(Transacao.tipo, func.sum(Transacao.valor), func.count(Transacao.id)).where(
+        Transacao.usuario_id == 1,
+        Transacao.data >= date.today() - timedelta(days=90)
+    ).group_by(Transacao.tipo)
+    operacoes = erros = 0
+    fim = time.perf_counter() + segundos
+    while time.perf_counter() < fim:
+        try:
+            with engine.connect() as conexao:
+                conexao.execute(consulta).all()
+            operacoes += 1
+        except OperationalError:
+            erros += 1
+    resultados.put(('leitura', operacoes, erros))
+
+
+def _escritor(caminho, modo, segundos, resultados):
+    engine = criar_engine(caminho, modo)
+    operacoes = erros = 0
+    fim = time.perf_counter() + segundos
+    while time.perf_counter() < fim:
+        try:
+            with engine.begin() as conexao:
+                conexao.execute(insert(Transacao.__table__).values(
+                    descricao='Nova', valor=9.99, tipo='despesa', categoria='Lazer',
+                    data=date.today(), usuario_id=1
+                ))
+            operacoes += 1
+        except OperationalError:
+            erros += 1
+    resultados.put(('escrita', operacoes, erros))
+
+
+def executar(modo, segundos, leitores, escritores, quantidade):
+    """Roda um cenário e retorna {'leitura': (ops/s, erros), 'escrita': (ops/s, erros)}."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'benchmark.db')
+        preparar_banco(caminho, modo, quantidade)
+
+        resultados = multiprocessing.Queue()
+        processos = [
+            multiprocessing.Process(target=_leitor, args=(caminho, modo, segundos, resultados))
+            for _ in range(leitores)
+        ] + [
+            multiprocessing.Process(target=_escritor, args=(caminho, modo, segundos, resultados))
+            for _ in range(escritores)
+        ]
+        for processo in processos:
+            processo.start()
+
+        totais = {'leitura': [0, 0], 'escrita': [0, 0]}
+        for _ in processos:
+            tipo, operacoes, erros = resultados.get()
+            totais[tipo][0] += operacoes
+            totais[tipo][1] += erros
+        for processo in processos:
+            processo.join()
+
+    return {tipo: (operacoes / segundos, erros) for tipo, (operacoes, erros) in totais.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--segundos', type=float, default=5)
+    parser.add_argument('--leitores', type=int, default=4)
+    parser.add_argument('--escritores', type=int, default=1)
+    parser.add_argument('--transacoes', type=int, default=20000, help='Transações criadas antes da medição.')
+    parser.add_argument('--modo', choices=('padrao', 'wal', 'ambos'), default='ambos')
+    args = parser.parse_args()
+
+    modos = ('padrao', 'wal') if args.modo == 'ambos' else (args.modo,)
+    print(f'{args.leitores} leitor(es), {args.escritores} escritor(es), {args.segundos}s, {args.transacoes} transações')
+    print(f"{'modo':<8} {'leituras/s':>12} {'erros':>6} {'escritas/s':>12} {'erros':>6}")
+    for modo in modos:
+        r = executar(modo, args.segundos, args.leitores, args.escritores, args.transacoes)
+        print(f"{modo:<8} {r['leitura'][0]:>12.1f} {r['leitura'][1]:>6} {r['escrita'][0]:>12.1f} {r['escrita'][1]:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Gerador de dados sintéticos: usuários com transações de categorias, valores e
+datas realistas (salário mensal, aluguel, mercado, transporte...), geradas a
+partir de uma semente para que as medições sejam reproduzíveis.
+
+Uso, a partir da pasta do sistema (grava no banco de DATABASE_URL, aplicando
+antes as migrações pendentes):
+    python -m benchmarks.dados --usuarios 1 --transacoes 100000 --meses 24
+"""
+from extensions import db
+from models import Usuario, Transacao
+from resumo import reconstruir_resumo
+from senhas import gerar_hash
+from datetime import date, timedelta
+from sqlalchemy import insert
+import argparse
+import random
+import time
+
+SENHA_PADRAO = 'Senha@Forte1'
+
+# categoria -> (peso, valor mínimo, valor máximo, descrições)
+DESPESAS = {
+    'Alimentação': (30, 12, 180, ('Restaurante', 'Padaria', 'Lanchonete', 'iFood', 'Café')),
+    'Mercado': (20, 40, 650, ('Supermercado Extra', 'Carrefour', 'Hortifruti', 'Atacadão')),
+    'Transporte': (18, 5, 120, ('Uber', '99', 'Combustível', 'Estacionamento', 'Metrô')),
+    'Lazer': (10, 20, 400, ('Cinema', 'Show', 'Bar', 'Viagem', 'Streaming')),
+    'Saúde': (7, 30, 800, ('Farmácia', 'Consulta médica', 'Exames', 'Academia')),
+    'Educação': (5, 50, 1200, ('Curso online', 'Livraria', 'Mensalidade escolar')),
+    'Contas': (10, 60, 450, ('Conta de luz', 'Internet', 'Celular', 'Conta de água', 'Gás')),
+}
+RECEITAS_EVENTUAIS = {
+    'Freelance': (60, 300, 4000, ('Projeto freelance', 'Consultoria')),
+    'Investimentos': (30, 10, 900, ('Dividendos', 'Rendimento CDB', 'Juros')),
+    'Outros': (10, 20, 500, ('Reembolso', 'Venda usados', 'Presente')),
+}
+
+
+def _sortear(gerador, categorias):
+    nomes = list(categorias)
+    categoria = gerador.choices(nomes, weights=[categorias[nome][0] for nome in nomes])[0]
+    _, minimo, maximo, descricoes = categorias[categoria]
+    # Valores concentrados perto do mínimo, como em extratos reais
+    valor = round(minimo + (maximo - minimo) * gerador.random() ** 2.5, 2)
+    return categoria, valor, gerador.choice(descricoes)
+
+
+def gerar_transacoes(usuario_id, quantidade, meses=24, semente=0):
+    """
+    Gera `quantidade` dicionários de Transacao do usuário nos últimos `meses`:
+    salário e aluguel todo mês, receitas eventuais (~5%) e despesas sorteadas
+    por peso de categoria nas demais.
+    """
+    gerador = random.Random(f'{semente}:{usuario_id}')
+    hoje = date.today()
+    inicio = hoje - timedelta(days=30 * meses)
+    dias = (hoje - inicio).days
+
+    fixas = []
+    for i in range(meses):
+        mes = (inicio + timedelta(days=30 * i + 15)).replace(day=1)
+        fixas.append({'descricao': 'Salário', 'valor': 6500.0, 'tipo': 'receita', 'categoria': 'Salário',
+                      'data': mes + timedelta(days=4), 'usuario_id': usuario_id})
+        fixas.append({'descricao': 'Aluguel', 'valor': 1800.0, 'tipo': 'despesa', 'categoria': 'Moradia',
+                      'data': mes + timedelta(days=9), 'usuario_id': usuario_id})
+    yield from fixas[:quantidade]
+
+    for _ in range(quantidade - len(fixas[:quantidade])):
+        if gerador.random() < 0.05:
+            tipo = 'receita'
+            categoria, valor, descricao = _sortear(gerador, RECEITAS_EVENTUAIS)
+        else:
+            tipo = 'despesa'
+            categoria, valor, descricao = _sortear(gerador, DESPESAS)
+        yield {
+            'descricao': descricao,
+            'valor': valor,
+            'tipo': tipo,
+            'categoria': categoria,
+            'data': inicio + timedelta(days=gerador.randrange(dias + 1)),
+            'usuario_id': usuario_id,
+        }
+
+
+def popular_banco(usuarios=1, transacoes=1000, meses=24, semente=0, tamanho_lote=10000):
+    """
+    Cria `usuarios` usuários (bench<i>@exemplo.com, senha SENHA_PADRAO) com
+    `transacoes` transações cada, em lotes executemany, e reconstrói o resumo
+    mensal. Precisa de um contexto de aplicação. Retorna a lista de e-mails.
+    """
+    senha_hash = gerar_hash(SENHA_PADRAO)
+    emails = []
+    for i in range(usuarios):
+        email = f'bench{i}@exemplo.com'
+        usuario = Usuario.query.filter_by(email=email).first()
+        if usuario is None:
+            usuario = Usuario(nome=f'Benchmark {i}', email=email, senha_hash=senha_hash)
+            db.session.add(usuario)
+            db.session.commit()
+        emails.append(email)
+
+        lote = []
+        for dados in gerar_transacoes(usuario.id, transacoes, meses, semente):
+            lote.append(dados)
+            if len(lote) >= tamanho_lote:
+                db.session.execute(insert(Transacao.__table__), lote)
+                lote = []
+        if lote:
+            db.session.execute(insert(Transacao.__table__), lote)
+        db.session.commit()
+        reconstruir_resumo(usuario.id)
+    return emails
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--usuarios', type=int, default=1)
+    parser.add_argument('--transacoes', type=int, default=1000, help='Transações por usuário.')
+    parser.add_argument('--meses', type=int, default=24, help='Meses de histórico.')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    from app import create_app
+    from flask_migrate import upgrade
+
+    app = create_app()
+    inicio = time.perf_counter()
+    with app.app_context():
+        upgrade()
+        emails = popular_banco(args.usuarios, args.transacoes, args.meses, args.semente)
+    print(f'{len(emails)} usuário(s) x {args.transacoes} transações em {time.perf_counter() - inicio:.1f}s '
+          f'(senha {SENHA_PADRAO!r}): {", ".join(emails)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark de inicialização a frio: roda `from app import create_app;
+create_app()` num processo novo com `python -X importtime`, mostra o tempo
+total, os módulos mais pesados e falha (código de saída 1) se o tempo passar
+do orçamento ou se um módulo de carga tardia (reportlab, numpy) for importado.
+
+Uso, a partir da pasta do sistema:
+    python -m benchmarks.inicializacao --orcamento-ms 1100 --repeticoes 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CODIGO = (
+    'import time; inicio = time.perf_counter(); '
+    'from app import create_app; create_app(); '
+    'print(round((time.perf_counter() - inicio) * 1000, 1))'
+)
+
+# Usados só na exportação em PDF e na previsão de gastos
+MODULOS_TARDIOS = ('reportlab', 'numpy')
+
+
+def medir():
+    """Roda uma inicialização. Retorna (ms até create_app() terminar, {módulo: (próprio, acumulado) em µs})."""
+    diretorio = tempfile.mkdtemp()
+    ambiente = {
+        **os.environ,
+        'DATABASE_URL': f"sqlite:///{os.path.join(diretorio, 'inicializacao.db')}",
+        'RATELIMIT_STORAGE_URI': 'memory://',
+        'SECRET_KEY': os.environ.get('SECRET_KEY', 'benchmark'),
+    }
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CODIGO],
+        capture_output=True, text=True, env=ambiente, check=True
+    )
+    modulos = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|')
+        modulos[nome.strip()] = (int(proprio), int(acumulado))
+    return float(processo.stdout.strip().splitlines()[-1]), modulos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--orcamento-ms', type=float, default=1100,
+                        help='Tempo máximo (mediana) de import + create_app(), em ms.')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15, help='Módulos mais pesados listados.')
+    args = parser.parse_args()
+
+    medidas = [medir() for _ in range(args.repeticoes)]
+    tempos = sorted(tempo for tempo, _ in medidas)
+    tempo, modulos = min(medidas, key=lambda medida: medida[0])
+
+    print(f"{'módulo':<40} {'próprio ms':>11} {'acumulado ms':>13}")
+    for nome, (proprio, acumulado) in sorted(modulos.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f'{nome:<40} {proprio / 1000:>11.1f} {acumulado / 1000:>13.1f}')
+    mediana = statistics.median(tempos)
+    print(f'\nimport + create_app(): mediana {mediana:.1f} ms, mínimo {tempos[0]:.1f} ms '
+          f'({args.repeticoes} execução(ões)); orçamento {args.orcamento_ms:.0f} ms')
+
+    falhas = []
+    tardios = sorted({nome.split('.')[0] for nome in modulos} & set(MODULOS_TARDIOS))
+    if tardios:
+        falhas.append(f"importados na inicialização: {', '.join(tardios)}")
+    if mediana > args.orcamento_ms:
+        falhas.append(f'{mediana:.1f} ms acima do orçamento de {args.orcamento_ms:.0f} ms')
+    if falhas:
+        sys.exit('FALHA: ' + '; '.join(falhas))
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark do armazenamento de rate limiting: vários processos (como workers
+do gunicorn) consomem o mesmo limite. Com armazenamento compartilhado o total
+de requisições aceitas é igual ao limite, qualquer que seja o número de
+processos; com 'memory://' ele é multiplicado pelo número de processos.
+
+Uso, a partir da pasta do sistema:
+    python -m benchmarks.limites --processos 1 2 4 --limite "50 per hour"
+"""
+from limites import registrar_armazenamento
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+
+def _consumir(uri, limite, tentativas, resultados):
+    registrar_armazenamento()
+    limitador = FixedWindowRateLimiter(storage_from_string(uri))
+    item = parse(limite)
+    aceitas = 0
+    inicio = time.perf_counter()
+    for _ in range(tentativas):
+        if limitador.hit(item, '127.0.0.1', '/register'):
+            aceitas += 1
+    resultados.put((aceitas, time.perf_counter() - inicio))
+
+
+def executar(uri, processos, limite, tentativas):
+    """Retorna (requisições aceitas, verificações por segundo) somando todos os processos."""
+    resultados = multiprocessing.Queue()
+    trabalhadores = [
+        multiprocessing.Process(target=_consumir, args=(uri, limite, tentativas, resultados))
+        for _ in range(processos)
+    ]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    medidas = [resultados.get() for _ in trabalhadores]
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    aceitas = sum(aceitas for aceitas, _ in medidas)
+    taxa = sum(tentativas / duracao for _, duracao in medidas)
+    return aceitas, taxa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--processos', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--limite', default='50 per hour')
+    parser.add_argument('--tentativas', type=int, default=2000, help='Verificações por processo.')
+    parser.add_argument('--uri', action='append', help="Armazenamentos a comparar (padrão: memory:// e um SQLite temporário).")
+    args = parser.parse_args()
+    registrar_armazenamento()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        uris = args.uri or ['memory://', 'sqlite:///' + os.path.join(diretorio, 'limites.db')]
+        print(f'limite {args.limite!r}, {args.tentativas} verificações por processo')
+        print(f"{'armazenamento':<14} {'processos':>9} {'aceitas':>8} {'verificações/s':>15}")
+        for uri in uris:
+            for processos in args.processos:
+                storage_from_string(uri).reset()
+                aceitas, taxa = executar(uri, processos, args.limite, args.tentativas)
+                print(f"{uri.split(':')[0]:<14} {processos:>9} {aceitas:>8} {taxa:>15.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Microbenchmark do hash de senhas: hashes por segundo de cada método/custo
+aceito em SENHA_METODO, em uma thread e com um pool de N threads (como o
+pool de senhas.py), para escolher um custo compatível com o pico de logins.
+
+Uso, a partir da pasta do sistema:
+    python -m benchmarks.senhas --metodo scrypt:16384:8:1 --metodo pbkdf2:sha256:600000 --threads 2
+"""
+from werkzeug.security import generate_password_hash
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import time
+
+METODOS_PADRAO = [
+    'scrypt:16384:8:1',
+    'scrypt:32768:8:1',
+    'scrypt:65536:8:1',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:1000000',
+]
+
+
+def medir(metodo, hashes, threads):
+    """Retorna hashes por segundo gerando `hashes` hashes em `threads` threads."""
+    inicio = time.perf_counter()
+    if threads == 1:
+        for _ in range(hashes):
+            generate_password_hash('Senha@Forte1', method=metodo)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda _: generate_password_hash('Senha@Forte1', method=metodo), range(hashes)))
+    return hashes / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--metodo', action='append', help='Método do werkzeug; pode repetir.')
+    parser.add_argument('--hashes', type=int, default=10, help='Hashes por medição.')
+    parser.add_argument('--threads', type=int, default=2, help='Tamanho do pool na segunda medição.')
+    args = parser.parse_args()
+
+    print(f"{'método':<24} {'hashes/s (1 thread)':>20} {f'hashes/s ({args.threads} threads)':>22} {'ms/hash':>8}")
+    for metodo in args.metodo or METODOS_PADRAO:
+        uma = medir(metodo, args.hashes, 1)
+        varias = medir(metodo, args.hashes, args.threads)
+        print(f'{metodo:<24} {uma:>20.1f} {varias:>22.1f} {1000 / uma:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+from extensions import db
+from models import Transacao
+from sqlalchemy import select, table, column, literal_column, false
+import re
+
+transacao_fts = table('transacao_fts', column('rowid'))
+
+
+def termos_busca(texto):
+    """Quebra o texto digitado em palavras, descartando a sintaxe especial do FTS5."""
+    return re.findall(r'\w+', texto or '')
+
+
+def consulta_fts(texto):
+    """Expressão MATCH com busca por prefixo de cada palavra, ou None se não houver palavras."""
+    termos = termos_busca(texto)
+    if not termos:
+        return None
+    return ' '.join(f'"{termo}"*' for termo in termos)
+
+
+def escapar_like(texto):
+    """Escapa os curingas de LIKE (% e _) e a barra invertida usada como escape."""
+    return re.sub(r'([\\%_])', r'\\\1', texto)
+
+
+def criterio_busca(texto):
+    """
+    Critério de busca por descrição/categoria. No SQLite usa o índice FTS5
+    transacao_fts com busca por prefixo de cada palavra ("alim" encontra
+    "Alimentação"); em outros bancos cai para ILIKE, com % e _ do texto
+    tratados como caracteres comuns. Texto sem nenhuma palavra não encontra nada.
+    """
+    consulta = consulta_fts(texto)
+    if consulta is None:
+        return false()
+
+    if db.engine.dialect.name != 'sqlite':
+        return Transacao.descricao.ilike(f'%{escapar_like(texto)}%', escape='\\')
+
+    return Transacao.id.in_(
+        select(transacao_fts.c.rowid).where(literal_column('transacao_fts').op('MATCH')(consulta))
+    )
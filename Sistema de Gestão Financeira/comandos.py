@@ -0,0 +1,176 @@
+from flask import current_app
+from flask.cli import with_appcontext
+from extensions import db
+from models import Usuario
+from estatisticas import consulta_resumo, primeiro_dia_mes
+from filtros import FiltroTransacoes
+from listagem import consulta_pagina
+from resumo import reconstruir_resumo, reconciliar_resumo
+from importacao import ler_csv, ler_ofx, importar_transacoes
+from previsao import precalcular_previsoes
+from recorrencias import materializar_recorrencias, consulta_recorrencias_vencidas
+from exportacao import manter_exportacoes
+from datetime import date
+from sqlalchemy import event
+import click
+import re
+
+
+def plano_consulta(stmt):
+    """
+    Linhas de EXPLAIN QUERY PLAN (SQLite) de um statement, executado como a
+    aplicação o executa (mesmo SQL compilado, mesmos parâmetros): o EXPLAIN
+    roda no mesmo cursor logo antes da consulta, que segue normalmente (com o
+    resultado lido pelo SQLAlchemy a partir do statement em cache).
+    """
+    conexao = db.session.connection()
+    plano = []
+
+    def explicar(conn, cursor, statement, parameters, context, executemany):
+        cursor.execute(f'EXPLAIN QUERY PLAN {statement}', parameters)
+        plano.extend(linha[-1] for linha in cursor.fetchall())
+
+    event.listen(conexao, 'before_cursor_execute', explicar)
+    try:
+        conexao.execute(stmt).all()
+    finally:
+        event.remove(conexao, 'before_cursor_execute', explicar)
+    return plano
+
+
+def indices_do_plano(plano):
+    """Nomes dos índices (e tabelas FTS5) usados pelas linhas de um plano."""
+    indices = set()
+    for passo in plano:
+        indices.update(re.findall(r'USING (?:COVERING )?INDEX (\w+)', passo))
+        indices.update(re.findall(r'SCAN (\w+) VIRTUAL TABLE', passo))
+    return indices
+
+
+def consultas_indexadas(usuario_id, hoje=None):
+    """
+    Consultas que a aplicação executa, montadas pelas mesmas funções que as
+    rotas, o agendador e as exportações usam, com os índices que cada uma
+    precisa usar: {nome: (statement, índices)}.
+    """
+    hoje = hoje or date.today()
+    inicio = primeiro_dia_mes(hoje)
+    return {
+        'resumo_mensal': (consulta_resumo(usuario_id).statement, {'sqlite_autoindex_resumo_mensal_1'}),
+        'totais_periodo': (FiltroTransacoes(usuario_id, inicio, hoje).consulta_totais(), {'ix_transacao_usuario_data'}),
+        'totais_tipo': (
+            FiltroTransacoes(usuario_id, inicio, tipo='despesa').consulta_totais(), {'ix_transacao_usuario_tipo_data'}
+        ),
+        'pagina_keyset': (
+            consulta_pagina(FiltroTransacoes(usuario_id), f'{hoje:%Y-%m-%d}_{2**31 - 1}'), {'ix_transacao_usuario_data'}
+        ),
+        'busca_texto': (
+            consulta_pagina(FiltroTransacoes(usuario_id, busca='mercado')), {'ix_transacao_usuario_data', 'transacao_fts'}
+        ),
+        'exportacao_periodo': (
+            FiltroTransacoes(usuario_id, inicio, hoje).consulta_exportacao(), {'ix_transacao_usuario_data'}
+        ),
+        'recorrencias_vencidas': (consulta_recorrencias_vencidas(hoje), {'ix_transacao_recorrente_ativa_proxima'}),
+    }
+
+
+@click.command('verificar-indices')
+@with_appcontext
+@click.option('--usuario-id', default=1, help='Usuário usado para montar as consultas.')
+def verificar_indices(usuario_id):
+    """Confere com EXPLAIN QUERY PLAN se as consultas da aplicação usam os índices esperados."""
+    falhas = 0
+    for nome, (stmt, esperados) in consultas_indexadas(usuario_id).items():
+        plano = plano_consulta(stmt)
+        faltando = esperados - indices_do_plano(plano)
+        click.echo(f"[{'FALHA' if faltando else 'ok'}] {nome}")
+        for passo in plano:
+            click.echo(f'    {passo}')
+        if faltando:
+            click.echo(f"    sem o(s) índice(s): {', '.join(sorted(faltando))}")
+            falhas += 1
+
+    if falhas:
+        raise click.ClickException(f'{falhas} consulta(s) sem o índice esperado.')
+
+@click.command('importar-transacoes')
+@with_appcontext
+@click.argument('arquivo', type=click.Path(exists=True, dir_okay=False))
+@click.option('--email', required=True, help='E-mail do usuário que receberá as transações.')
+@click.option('--formato', type=click.Choice(['csv', 'ofx']), default=None, help='Padrão: pela extensão do arquivo.')
+@click.option('--encoding', default='utf-8-sig', show_default=True)
+def importar_transacoes_comando(arquivo, email, formato, encoding):
+    """Importa um extrato bancário (CSV ou OFX) para o usuário informado."""
+    usuario = Usuario.query.filter_by(email=email.strip().lower()).first()
+    if usuario is None:
+        raise click.ClickException('Usuário não encontrado.')
+
+    formato = formato or ('ofx' if arquivo.lower().endswith(('.ofx', '.qfx')) else 'csv')
+    with open(arquivo, encoding=encoding, errors='replace', newline='') as entrada:
+        leitor = ler_ofx(entrada) if formato == 'ofx' else ler_csv(entrada)
+        resultado = importar_transacoes(usuario.id, leitor, current_app.config['TAMANHO_LOTE_IMPORTACAO'])
+
+    click.echo(f"{resultado['importadas']} transação(ões) importada(s), {resultado['total_erros']} linha(s) com erro.")
+    for linha, erro in resultado['erros']:
+        click.echo(f'  linha {linha}: {erro}')
+
+@click.command('reconstruir-resumo')
+@with_appcontext
+@click.option('--usuario-id', type=int, default=None, help='Reconstrói apenas este usuário.')
+def reconstruir_resumo_comando(usuario_id):
+    """Recalcula a tabela resumo_mensal a partir de todas as transações."""
+    linhas = reconstruir_resumo(usuario_id)
+    click.echo(f'Resumo mensal reconstruído: {linhas} linha(s).')
+
+@click.command('precalcular-previsoes')
+@with_appcontext
+@click.option('--tamanho-lote', default=500, show_default=True, help='Usuários lidos por consulta.')
+def precalcular_previsoes_comando(tamanho_lote):
+    """Calcula no cache a previsão de gastos de todos os usuários (rodar fora do pico, pelo cron)."""
+    if current_app.config['CACHE_TYPE'] == 'SimpleCache':
+        click.echo('Aviso: SimpleCache é local a cada processo; use FileSystemCache ou RedisCache para os workers aproveitarem.')
+    calculadas = precalcular_previsoes(tamanho_lote)
+    click.echo(f'{calculadas} previsão(ões) calculada(s).')
+
+@click.command('reconciliar-resumo')
+@with_appcontext
+@click.option('--usuario-id', type=int, default=None, help='Reconcilia apenas este usuário.')
+def reconciliar_resumo_comando(usuario_id):
+    """Corrige só as linhas do resumo mensal (contadores das metas) que divergem de Transacao."""
+    resultado = reconciliar_resumo(usuario_id)
+    click.echo(
+        f"Resumo mensal reconciliado: {resultado['corrigidas']} corrigida(s), "
+        f"{resultado['criadas']} criada(s), {resultado['removidas']} removida(s)."
+    )
+
+@click.command('materializar-recorrencias')
+@with_appcontext
+@click.option('--data', 'data_limite', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Lança as ocorrências vencidas até esta data (padrão: hoje).')
+def materializar_recorrencias_comando(data_limite):
+    """Lança as transações recorrentes vencidas de todos os usuários (idempotente; para o cron)."""
+    criadas = materializar_recorrencias(
+        data_limite.date() if data_limite else None, current_app.config['TAMANHO_LOTE_RECORRENCIAS']
+    )
+    click.echo(f'{criadas} transação(ões) recorrente(s) lançada(s).')
+
+@click.command('manter-exportacoes')
+@with_appcontext
+def manter_exportacoes_comando():
+    """Apaga exportações expiradas (EXPORTACAO_TTL) e marca como erro as tarefas paradas (para o cron)."""
+    apagadas, recuperadas = manter_exportacoes(forcar=True)
+    click.echo(f'{apagadas} exportação(ões) expirada(s) apagada(s), {recuperadas} tarefa(s) parada(s) marcada(s) como erro.')
+
+
+def registrar_comandos(app):
+    """Registra os comandos de manutenção no `flask` CLI da aplicação."""
+    for comando in (
+        verificar_indices,
+        importar_transacoes_comando,
+        reconstruir_resumo_comando,
+        precalcular_previsoes_comando,
+        reconciliar_resumo_comando,
+        materializar_recorrencias_comando,
+        manter_exportacoes_comando,
+    ):
+        app.cli.add_command(comando)
@@ -0,0 +1,83 @@
+from banco import url_banco, opcoes_engine
+from replica import BIND_REPLICA
+import os
+
+
+def carregar_configuracao(app, config=None):
+    """
+    Lê a configuração das variáveis de ambiente e aplica por cima `config`
+    (dict passado a create_app(), ex.: em testes e benchmarks). Opções que
+    dependem de outras (engine do banco) são calculadas depois.
+    """
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-key')
+    app.config['SQLALCHEMY_DATABASE_URI'] = url_banco(os.getenv('DATABASE_URL', 'sqlite:///finance.db'))
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['WTF_CSRF_ENABLED'] = True
+    app.config['WTF_CSRF_TIME_LIMIT'] = None
+    app.config['TAMANHO_LOTE_EXPORTACAO'] = int(os.getenv('TAMANHO_LOTE_EXPORTACAO', 1000))
+    app.config['PDF_LINHAS_POR_TABELA'] = int(os.getenv('PDF_LINHAS_POR_TABELA', 40))
+    app.config['PDF_MAX_MEMORIA'] = int(os.getenv('PDF_MAX_MEMORIA', 5 * 1024 * 1024))
+    app.config['EXPORTACAO_PROCESSOS'] = int(os.getenv('EXPORTACAO_PROCESSOS', 2))
+    # Exportações em segundo plano: arquivos e tarefas apagados depois de EXPORTACAO_TTL
+    # segundos; tarefas pendentes/processando há mais de EXPORTACAO_TEMPO_MAXIMO segundos
+    # (processo reiniciado ou morto) viram erro. A manutenção roda nas próprias rotas, no
+    # máximo a cada EXPORTACAO_INTERVALO_MANUTENCAO segundos, ou por `flask manter-exportacoes`
+    app.config['EXPORTACAO_DIRETORIO'] = os.getenv('EXPORTACAO_DIRETORIO', os.path.join(app.instance_path, 'exportacoes'))
+    app.config['EXPORTACAO_TTL'] = int(os.getenv('EXPORTACAO_TTL', 24 * 3600))
+    app.config['EXPORTACAO_TEMPO_MAXIMO'] = int(os.getenv('EXPORTACAO_TEMPO_MAXIMO', 30 * 60))
+    app.config['EXPORTACAO_INTERVALO_MANUTENCAO'] = int(os.getenv('EXPORTACAO_INTERVALO_MANUTENCAO', 300))
+    app.config['TAMANHO_LOTE_IMPORTACAO'] = int(os.getenv('TAMANHO_LOTE_IMPORTACAO', 1000))
+    app.config['TAMANHO_PAGINA'] = int(os.getenv('TAMANHO_PAGINA', 20))
+    # SimpleCache (padrão), FileSystemCache ou RedisCache (com CACHE_REDIS_URL)
+    app.config['CACHE_TYPE'] = os.getenv('CACHE_TYPE', 'SimpleCache')
+    app.config['CACHE_DEFAULT_TIMEOUT'] = int(os.getenv('CACHE_DEFAULT_TIMEOUT', 600))
+    app.config['CACHE_DIR'] = os.getenv('CACHE_DIR', os.path.join(app.instance_path, 'cache'))
+    app.config['CACHE_REDIS_URL'] = os.getenv('CACHE_REDIS_URL')
+    # Pool de conexões (PostgreSQL e outros bancos servidor)
+    app.config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', 5))
+    app.config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    app.config['DB_POOL_TIMEOUT'] = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    app.config['DB_POOL_RECYCLE'] = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    # Réplica de leitura opcional (ver replica.py); a janela deve cobrir o atraso da replicação
+    if os.getenv('DATABASE_REPLICA_URL'):
+        app.config['SQLALCHEMY_BINDS'] = {BIND_REPLICA: url_banco(os.getenv('DATABASE_REPLICA_URL'))}
+    app.config['REPLICA_JANELA_LEITURA'] = int(os.getenv('REPLICA_JANELA_LEITURA', 5))
+    # Cache de identidade usado pelo user_loader (ver identidade.py)
+    app.config['USUARIO_CACHE_TTL'] = int(os.getenv('USUARIO_CACHE_TTL', 60))
+    app.config['USUARIO_CACHE_TAMANHO'] = int(os.getenv('USUARIO_CACHE_TAMANHO', 1024))
+    # Rate limiting: contadores compartilhados entre workers num SQLite local (ver limites.py)
+    # ou no Redis ('redis://...'); limites no formato do Flask-Limiter, separados por ';'
+    app.config['RATELIMIT_STORAGE_URI'] = os.getenv(
+        'RATELIMIT_STORAGE_URI', 'sqlite:///' + os.path.join(app.instance_path, 'limites.db')
+    )
+    app.config['RATELIMIT_DEFAULT'] = os.getenv('RATELIMIT_DEFAULT', '200 per day;50 per hour')
+    app.config['LIMITE_REGISTRO'] = os.getenv('LIMITE_REGISTRO', '5 per hour')
+    # Hash de senhas: método/custo do werkzeug (ex.: 'scrypt:32768:8:1', 'pbkdf2:sha256:1000000'),
+    # threads do pool de hashing, hashes que podem esperar na fila (além deles, recusa)
+    # e espera máxima pelo resultado (segundos); ver senhas.py
+    app.config['SENHA_METODO'] = os.getenv('SENHA_METODO', 'scrypt')
+    app.config['SENHA_THREADS'] = int(os.getenv('SENHA_THREADS', 2))
+    app.config['SENHA_FILA'] = int(os.getenv('SENHA_FILA', 8))
+    app.config['SENHA_TEMPO_MAXIMO'] = float(os.getenv('SENHA_TEMPO_MAXIMO', 10))
+    # PRAGMAs do SQLite (cache_size negativo é em KiB)
+    app.config['SQLITE_WAL'] = os.getenv('SQLITE_WAL', '1') == '1'
+    app.config['SQLITE_SYNCHRONOUS'] = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    app.config['SQLITE_BUSY_TIMEOUT'] = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))
+    app.config['SQLITE_CACHE_SIZE'] = int(os.getenv('SQLITE_CACHE_SIZE', -20000))
+    app.config['SQLITE_MMAP_SIZE'] = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    # Instrumentação (desligada por padrão; ver instrumentacao.py): /metricas exige
+    # 'Authorization: Bearer <METRICAS_TOKEN>'; PERFIL_AMOSTRAGEM=N perfila 1 a cada N
+    # requisições (0 desliga); ALERTA_CONSULTAS_SQL avisa no log acima de N comandos SQL
+    app.config['INSTRUMENTACAO'] = os.getenv('INSTRUMENTACAO', '0') == '1'
+    app.config['METRICAS_TOKEN'] = os.getenv('METRICAS_TOKEN')
+    app.config['PERFIL_AMOSTRAGEM'] = int(os.getenv('PERFIL_AMOSTRAGEM', 0))
+    app.config['ALERTA_CONSULTAS_SQL'] = int(os.getenv('ALERTA_CONSULTAS_SQL', 20))
+    # Transações recorrentes: intervalo (segundos) da thread que lança as vencidas neste
+    # processo; 0 desliga (usar `flask materializar-recorrencias` no cron)
+    app.config['RECORRENCIAS_INTERVALO'] = int(os.getenv('RECORRENCIAS_INTERVALO', 0))
+    app.config['TAMANHO_LOTE_RECORRENCIAS'] = int(os.getenv('TAMANHO_LOTE_RECORRENCIAS', 500))
+    # Modo ASGI (asgi.py): threads por worker que atendem as rotas delegadas ao Flask
+    app.config['ASGI_THREADS_WSGI'] = int(os.getenv('ASGI_THREADS_WSGI', 4))
+
+    app.config.update(config or {})
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', opcoes_engine(app.config))
@@ -0,0 +1,38 @@
+from sqlalchemy import BigInteger, type_coerce
+from sqlalchemy.types import TypeDecorator
+from decimal import Decimal, ROUND_HALF_UP
+
+
+def para_centavos(valor):
+    """Converte um valor em reais (float, str ou Decimal) para centavos inteiros, arredondando meio para cima."""
+    if valor is None:
+        return None
+    return int((Decimal(str(valor)) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def para_reais(centavos):
+    """Converte centavos inteiros de volta para reais."""
+    if centavos is None:
+        return None
+    return int(centavos) / 100
+
+
+class Dinheiro(TypeDecorator):
+    """
+    Valor monetário gravado como inteiro (BIGINT) em centavos. O código continua
+    trabalhando em reais; somas no banco são feitas sobre inteiros, sem erro
+    de arredondamento de ponto flutuante.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return para_centavos(value)
+
+    def process_result_value(self, value, dialect):
+        return para_reais(value)
+
+
+def em_centavos(coluna):
+    """Expressão que lê uma coluna Dinheiro (ou uma soma dela) como centavos inteiros, sem conversão."""
+    return type_coerce(coluna, BigInteger)
@@ -0,0 +1,324 @@
+from extensions import db, cache
+from models import Usuario, ResumoMensal, MetaOrcamento
+from dinheiro import em_centavos, para_centavos, para_reais
+from identidade import invalidar_usuario
+from replica import no_principal
+from datetime import datetime, date, timedelta
+from sqlalchemy import update, select, func, case, cast, Integer, String
+from array import array
+
+# Percentual da meta a partir do qual o dashboard mostra o alerta de orçamento
+PERCENTUAL_ALERTA_META = 80
+
+
+def primeiro_dia_mes(dia):
+    """Retorna o primeiro dia do mês da data informada."""
+    return date(dia.year, dia.month, 1)
+
+
+def proximo_mes(dia):
+    """Retorna o primeiro dia do mês seguinte à data informada."""
+    return (primeiro_dia_mes(dia) + timedelta(days=32)).replace(day=1)
+
+
+def consulta_resumo(usuario_id):
+    """Linhas do resumo mensal do usuário: (mes, tipo, categoria, total em centavos, quantidade)."""
+    return db.session.query(
+        ResumoMensal.mes,
+        ResumoMensal.tipo,
+        ResumoMensal.categoria,
+        em_centavos(ResumoMensal.total),
+        ResumoMensal.quantidade
+    ).filter(ResumoMensal.usuario_id == usuario_id)
+
+
+def colunas_resumo(linhas):
+    """
+    Organiza as linhas de consulta_resumo() em colunas: meses, tipos e
+    categorias em listas e totais (centavos) e quantidades em array('q').
+    """
+    meses, tipos, categorias = [], [], []
+    totais, quantidades = array('q'), array('q')
+    for mes, tipo, categoria, total, quantidade in linhas:
+        meses.append(mes)
+        tipos.append(tipo)
+        categorias.append(categoria)
+        totais.append(total)
+        quantidades.append(quantidade)
+    return meses, tipos, categorias, totais, quantidades
+
+
+def consulta_metas(usuario_id):
+    """Metas do usuário: (categoria, valor em centavos), com a meta do total primeiro."""
+    return db.session.query(
+        MetaOrcamento.categoria,
+        em_centavos(MetaOrcamento.valor)
+    ).filter(MetaOrcamento.usuario_id == usuario_id).order_by(
+        MetaOrcamento.categoria.is_not(None), MetaOrcamento.categoria
+    )
+
+
+def progresso_metas(metas, gastos_por_categoria, total_despesas):
+    """
+    Progresso das metas no mês a partir dos gastos do resumo mensal já somados
+    (centavos), sem agregar Transacao. `situacao` é 'ok', 'alerta' (a partir de
+    PERCENTUAL_ALERTA_META) ou 'excedida'.
+    """
+    progresso = []
+    for categoria, meta in metas:
+        gasto = total_despesas if categoria is None else gastos_por_categoria.get(categoria, 0)
+        percentual = round(100 * gasto / meta, 1) if meta else 0.0
+        progresso.append({
+            'categoria': categoria,
+            'meta': para_reais(meta),
+            'gasto': para_reais(gasto),
+            'restante': para_reais(meta - gasto),
+            'percentual': percentual,
+            'situacao': 'excedida' if gasto > meta else 'alerta' if percentual >= PERCENTUAL_ALERTA_META else 'ok'
+        })
+    return progresso
+
+
+def calcular_estatisticas(usuario_id, hoje=None):
+    """
+    Calcula o bloco de estatísticas do dashboard a partir do resumo mensal
+    (uma linha por mês, tipo e categoria), sem reagregar Transacao.
+    Retorna (estatisticas, relatorio_mensal, categorias_disponiveis).
+    """
+    return montar_estatisticas(
+        consulta_resumo(usuario_id).all(),
+        consulta_metas(usuario_id).all(),
+        db.session.execute(consulta_serie_mensal(usuario_id)).all(),
+        hoje
+    )
+
+
+def montar_estatisticas(linhas_resumo, metas, linhas_serie, hoje=None):
+    """
+    Monta o retorno de calcular_estatisticas() a partir das linhas já lidas
+    de consulta_resumo(), consulta_metas() e consulta_serie_mensal(); usado
+    também pelo modo assíncrono, que faz as três consultas em paralelo. As
+    somas são feitas em centavos inteiros e convertidas para reais no final.
+    """
+    hoje = hoje or datetime.now()
+    inicio_mes_atual = primeiro_dia_mes(hoje)
+    inicio_mes_anterior = primeiro_dia_mes(inicio_mes_atual - timedelta(days=1))
+    inicio_janela = primeiro_dia_mes(inicio_mes_anterior - timedelta(days=40)).strftime('%Y-%m')  # 3 meses fechados
+
+    mes_atual = inicio_mes_atual.strftime('%Y-%m')
+    mes_anterior = inicio_mes_anterior.strftime('%Y-%m')
+
+    meses_coluna, tipos, categorias, totais_coluna, quantidades = colunas_resumo(linhas_resumo)
+    categorias_disponiveis = list(dict.fromkeys(categorias))
+
+    gastos_mes_atual = {}
+    totais = {}
+    soma_despesas_3meses = 0
+
+    for i, mes in enumerate(meses_coluna):
+        tipo = tipos[i]
+        total = totais_coluna[i]
+
+        totais[(mes, tipo)] = totais.get((mes, tipo), 0) + total
+
+        if tipo == 'despesa':
+            if mes == mes_atual:
+                gastos_mes_atual[categorias[i]] = gastos_mes_atual.get(categorias[i], 0) + total
+            if inicio_janela <= mes < mes_atual:
+                soma_despesas_3meses += total
+
+    top_categorias = [
+        {'categoria': cat, 'total': para_reais(total)}
+        for cat, total in sorted(gastos_mes_atual.items(), key=lambda item: item[1], reverse=True)[:5]
+    ]
+
+    despesas_mes_atual = totais.get((mes_atual, 'despesa'), 0)
+    receitas_mes_atual = totais.get((mes_atual, 'receita'), 0)
+    despesas_mes_anterior = totais.get((mes_anterior, 'despesa'), 0)
+    receitas_mes_anterior = totais.get((mes_anterior, 'receita'), 0)
+
+    comparacao_mensal = {
+        'mes_atual': mes_atual,
+        'mes_anterior': mes_anterior,
+        'receitas_atual': para_reais(receitas_mes_atual),
+        'receitas_anterior': para_reais(receitas_mes_anterior),
+        'despesas_atual': para_reais(despesas_mes_atual),
+        'despesas_anterior': para_reais(despesas_mes_anterior),
+        'variacao_receitas': para_reais(receitas_mes_atual - receitas_mes_anterior),
+        'variacao_despesas': para_reais(despesas_mes_atual - despesas_mes_anterior)
+    }
+
+    # Média mensal das despesas dos 3 meses fechados anteriores (a previsão do mês fica em previsao.py)
+    media_despesas = soma_despesas_3meses / 3 / 100
+
+    estatisticas = {
+        'top_categorias': top_categorias,
+        'comparacao_mensal': comparacao_mensal,
+        'media_despesas_3meses': media_despesas,
+        'metas': progresso_metas(metas, gastos_mes_atual, despesas_mes_atual)
+    }
+
+    relatorio_mensal = [
+        {
+            'mes_ano': linha['mes'],
+            'total_receitas': linha['receitas'],
+            'total_despesas': linha['despesas'],
+            'saldo': linha['saldo']
+        }
+        for linha in reversed(formatar_serie_mensal(linhas_serie))
+    ]
+
+    return estatisticas, relatorio_mensal, categorias_disponiveis
+
+
+def totais_dashboard(filtro, relatorio_mensal, totais=None):
+    """
+    (total_receitas, total_despesas, relatorio_mensal) dos cards do dashboard:
+    os `totais` do filtro (de consulta_totais(), em centavos) quando
+    filtro.precisa_totais, senão a soma do relatório mensal. Com período
+    completo o relatório mensal não é exibido (None).
+    """
+    if filtro.precisa_totais:
+        receitas, despesas = totais[0], totais[1]
+        if filtro.data_inicial and filtro.data_final:
+            relatorio_mensal = None
+        return para_reais(receitas), para_reais(despesas), relatorio_mensal
+    return (
+        para_reais(sum(para_centavos(r['total_receitas']) for r in relatorio_mensal)),
+        para_reais(sum(para_centavos(r['total_despesas']) for r in relatorio_mensal)),
+        relatorio_mensal
+    )
+
+
+def indice_mes(mes):
+    """Número sequencial (ano * 12 + mês - 1) de um mês 'AAAA-MM', calculado no banco."""
+    return cast(func.substr(mes, 1, 4), Integer) * 12 + cast(func.substr(mes, 6, 2), Integer) - 1
+
+
+def mes_do_indice(indice):
+    """Mês 'AAAA-MM' de um número de indice_mes(), calculado no banco."""
+    numero = indice % 12 + 1
+    return cast(indice // 12, String) + '-' + case((numero < 10, '0'), else_='') + cast(numero, String)
+
+
+def consulta_serie_mensal(usuario_id):
+    """
+    Série mensal do usuário calculada no banco sobre o resumo mensal, em
+    centavos: (mes, receitas, despesas, saldo, saldo_acumulado,
+    media_movel_despesas). Os meses sem movimento entre o primeiro e o último
+    entram zerados (CTE recursiva), então o saldo acumulado e a média móvel
+    das despesas (mês atual e os dois anteriores) usam funções de janela sobre
+    meses corridos.
+    """
+    total = em_centavos(ResumoMensal.total)
+    mensal = select(
+        indice_mes(ResumoMensal.mes).label('indice'),
+        func.sum(case((ResumoMensal.tipo == 'receita', total), else_=0)).label('receitas'),
+        func.sum(case((ResumoMensal.tipo == 'despesa', total), else_=0)).label('despesas')
+    ).where(ResumoMensal.usuario_id == usuario_id).group_by(ResumoMensal.mes).cte('mensal')
+
+    meses = select(
+        func.min(mensal.c.indice).label('indice'),
+        func.max(mensal.c.indice).label('ultimo')
+    ).having(func.count() > 0).cte('meses', recursive=True)
+    meses = meses.union_all(select(meses.c.indice + 1, meses.c.ultimo).where(meses.c.indice < meses.c.ultimo))
+
+    receitas = func.coalesce(mensal.c.receitas, 0)
+    despesas = func.coalesce(mensal.c.despesas, 0)
+    saldo = receitas - despesas
+    return select(
+        mes_do_indice(meses.c.indice).label('mes'),
+        receitas.label('receitas'),
+        despesas.label('despesas'),
+        saldo.label('saldo'),
+        func.sum(saldo).over(order_by=meses.c.indice, rows=(None, 0)).label('saldo_acumulado'),
+        func.avg(despesas).over(order_by=meses.c.indice, rows=(-2, 0)).label('media_movel_despesas')
+    ).select_from(meses.outerjoin(mensal, mensal.c.indice == meses.c.indice)).order_by(meses.c.indice)
+
+
+def serie_mensal(usuario_id):
+    """Série mensal (do mês mais antigo ao mais recente) em reais, pronta para JSON."""
+    return formatar_serie_mensal(db.session.execute(consulta_serie_mensal(usuario_id)))
+
+
+def formatar_serie_mensal(linhas):
+    """Converte as linhas de consulta_serie_mensal() (centavos) para reais."""
+    return [
+        {
+            'mes': mes,
+            'receitas': para_reais(receitas),
+            'despesas': para_reais(despesas),
+            'saldo': para_reais(saldo),
+            'saldo_acumulado': para_reais(saldo_acumulado),
+            'media_movel_despesas': round(media_movel / 100, 2)
+        }
+        for mes, receitas, despesas, saldo, saldo_acumulado, media_movel in linhas
+    ]
+
+
+def consulta_distribuicao_categorias(usuario_id, tipo='despesa', mes=None):
+    """
+    (categoria, total, quantidade, total_geral) de cada categoria do `tipo`,
+    em centavos, no mês 'AAAA-MM' informado ou em todo o histórico. O total
+    geral vem de uma função de janela na mesma consulta.
+    """
+    total = func.sum(em_centavos(ResumoMensal.total))
+    consulta = select(
+        ResumoMensal.categoria,
+        total.label('total'),
+        func.sum(ResumoMensal.quantidade).label('quantidade'),
+        func.sum(total).over().label('total_geral')
+    ).where(ResumoMensal.usuario_id == usuario_id, ResumoMensal.tipo == tipo)
+    if mes:
+        consulta = consulta.where(ResumoMensal.mes == mes)
+    return consulta.group_by(ResumoMensal.categoria).order_by(total.desc())
+
+
+def distribuicao_categorias(usuario_id, tipo='despesa', mes=None):
+    """Total, quantidade e participação (%) de cada categoria do `tipo`, no mês informado ou em todo o histórico."""
+    return formatar_distribuicao(db.session.execute(consulta_distribuicao_categorias(usuario_id, tipo, mes)))
+
+
+def formatar_distribuicao(linhas):
+    """Converte as linhas de consulta_distribuicao_categorias() para reais e participação (%)."""
+    return [
+        {
+            'categoria': categoria,
+            'total': para_reais(soma),
+            'quantidade': quantidade,
+            'participacao': round(100 * soma / total_geral, 2) if total_geral else 0.0
+        }
+        for categoria, soma, quantidade, total_geral in linhas
+    ]
+
+
+def chave_estatisticas(usuario):
+    """Chave de cache das estatísticas: versão dos dados do usuário e dia atual."""
+    return f'estatisticas:{usuario.id}:{usuario.versao_dados}:{date.today().isoformat()}'
+
+
+def estatisticas_usuario(usuario):
+    """
+    Versão em cache de calcular_estatisticas(). A chave (chave_estatisticas)
+    inclui a versão dos dados do usuário (ver invalidar_estatisticas) e o dia
+    atual, já que o mês corrente e a previsão dependem da data. Calculada
+    sempre no banco principal, que é quem define a versão.
+    """
+    chave = chave_estatisticas(usuario)
+    resultado = cache.get(chave)
+    if resultado is None:
+        with no_principal():
+            resultado = calcular_estatisticas(usuario.id)
+        cache.set(chave, resultado)
+    return resultado
+
+
+def invalidar_estatisticas(usuario_id):
+    """Incrementa a versão dos dados do usuário na transação atual, invalidando seu cache."""
+    db.session.execute(
+        update(Usuario).where(Usuario.id == usuario_id).values(
+            versao_dados=Usuario.versao_dados + 1,
+            dados_alterados_em=datetime.utcnow()
+        )
+    )
+    invalidar_usuario(usuario_id)
@@ -0,0 +1,356 @@
+from flask import current_app
+from extensions import db
+from models import TarefaExportacao
+from listagem import totais_transacoes
+from filtros import FiltroTransacoes
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from io import StringIO
+import csv
+import json
+import os
+import time
+
+# O reportlab só é importado na geração do PDF, para não pesar na inicialização
+
+
+@lru_cache(maxsize=None)
+def estilo_tabela_transacoes_pdf():
+    """Estilo das tabelas de transações do PDF, montado uma vez por processo."""
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+    ])
+
+
+def linhas_exportacao(filtro, tamanho_lote):
+    """Itera (data, descricao, tipo, categoria, valor) do filtro em lotes de `tamanho_lote` linhas."""
+    return db.session.execute(filtro.consulta_exportacao(), execution_options={'yield_per': tamanho_lote})
+
+
+CABECALHO_CSV = ['Data', 'Descrição', 'Tipo', 'Categoria', 'Valor']
+
+
+def linha_csv(data, descricao, tipo, categoria, valor):
+    """Campos de uma linha de consulta_exportacao() no CSV exportado."""
+    return [
+        data.strftime('%d/%m/%Y'),
+        descricao,
+        tipo.capitalize(),
+        categoria or 'Sem categoria',
+        f'R$ {valor:.2f}'
+    ]
+
+
+def gerar_csv(filtro, tamanho_lote):
+    """Gera o CSV em blocos de texto de até `tamanho_lote` linhas."""
+    si = StringIO()
+    writer = csv.writer(si)
+
+    # Cabeçalho
+    writer.writerow(CABECALHO_CSV)
+
+    # Dados, enviados em blocos de tamanho_lote linhas
+    for i, linha in enumerate(linhas_exportacao(filtro, tamanho_lote), 1):
+        writer.writerow(linha_csv(*linha))
+        if i % tamanho_lote == 0:
+            yield si.getvalue()
+            si.seek(0)
+            si.truncate(0)
+
+    yield si.getvalue()
+
+
+def tabela_transacoes_pdf(data):
+    """Monta uma tabela de transações (cabeçalho + linhas) para o relatório em PDF."""
+    from reportlab.platypus import Table
+    from reportlab.lib.units import inch
+
+    table = Table(data, colWidths=[1*inch, 2.5*inch, 1*inch, 1.2*inch, 1*inch])
+    table.setStyle(estilo_tabela_transacoes_pdf())
+    return table
+
+
+def gerar_pdf(arquivo, filtro, nome_usuario):
+    """Escreve o relatório financeiro em PDF do FiltroTransacoes no objeto de arquivo `arquivo`."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.units import inch
+
+    # Calcular totais no banco
+    total_receitas, total_despesas, quantidade = totais_transacoes(filtro)
+    saldo = total_receitas - total_despesas
+
+    doc = SimpleDocTemplate(arquivo, pagesize=A4)
+    elements = []
+
+    # Estilos
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=30,
+        alignment=1  # Centralizado
+    )
+
+    # Título
+    title = Paragraph(f"Relatório Financeiro - {nome_usuario}", title_style)
+    elements.append(title)
+    elements.append(Spacer(1, 0.2*inch))
+
+    # Informações do período
+    periodo_text = f"Gerado em: {datetime.now().strftime('%d/%m/%Y às %H:%M')}"
+    if filtro.data_inicial and filtro.data_final:
+        periodo_text += f"<br/>Período: {filtro.data_inicial_str} a {filtro.data_final_str}"
+    periodo = Paragraph(periodo_text, styles['Normal'])
+    elements.append(periodo)
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Resumo financeiro
+    resumo_data = [
+        ['Resumo Financeiro', ''],
+        ['Total de Receitas:', f'R$ {total_receitas:.2f}'],
+        ['Total de Despesas:', f'R$ {total_despesas:.2f}'],
+        ['Saldo:', f'R$ {saldo:.2f}']
+    ]
+
+    resumo_table = Table(resumo_data, colWidths=[3*inch, 2*inch])
+    resumo_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ]))
+
+    elements.append(resumo_table)
+    elements.append(Spacer(1, 0.4*inch))
+
+    # Tabela de transações, dividida em tabelas de PDF_LINHAS_POR_TABELA linhas
+    if quantidade:
+        transacoes_title = Paragraph("Transações", styles['Heading2'])
+        elements.append(transacoes_title)
+        elements.append(Spacer(1, 0.2*inch))
+
+        cabecalho = ['Data', 'Descrição', 'Tipo', 'Categoria', 'Valor']
+        linhas_por_tabela = current_app.config['PDF_LINHAS_POR_TABELA']
+        tamanho_lote = current_app.config['TAMANHO_LOTE_EXPORTACAO']
+        data = [cabecalho]
+
+        for data_transacao, descricao, tipo, categoria, valor in linhas_exportacao(filtro, tamanho_lote):
+            data.append([
+                data_transacao.strftime('%d/%m/%Y'),
+                descricao[:30] + '...' if len(descricao) > 30 else descricao,
+                tipo.capitalize(),
+                (categoria[:15] + '...') if categoria and len(categoria) > 15 else (categoria or 'N/A'),
+                f'R$ {valor:.2f}'
+            ])
+            if len(data) > linhas_por_tabela:
+                elements.append(tabela_transacoes_pdf(data))
+                data = [cabecalho]
+
+        if len(data) > 1:
+            elements.append(tabela_transacoes_pdf(data))
+    else:
+        no_data = Paragraph("Nenhuma transação encontrada para o período selecionado.", styles['Normal'])
+        elements.append(no_data)
+
+    # Construir PDF
+    doc.build(elements)
+
+
+# --- Tarefas de exportação em segundo plano ---
+
+_executor = None
+_app = None
+
+
+def _inicializar_processo(config):
+    """Cria a aplicação do processo do pool com a configuração do worker que o iniciou."""
+    global _app
+    from app import create_app
+
+    _app = create_app(config)
+    # Conexões herdadas do processo pai (fork) não podem ser reutilizadas
+    with _app.app_context():
+        db.engine.dispose(close=False)
+
+
+def executor_exportacoes():
+    """Pool de processos compartilhado pelas tarefas de exportação deste worker."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=current_app.config['EXPORTACAO_PROCESSOS'],
+            initializer=_inicializar_processo,
+            # Sem a thread de recorrências: ela já roda no worker, se ligada
+            initargs=({**current_app.config, 'RECORRENCIAS_INTERVALO': 0},)
+        )
+    return _executor
+
+
+def diretorio_exportacoes():
+    """Diretório (EXPORTACAO_DIRETORIO, por padrão instance/exportacoes) onde os arquivos gerados ficam guardados."""
+    diretorio = current_app.config['EXPORTACAO_DIRETORIO']
+    os.makedirs(diretorio, exist_ok=True)
+    return diretorio
+
+
+def _remover_arquivo(caminho):
+    if caminho and os.path.exists(caminho):
+        os.remove(caminho)
+
+
+def limpar_exportacoes(agora=None):
+    """
+    Apaga as tarefas concluídas ou com erro criadas há mais de EXPORTACAO_TTL
+    segundos, com seus arquivos, e os arquivos antigos sem tarefa (processo
+    morto no meio da escrita). Retorna o número de tarefas apagadas.
+    """
+    agora = agora or datetime.utcnow()
+    limite = agora - timedelta(seconds=current_app.config['EXPORTACAO_TTL'])
+    antigas = db.session.scalars(select(TarefaExportacao).where(
+        TarefaExportacao.status.in_(('concluida', 'erro')),
+        TarefaExportacao.criada_em < limite
+    )).all()
+    for tarefa in antigas:
+        _remover_arquivo(tarefa.arquivo)
+        db.session.delete(tarefa)
+    db.session.commit()
+
+    diretorio = diretorio_exportacoes()
+    existentes = set(db.session.scalars(select(TarefaExportacao.id)))
+    for nome in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, nome)
+        if nome.split('.')[0] not in existentes and datetime.utcfromtimestamp(os.path.getmtime(caminho)) < limite:
+            _remover_arquivo(caminho)
+    return len(antigas)
+
+
+def recuperar_tarefas_paradas(agora=None):
+    """
+    Marca como erro as tarefas pendentes ou em processamento há mais de
+    EXPORTACAO_TEMPO_MAXIMO segundos: o pool que as recebeu não existe mais
+    (reinício ou queda do worker) e o cliente pararia de acompanhar só por
+    tempo. Arquivos parciais são apagados. Retorna o número de tarefas marcadas.
+    """
+    agora = agora or datetime.utcnow()
+    limite = agora - timedelta(seconds=current_app.config['EXPORTACAO_TEMPO_MAXIMO'])
+    paradas = db.session.scalars(select(TarefaExportacao).where(
+        TarefaExportacao.status.in_(('pendente', 'processando')),
+        TarefaExportacao.criada_em < limite
+    )).all()
+    for tarefa in paradas:
+        _remover_arquivo(os.path.join(diretorio_exportacoes(), f'{tarefa.id}.{tarefa.formato}'))
+        tarefa.status = 'erro'
+        tarefa.erro = 'Exportação interrompida (reinício ou falha do servidor). Gere novamente.'
+        tarefa.concluida_em = agora
+    db.session.commit()
+    return len(paradas)
+
+
+_ultima_manutencao = 0
+
+
+def manter_exportacoes(forcar=False):
+    """
+    limpar_exportacoes() + recuperar_tarefas_paradas(), no máximo uma vez a
+    cada EXPORTACAO_INTERVALO_MANUTENCAO segundos por processo (chamada pelas
+    rotas de exportação), ou sempre com `forcar`. Retorna (apagadas, recuperadas).
+    """
+    global _ultima_manutencao
+    agora = time.monotonic()
+    if not forcar and agora - _ultima_manutencao < current_app.config['EXPORTACAO_INTERVALO_MANUTENCAO']:
+        return 0, 0
+    _ultima_manutencao = agora
+    return limpar_exportacoes(), recuperar_tarefas_paradas()
+
+
+def criar_tarefa(usuario_id, formato, args):
+    """Registra uma tarefa de exportação e a envia ao pool de processos."""
+    manter_exportacoes()
+    filtros = FiltroTransacoes.de_args(usuario_id, args).como_dict()
+    tarefa = TarefaExportacao(usuario_id=usuario_id, formato=formato, filtros=json.dumps(filtros))
+    db.session.add(tarefa)
+    db.session.commit()
+
+    try:
+        enviar_tarefa(tarefa.id)
+    except Exception as e:
+        # Sem pool para rodar a tarefa: erro já, em vez de pendente até recuperar_tarefas_paradas()
+        tarefa.status = 'erro'
+        tarefa.erro = f'Não foi possível iniciar a exportação ({e}). Tente novamente.'[:500]
+        tarefa.concluida_em = datetime.utcnow()
+        db.session.commit()
+    return tarefa
+
+
+def enviar_tarefa(tarefa_id):
+    """
+    Envia a tarefa ao pool. Se um processo do pool morreu (ex.: falta de
+    memória num PDF grande) o pool fica quebrado para sempre: ele é
+    substituído por um novo e o envio é repetido uma vez.
+    """
+    global _executor
+    try:
+        executor_exportacoes().submit(executar_tarefa, tarefa_id)
+    except BrokenProcessPool:
+        _executor.shutdown(wait=False)
+        _executor = None
+        executor_exportacoes().submit(executar_tarefa, tarefa_id)
+
+
+def executar_tarefa(tarefa_id):
+    """Gera o arquivo de uma tarefa. Roda em um processo do pool, com contexto próprio."""
+    with _app.app_context():
+        tarefa = db.session.get(TarefaExportacao, tarefa_id)
+        if tarefa is None or tarefa.status != 'pendente':
+            return
+        tarefa.status = 'processando'
+        db.session.commit()
+
+        caminho = os.path.join(diretorio_exportacoes(), f'{tarefa.id}.{tarefa.formato}')
+        try:
+            filtro = FiltroTransacoes.de_args(tarefa.usuario_id, json.loads(tarefa.filtros or '{}'))
+            if tarefa.formato == 'csv':
+                with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+                    for bloco in gerar_csv(filtro, _app.config['TAMANHO_LOTE_EXPORTACAO']):
+                        arquivo.write(bloco)
+            else:
+                with open(caminho, 'wb') as arquivo:
+                    gerar_pdf(arquivo, filtro, tarefa.usuario.nome)
+        except Exception as e:
+            db.session.rollback()
+            if os.path.exists(caminho):
+                os.remove(caminho)
+            tarefa.status = 'erro'
+            tarefa.erro = str(e)[:500]
+        else:
+            tarefa.status = 'concluida'
+            tarefa.arquivo = caminho
+        tarefa.concluida_em = datetime.utcnow()
+        db.session.commit()
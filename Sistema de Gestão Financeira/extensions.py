@@ -1,6 +1,16 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from flask_migrate import Migrate
+from flask_caching import Cache
+from flask_wtf.csrf import CSRFProtect
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from replica import SessaoRoteada
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': SessaoRoteada})
 login_manager = LoginManager()
-login_manager.login_view = 'login'
\ No newline at end of file
+migrate = Migrate()
+cache = Cache()
+csrf = CSRFProtect()
+limiter = Limiter(key_func=get_remote_address)
+login_manager.login_view = 'auth.login'
\ No newline at end of file
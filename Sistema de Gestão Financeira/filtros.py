@@ -0,0 +1,119 @@
+from models import Transacao
+from busca import criterio_busca
+from dinheiro import em_centavos
+from datetime import datetime, timedelta
+from sqlalchemy import select, lambda_stmt, func, case
+
+
+class FiltroTransacoes:
+    """
+    Filtros do dashboard, da API e das exportações (data_inicial, data_final,
+    tipo, categoria, busca), validados uma única vez em de_args().
+
+    As consultas são montadas com lambda_stmt: cada combinação de filtros é
+    construída e compilada uma vez e reaproveitada pelo cache de compilação
+    do SQLAlchemy; os valores dos filtros entram como parâmetros.
+    """
+
+    CAMPOS = ('data_inicial', 'data_final', 'tipo', 'categoria', 'busca')
+
+    def __init__(self, usuario_id, data_inicial=None, data_final=None, tipo=None, categoria=None, busca=None):
+        self.usuario_id = usuario_id
+        self.data_inicial = data_inicial
+        self.data_final = data_final
+        self.tipo = tipo
+        self.categoria = categoria
+        self.busca = busca
+        self.erros = []
+
+    @classmethod
+    def de_args(cls, usuario_id, args):
+        """Lê os filtros de request.args (ou de um dict). Datas inválidas são descartadas e registradas em `erros`."""
+        filtro = cls(
+            usuario_id,
+            tipo=args.get('tipo') or None,
+            categoria=args.get('categoria') or None,
+            busca=args.get('busca') or None
+        )
+        for campo, nome in (('data_inicial', 'Data Inicial'), ('data_final', 'Data Final')):
+            texto = args.get(campo)
+            if texto:
+                try:
+                    setattr(filtro, campo, datetime.strptime(texto, '%Y-%m-%d').date())
+                except ValueError:
+                    filtro.erros.append(f'Formato de {nome} inválido.')
+        return filtro
+
+    @property
+    def data_inicial_str(self):
+        return self.data_inicial.strftime('%Y-%m-%d') if self.data_inicial else None
+
+    @property
+    def data_final_str(self):
+        return self.data_final.strftime('%Y-%m-%d') if self.data_final else None
+
+    @property
+    def precisa_totais(self):
+        """True se os totais do dashboard devem ser somados em Transacao (e não lidos do resumo mensal)."""
+        return bool((self.data_inicial and self.data_final) or self.tipo or self.categoria or self.busca)
+
+    def como_dict(self):
+        """Filtros válidos no formato de request.args (para guardar em tarefas de exportação)."""
+        valores = {
+            'data_inicial': self.data_inicial_str,
+            'data_final': self.data_final_str,
+            'tipo': self.tipo,
+            'categoria': self.categoria,
+            'busca': self.busca
+        }
+        return {campo: valor for campo, valor in valores.items() if valor}
+
+    def _aplicar(self, stmt):
+        # Variáveis locais: o lambda_stmt transforma os valores capturados em parâmetros
+        usuario_id = self.usuario_id
+        stmt += lambda s: s.where(Transacao.usuario_id == usuario_id)
+
+        if self.data_inicial:
+            inicio = self.data_inicial
+            stmt += lambda s: s.where(Transacao.data >= inicio)
+
+        if self.data_final:
+            fim = self.data_final + timedelta(days=1)
+            stmt += lambda s: s.where(Transacao.data < fim)
+
+        if self.tipo and self.tipo != 'todos':
+            tipo = self.tipo
+            stmt += lambda s: s.where(Transacao.tipo == tipo)
+
+        if self.categoria and self.categoria != 'todas':
+            categoria = self.categoria
+            stmt += lambda s: s.where(Transacao.categoria == categoria)
+
+        if self.busca:
+            # Elemento SQL capturado pelo lambda: entra no cache pela estrutura (FTS5 ou ILIKE), com o texto como parâmetro
+            criterio = criterio_busca(self.busca)
+            stmt += lambda s: s.where(criterio)
+
+        return stmt
+
+    def consulta_transacoes(self):
+        """select(Transacao) com os filtros."""
+        return self._aplicar(lambda_stmt(lambda: select(Transacao)))
+
+    def consulta_totais(self):
+        """(receitas, despesas, quantidade) com os filtros; somas em centavos."""
+        return self._aplicar(lambda_stmt(lambda: select(
+            func.coalesce(func.sum(case((Transacao.tipo == 'receita', em_centavos(Transacao.valor)), else_=0)), 0),
+            func.coalesce(func.sum(case((Transacao.tipo == 'despesa', em_centavos(Transacao.valor)), else_=0)), 0),
+            func.count(Transacao.id)
+        )))
+
+    def consulta_exportacao(self):
+        """(data, descricao, tipo, categoria, valor) com os filtros, da data mais recente para a mais antiga."""
+        return self._aplicar(lambda_stmt(lambda: select(
+            Transacao.data,
+            Transacao.descricao,
+            Transacao.tipo,
+            Transacao.categoria,
+            Transacao.valor
+        ).order_by(Transacao.data.desc())))
@@ -0,0 +1,113 @@
+from extensions import db
+from models import Usuario
+from flask import current_app, session, has_request_context
+from flask_login import UserMixin
+from collections import OrderedDict
+from sqlalchemy import event, select
+import threading
+import time
+
+
+class UsuarioAutenticado(UserMixin):
+    """Registro leve do usuário logado (sem relacionamentos), usado como current_user."""
+
+    def __init__(self, id, nome, email, versao_dados, dados_alterados_em):
+        self.id = id
+        self.nome = nome
+        self.email = email
+        self.versao_dados = versao_dados
+        self.dados_alterados_em = dados_alterados_em
+
+
+class CacheTTL:
+    """Cache LRU em memória, seguro entre threads, com validade de `ttl` segundos por item."""
+
+    def __init__(self, max_itens, ttl):
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave):
+        """Retorna (valor, guardado_em) ou None se ausente ou expirado."""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            if time.time() - item[1] > self.ttl:
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return item
+
+    def guardar(self, chave, valor, guardado_em):
+        with self._lock:
+            self._itens[chave] = (valor, guardado_em)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def remover(self, chave):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+
+_usuarios = None
+
+
+def _cache_usuarios():
+    global _usuarios
+    if _usuarios is None:
+        _usuarios = CacheTTL(current_app.config['USUARIO_CACHE_TAMANHO'], current_app.config['USUARIO_CACHE_TTL'])
+    return _usuarios
+
+
+def consulta_usuario(usuario_id):
+    """Colunas de UsuarioAutenticado do usuário."""
+    return select(
+        Usuario.id, Usuario.nome, Usuario.email, Usuario.versao_dados, Usuario.dados_alterados_em
+    ).where(Usuario.id == usuario_id)
+
+
+def usuario_em_cache(usuario_id, ultima_escrita=0):
+    """Usuário do cache de identidade, se guardado depois de `ultima_escrita`; senão None."""
+    item = _cache_usuarios().obter(usuario_id)
+    if item is not None and item[1] >= ultima_escrita:
+        return item[0]
+    return None
+
+
+def guardar_usuario(usuario_id, linha, guardado_em):
+    """Guarda no cache a linha de consulta_usuario() lida em `guardado_em` e retorna o UsuarioAutenticado (None se não existe)."""
+    if linha is None:
+        _cache_usuarios().remover(usuario_id)
+        return None
+    usuario = UsuarioAutenticado(*linha)
+    _cache_usuarios().guardar(usuario_id, usuario, guardado_em)
+    return usuario
+
+
+def carregar_usuario(usuario_id):
+    """
+    user_loader do Flask-Login com cache por processo. Um registro guardado
+    antes da última escrita do próprio usuário (cookie 'ultima_escrita', ver
+    replica.py) é recarregado, mesmo que a escrita tenha ocorrido em outro worker.
+    """
+    ultima_escrita = session.get('ultima_escrita', 0) if has_request_context() else 0
+    usuario = usuario_em_cache(usuario_id, ultima_escrita)
+    if usuario is not None:
+        return usuario
+
+    guardado_em = time.time()
+    return guardar_usuario(usuario_id, db.session.execute(consulta_usuario(usuario_id)).first(), guardado_em)
+
+
+def invalidar_usuario(usuario_id):
+    """Remove o usuário do cache de identidade deste processo."""
+    if _usuarios is not None:
+        _usuarios.remover(usuario_id)
+
+
+@event.listens_for(Usuario, 'after_update')
+def _usuario_alterado(mapper, conexao, usuario):
+    invalidar_usuario(usuario.id)
@@ -0,0 +1,177 @@
+from extensions import db
+from models import Transacao
+from validacao import validar_dados_transacao
+from resumo import ajustar_resumo_em_lote
+from estatisticas import invalidar_estatisticas
+from dinheiro import para_centavos, para_reais
+from datetime import datetime
+from sqlalchemy import insert
+import csv
+import re
+
+# Cabeçalhos aceitos no CSV (em minúsculas, sem acentos) -> campo da transação
+COLUNAS_CSV = {
+    'data': 'data',
+    'descricao': 'descricao',
+    'historico': 'descricao',
+    'valor': 'valor',
+    'tipo': 'tipo',
+    'categoria': 'categoria',
+}
+
+FORMATOS_DATA = ('%Y-%m-%d', '%d/%m/%Y', '%d/%m/%y', '%Y%m%d')
+
+
+def _normalizar_cabecalho(nome):
+    nome = (nome or '').strip().lower()
+    for origem, destino in (('ç', 'c'), ('ã', 'a'), ('á', 'a'), ('é', 'e'), ('ê', 'e'), ('í', 'i'), ('ó', 'o')):
+        nome = nome.replace(origem, destino)
+    return nome
+
+
+def normalizar_valor(texto):
+    """Converte '1.234,56', 'R$ -12,30' ou '-12.30' em float. Retorna None se inválido."""
+    texto = (texto or '').replace('R$', '').replace(' ', '').strip()
+    if not texto:
+        return None
+    if ',' in texto:
+        texto = texto.replace('.', '').replace(',', '.')
+    try:
+        return float(texto)
+    except ValueError:
+        return None
+
+
+def normalizar_data(texto):
+    """Converte as datas aceitas na importação para o formato 'AAAA-MM-DD' do formulário."""
+    texto = (texto or '').strip()[:10]
+    for formato in FORMATOS_DATA:
+        try:
+            return datetime.strptime(texto, formato).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return texto
+
+
+def _linha_para_formulario(data, descricao, valor, tipo, categoria):
+    """
+    Monta os campos no formato do formulário de nova transação. Sem `tipo`,
+    valores negativos viram despesa e positivos receita, como nos extratos.
+    """
+    numero = normalizar_valor(valor)
+    tipo = (tipo or '').strip().lower()
+    if tipo not in ('receita', 'despesa') and numero is not None:
+        tipo = 'despesa' if numero < 0 else 'receita'
+    return {
+        'descricao': descricao,
+        'categoria': categoria,
+        'tipo': tipo,
+        'valor': abs(numero) if numero is not None else valor,
+        'data': normalizar_data(data)
+    }
+
+
+def ler_csv(arquivo):
+    """
+    Lê um extrato CSV linha a linha (separador ',' ou ';'), produzindo
+    (numero_da_linha, campos). Aceita o próprio CSV exportado pelo sistema.
+    """
+    inicio = arquivo.readline()
+    delimitador = ';' if inicio.count(';') > inicio.count(',') else ','
+    cabecalho = next(csv.reader([inicio], delimiter=delimitador), [])
+    campos = [COLUNAS_CSV.get(_normalizar_cabecalho(nome)) for nome in cabecalho]
+
+    for numero, linha in enumerate(csv.reader(arquivo, delimiter=delimitador), 2):
+        if not any(celula.strip() for celula in linha):
+            continue
+        registro = {campo: celula for campo, celula in zip(campos, linha) if campo}
+        yield numero, _linha_para_formulario(
+            registro.get('data'),
+            registro.get('descricao'),
+            registro.get('valor'),
+            registro.get('tipo'),
+            registro.get('categoria')
+        )
+
+
+_TAG_OFX = re.compile(r'<(\w+)>([^<\r\n]*)')
+
+
+def ler_ofx(arquivo):
+    """
+    Lê um extrato OFX (SGML ou XML) de forma incremental, produzindo
+    (numero_da_linha, campos) para cada bloco <STMTTRN>.
+    """
+    atual = None
+    inicio_bloco = 0
+    for numero, linha in enumerate(arquivo, 1):
+        for tag, valor in _TAG_OFX.findall(linha):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                atual = {}
+                inicio_bloco = numero
+            elif atual is not None:
+                atual[tag] = valor.strip()
+        if atual is not None and '</STMTTRN>' in linha.upper():
+            yield inicio_bloco, _linha_para_formulario(
+                (atual.get('DTPOSTED') or '')[:8],  # AAAAMMDD[HHMMSS[.XXX][TZ]]
+                atual.get('MEMO') or atual.get('NAME'),
+                atual.get('TRNAMT'),
+                None,
+                ''
+            )
+            atual = None
+
+
+def importar_transacoes(usuario_id, registros, tamanho_lote=1000, max_erros=100):
+    """
+    Valida e insere as transações em lotes de `tamanho_lote`, com um commit por
+    lote (transações, resumo mensal e versão do cache juntos). Retorna
+    {'importadas': n, 'total_erros': n, 'erros': [(linha, mensagem), ...]}.
+    """
+    resultado = {'importadas': 0, 'total_erros': 0, 'erros': []}
+    lote = []
+
+    for numero, campos in registros:
+        dados, erro = validar_dados_transacao(
+            campos.get('descricao'),
+            campos.get('categoria'),
+            campos.get('tipo'),
+            campos.get('valor'),
+            campos.get('data')
+        )
+        if erro:
+            resultado['total_erros'] += 1
+            if len(resultado['erros']) < max_erros:
+                resultado['erros'].append((numero, erro))
+            continue
+
+        dados['data'] = dados['data'].date()
+        dados['usuario_id'] = usuario_id
+        lote.append(dados)
+        if len(lote) >= tamanho_lote:
+            _gravar_lote(usuario_id, lote)
+            resultado['importadas'] += len(lote)
+            lote = []
+
+    if lote:
+        _gravar_lote(usuario_id, lote)
+        resultado['importadas'] += len(lote)
+
+    return resultado
+
+
+def _gravar_lote(usuario_id, lote):
+    db.session.connection().execute(insert(Transacao.__table__), lote)
+
+    grupos = {}
+    for dados in lote:
+        chave = (dados['data'].strftime('%Y-%m'), dados['tipo'], dados['categoria'])
+        total, quantidade = grupos.get(chave, (0, 0))
+        grupos[chave] = (total + para_centavos(dados['valor']), quantidade + 1)
+    ajustar_resumo_em_lote(usuario_id, {
+        chave: (para_reais(total), quantidade) for chave, (total, quantidade) in grupos.items()
+    })
+
+    invalidar_estatisticas(usuario_id)
+    db.session.commit()
@@ -0,0 +1,177 @@
+from extensions import db, limiter
+from flask import Blueprint, Response, current_app, abort, g, request, has_request_context, before_render_template, template_rendered
+from sqlalchemy import event
+import cProfile
+import hmac
+import itertools
+import os
+import threading
+import time
+
+BUCKETS_DURACAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class Histograma:
+    """Histograma cumulativo no formato do Prometheus (buckets, soma e contagem)."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.contagens = [0] * (len(buckets) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.contagens[i] += 1
+                break
+        else:
+            self.contagens[-1] += 1
+        self.soma += valor
+        self.total += 1
+
+
+class Metricas:
+    """Métricas por rota deste processo; cada worker do gunicorn expõe as suas."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.duracao = {}
+        self.consultas = {}
+        self.tempo_sql = {}
+        self.tempo_render = {}
+
+    def registrar(self, rota, metodo, status, duracao, consultas, tempo_sql, tempo_render):
+        with self._lock:
+            self.duracao.setdefault((rota, metodo, status), Histograma(BUCKETS_DURACAO)).observar(duracao)
+            self.consultas.setdefault(rota, Histograma(BUCKETS_CONSULTAS)).observar(consultas)
+            self.tempo_sql[rota] = self.tempo_sql.get(rota, 0.0) + tempo_sql
+            self.tempo_render[rota] = self.tempo_render.get(rota, 0.0) + tempo_render
+
+    def texto_prometheus(self):
+        """Exposição no formato texto do Prometheus (versão 0.0.4)."""
+        linhas = []
+        with self._lock:
+            linhas += _histograma_prometheus(
+                'financas_requisicao_duracao_segundos', 'Duração das requisições por rota.',
+                {('rota', 'metodo', 'status'): self.duracao}
+            )
+            linhas += _histograma_prometheus(
+                'financas_requisicao_consultas_sql', 'Comandos SQL executados por requisição.',
+                {('rota',): self.consultas}
+            )
+            for nome, ajuda, valores in (
+                ('financas_sql_duracao_segundos_total', 'Tempo gasto em SQL por rota.', self.tempo_sql),
+                ('financas_template_duracao_segundos_total', 'Tempo de renderização de templates por rota.', self.tempo_render),
+            ):
+                linhas.append(f'# HELP {nome} {ajuda}')
+                linhas.append(f'# TYPE {nome} counter')
+                for rota, valor in sorted(valores.items()):
+                    linhas.append(f'{nome}{{rota="{rota}"}} {valor:.6f}')
+        return '\n'.join(linhas) + '\n'
+
+
+def _histograma_prometheus(nome, ajuda, series):
+    linhas = [f'# HELP {nome} {ajuda}', f'# TYPE {nome} histogram']
+    for nomes_rotulos, histogramas in series.items():
+        for chave, histograma in sorted(histogramas.items()):
+            valores = chave if isinstance(chave, tuple) else (chave,)
+            rotulos = ','.join(f'{rotulo}="{valor}"' for rotulo, valor in zip(nomes_rotulos, valores))
+            acumulado = 0
+            for limite, contagem in zip(histograma.buckets + ('+Inf',), histograma.contagens):
+                acumulado += contagem
+                linhas.append(f'{nome}_bucket{{{rotulos},le="{limite}"}} {acumulado}')
+            linhas.append(f'{nome}_sum{{{rotulos}}} {histograma.soma:.6f}')
+            linhas.append(f'{nome}_count{{{rotulos}}} {histograma.total}')
+    return linhas
+
+
+metricas = Metricas()
+_contador_requisicoes = itertools.count(1)
+
+bp = Blueprint('instrumentacao', __name__)
+
+
+@bp.route('/metricas')
+@limiter.exempt
+def metricas_prometheus():
+    token = current_app.config['METRICAS_TOKEN']
+    if not current_app.config['INSTRUMENTACAO'] or not token:
+        abort(404)
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        abort(401)
+    return Response(metricas.texto_prometheus(), mimetype='text/plain; version=0.0.4')
+
+
+def _antes_sql(conexao, cursor, comando, parametros, contexto, executemany):
+    if has_request_context():
+        conexao.info.setdefault('inicio_sql', []).append(time.perf_counter())
+
+
+def _depois_sql(conexao, cursor, comando, parametros, contexto, executemany):
+    if has_request_context() and conexao.info.get('inicio_sql'):
+        g.tempo_sql = g.get('tempo_sql', 0.0) + time.perf_counter() - conexao.info['inicio_sql'].pop()
+        g.consultas_sql = g.get('consultas_sql', 0) + 1
+
+
+def _antes_render(app, template, context, **extra):
+    g.inicio_render = time.perf_counter()
+
+
+def _depois_render(app, template, context, **extra):
+    if 'inicio_render' in g:
+        g.tempo_render = g.get('tempo_render', 0.0) + time.perf_counter() - g.pop('inicio_render')
+
+
+def configurar_instrumentacao(app):
+    """
+    Liga a instrumentação (INSTRUMENTACAO=1): latência, quantidade e tempo de
+    SQL e tempo de renderização por rota, expostos em /metricas e no cabeçalho
+    Server-Timing. Com PERFIL_AMOSTRAGEM=N, 1 a cada N requisições é perfilada
+    com cProfile e salva em instance/perfis/.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _antes_sql)
+            event.listen(engine, 'after_cursor_execute', _depois_sql)
+    before_render_template.connect(_antes_render, app)
+    template_rendered.connect(_depois_render, app)
+
+    amostragem = app.config['PERFIL_AMOSTRAGEM']
+    limite_consultas = app.config['ALERTA_CONSULTAS_SQL']
+    diretorio_perfis = os.path.join(app.instance_path, 'perfis')
+
+    @app.before_request
+    def _iniciar_medicao():
+        g.inicio_requisicao = time.perf_counter()
+        if amostragem and next(_contador_requisicoes) % amostragem == 0:
+            g.perfil = cProfile.Profile()
+            g.perfil.enable()
+
+    @app.after_request
+    def _registrar_medicao(resposta):
+        if 'inicio_requisicao' not in g:
+            return resposta
+        duracao = time.perf_counter() - g.inicio_requisicao
+        consultas = g.get('consultas_sql', 0)
+        tempo_sql = g.get('tempo_sql', 0.0)
+        tempo_render = g.get('tempo_render', 0.0)
+        rota = request.endpoint or 'desconhecida'
+
+        perfil = g.pop('perfil', None)
+        if perfil is not None:
+            perfil.disable()
+            os.makedirs(diretorio_perfis, exist_ok=True)
+            perfil.dump_stats(os.path.join(diretorio_perfis, f'{time.strftime("%Y%m%d_%H%M%S")}_{rota}_{os.getpid()}.prof'))
+
+        metricas.registrar(rota, request.method, resposta.status_code, duracao, consultas, tempo_sql, tempo_render)
+        if limite_consultas and consultas > limite_consultas:
+            app.logger.warning('%s executou %d comandos SQL (limite %d): possível N+1', rota, consultas, limite_consultas)
+
+        resposta.headers.add(
+            'Server-Timing',
+            f'app;dur={duracao * 1000:.1f}, sql;dur={tempo_sql * 1000:.1f};desc="{consultas} consultas", '
+            f'render;dur={tempo_render * 1000:.1f}'
+        )
+        return resposta
@@ -0,0 +1,102 @@
+from limits.storage import Storage, SCHEMES
+import os
+import sqlite3
+import threading
+import time
+
+
+class SQLiteStorage(Storage):
+    """
+    Armazenamento do Flask-Limiter em um arquivo SQLite compartilhado por
+    todos os workers da máquina (URI 'sqlite:///caminho/limites.db').
+    Suporta a estratégia fixed-window (padrão do Flask-Limiter).
+
+    Cada incremento é um único UPSERT atômico; janelas expiradas são
+    reiniciadas no próprio UPSERT e apagadas periodicamente, de modo que o
+    arquivo só guarda as chaves ativas.
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+    INTERVALO_LIMPEZA = 60
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        self.caminho = uri[len('sqlite:///'):] if uri else 'limites.db'
+        self._local = threading.local()
+        self._proxima_limpeza = 0
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with self._conexao() as conexao:
+            conexao.execute(
+                'CREATE TABLE IF NOT EXISTS limite ('
+                'chave TEXT PRIMARY KEY, contador INTEGER NOT NULL, expira REAL NOT NULL'
+                ') WITHOUT ROWID'
+            )
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _conexao(self):
+        # Uma conexão por thread e por processo (conexões não sobrevivem a um fork)
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None or self._local.pid != os.getpid():
+            conexao = sqlite3.connect(self.caminho, timeout=5, isolation_level=None, check_same_thread=False)
+            conexao.execute('PRAGMA journal_mode=WAL')
+            conexao.execute('PRAGMA synchronous=NORMAL')
+            self._local.conexao = conexao
+            self._local.pid = os.getpid()
+        return conexao
+
+    def _limpar_expirados(self, agora):
+        if agora >= self._proxima_limpeza:
+            self._proxima_limpeza = agora + self.INTERVALO_LIMPEZA
+            self._conexao().execute('DELETE FROM limite WHERE expira <= ?', (agora,))
+
+    def incr(self, key, expiry, amount=1):
+        agora = time.time()
+        self._limpar_expirados(agora)
+        return self._conexao().execute(
+            'INSERT INTO limite (chave, contador, expira) VALUES (?, ?, ?) '
+            'ON CONFLICT (chave) DO UPDATE SET '
+            'contador = CASE WHEN expira <= ? THEN excluded.contador ELSE contador + excluded.contador END, '
+            'expira = CASE WHEN expira <= ? THEN excluded.expira ELSE expira END '
+            'RETURNING contador',
+            (key, amount, agora + expiry, agora, agora)
+        ).fetchone()[0]
+
+    def get(self, key):
+        linha = self._conexao().execute(
+            'SELECT contador FROM limite WHERE chave = ? AND expira > ?', (key, time.time())
+        ).fetchone()
+        return linha[0] if linha else 0
+
+    def get_expiry(self, key):
+        linha = self._conexao().execute(
+            'SELECT expira FROM limite WHERE chave = ? AND expira > ?', (key, time.time())
+        ).fetchone()
+        return linha[0] if linha else time.time()
+
+    def check(self):
+        try:
+            self._conexao().execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._conexao().execute('DELETE FROM limite').rowcount
+
+    def clear(self, key):
+        self._conexao().execute('DELETE FROM limite WHERE chave = ?', (key,))
+
+
+def registrar_armazenamento():
+    """
+    Associa o esquema 'sqlite://' de RATELIMIT_STORAGE_URI ao SQLiteStorage
+    no registro de armazenamentos do limits. Chamado por create_app() antes do
+    Flask-Limiter abrir o armazenamento.
+    """
+    for esquema in SQLiteStorage.STORAGE_SCHEME:
+        SCHEMES[esquema] = SQLiteStorage
@@ -0,0 +1,69 @@
+from extensions import db
+from models import Transacao
+from dinheiro import para_reais
+from datetime import datetime
+from sqlalchemy import tuple_
+
+
+def totais_transacoes(filtro):
+    """
+    Retorna (total_receitas, total_despesas, quantidade) do FiltroTransacoes.
+    As somas são feitas no banco sobre os centavos inteiros e convertidas uma única vez.
+    """
+    receitas, despesas, quantidade = db.session.execute(filtro.consulta_totais()).one()
+    return para_reais(receitas), para_reais(despesas), quantidade
+
+
+def codificar_cursor(transacao):
+    """Cursor opaco da posição de uma transação na ordem (data DESC, id DESC)."""
+    return f'{transacao.data.strftime("%Y-%m-%d")}_{transacao.id}'
+
+
+def decodificar_cursor(cursor):
+    """Retorna (data, id) de um cursor, ou None se ele for inválido."""
+    try:
+        data_str, id_str = cursor.split('_', 1)
+        return datetime.strptime(data_str, '%Y-%m-%d').date(), int(id_str)
+    except (AttributeError, ValueError):
+        return None
+
+
+def consulta_pagina(filtro, cursor=None, limite=20):
+    """
+    Paginação por chave (keyset) na ordem (data DESC, id DESC): as `limite` + 1
+    transações seguintes ao cursor, sem OFFSET, usando o índice (usuario_id, data).
+    """
+    stmt = filtro.consulta_transacoes()
+
+    posicao = decodificar_cursor(cursor) if cursor else None
+    if posicao:
+        # Elemento SQL capturado pelo lambda: entra no cache pela estrutura, com os valores como parâmetros
+        depois_do_cursor = tuple_(Transacao.data, Transacao.id) < posicao
+        stmt += lambda s: s.where(depois_do_cursor)
+
+    quantidade = limite + 1
+    stmt += lambda s: s.order_by(Transacao.data.desc(), Transacao.id.desc()).limit(quantidade)
+    return stmt
+
+
+def dividir_pagina(transacoes, limite):
+    """Separa o resultado de consulta_pagina() em (transacoes, proximo_cursor)."""
+    proximo_cursor = codificar_cursor(transacoes[limite - 1]) if len(transacoes) > limite else None
+    return transacoes[:limite], proximo_cursor
+
+
+def pagina_transacoes(filtro, cursor=None, limite=20):
+    """Página de transações do filtro a partir do cursor. Retorna (transacoes, proximo_cursor)."""
+    return dividir_pagina(db.session.scalars(consulta_pagina(filtro, cursor, limite)).all(), limite)
+
+
+def transacao_para_json(transacao):
+    """Representação de uma transação na API de listagem."""
+    return {
+        'id': transacao.id,
+        'descricao': transacao.descricao,
+        'tipo': transacao.tipo,
+        'categoria': transacao.categoria,
+        'valor': transacao.valor,
+        'data': transacao.data.strftime('%Y-%m-%d')
+    }
@@ -0,0 +1,20 @@
+from extensions import db
+from models import MetaOrcamento
+from estatisticas import invalidar_estatisticas
+
+
+def salvar_meta(usuario_id, categoria, valor):
+    """
+    Define a meta mensal de gastos do usuário para a `categoria` (None = total
+    de despesas do mês). Valor 0 remove a meta. Não faz commit.
+    """
+    filtro_categoria = MetaOrcamento.categoria.is_(None) if categoria is None else MetaOrcamento.categoria == categoria
+    meta = MetaOrcamento.query.filter(MetaOrcamento.usuario_id == usuario_id, filtro_categoria).first()
+    if not valor:
+        if meta is not None:
+            db.session.delete(meta)
+    elif meta is None:
+        db.session.add(MetaOrcamento(usuario_id=usuario_id, categoria=categoria, valor=valor))
+    else:
+        meta.valor = valor
+    invalidar_estatisticas(usuario_id)
@@ -0,0 +1,50 @@
+"""valores monetários em centavos inteiros
+
+Revision ID: 0b9e4d7c1a52
+Revises: f4c6a2d8e913
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+from models import DDL_BUSCA_TRANSACAO
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b9e4d7c1a52'
+down_revision = 'f4c6a2d8e913'
+branch_labels = None
+depends_on = None
+
+
+def _recriar_triggers_busca():
+    # O modo batch do SQLite recria a tabela transacao e perde os triggers da busca (f4c6a2d8e913)
+    if op.get_bind().dialect.name == 'sqlite':
+        for comando in DDL_BUSCA_TRANSACAO:
+            op.execute(comando)
+
+
+def upgrade():
+    op.execute("UPDATE transacao SET valor = CAST(ROUND(valor * 100) AS INTEGER)")
+    op.execute("UPDATE resumo_mensal SET total = CAST(ROUND(total * 100) AS INTEGER)")
+
+    with op.batch_alter_table('transacao', schema=None) as batch_op:
+        batch_op.alter_column('valor', existing_type=sa.Float(), type_=sa.Integer(), existing_nullable=False)
+
+    with op.batch_alter_table('resumo_mensal', schema=None) as batch_op:
+        batch_op.alter_column('total', existing_type=sa.Float(), type_=sa.Integer(), existing_nullable=False)
+
+    _recriar_triggers_busca()
+
+
+def downgrade():
+    with op.batch_alter_table('resumo_mensal', schema=None) as batch_op:
+        batch_op.alter_column('total', existing_type=sa.Integer(), type_=sa.Float(), existing_nullable=False)
+
+    with op.batch_alter_table('transacao', schema=None) as batch_op:
+        batch_op.alter_column('valor', existing_type=sa.Integer(), type_=sa.Float(), existing_nullable=False)
+
+    op.execute("UPDATE transacao SET valor = valor / 100.0")
+    op.execute("UPDATE resumo_mensal SET total = total / 100.0")
+
+    _recriar_triggers_busca()
@@ -0,0 +1,26 @@
+"""coluna usuario.dados_alterados_em
+
+Revision ID: 1c5f8a3e7b20
+Revises: 0b9e4d7c1a52
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c5f8a3e7b20'
+down_revision = '0b9e4d7c1a52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('usuario', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('dados_alterados_em', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('usuario', schema=None) as batch_op:
+        batch_op.drop_column('dados_alterados_em')
@@ -0,0 +1,71 @@
+"""transações recorrentes
+
+Revision ID: 2d7e9b4f6a13
+Revises: 1c5f8a3e7b20
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+from models import DDL_BUSCA_TRANSACAO
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7e9b4f6a13'
+down_revision = '1c5f8a3e7b20'
+branch_labels = None
+depends_on = None
+
+
+def _recriar_triggers_busca():
+    # O modo batch do SQLite recria a tabela transacao e perde os triggers da busca (f4c6a2d8e913)
+    if op.get_bind().dialect.name == 'sqlite':
+        for comando in DDL_BUSCA_TRANSACAO:
+            op.execute(comando)
+
+
+def upgrade():
+    op.create_table(
+        'transacao_recorrente',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('descricao', sa.String(length=150), nullable=False),
+        sa.Column('valor', sa.BigInteger(), nullable=False),
+        sa.Column('tipo', sa.String(length=10), nullable=False),
+        sa.Column('categoria', sa.String(length=50), nullable=True),
+        sa.Column('frequencia', sa.String(length=10), nullable=False),
+        sa.Column('dia', sa.Integer(), nullable=False),
+        sa.Column('proxima_data', sa.Date(), nullable=False),
+        sa.Column('data_fim', sa.Date(), nullable=True),
+        sa.Column('ativa', sa.Boolean(), server_default=sa.true(), nullable=False),
+        sa.Column('criada_em', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('transacao_recorrente', schema=None) as batch_op:
+        batch_op.create_index('ix_transacao_recorrente_ativa_proxima', ['ativa', 'proxima_data'], unique=False)
+        batch_op.create_index(batch_op.f('ix_transacao_recorrente_usuario_id'), ['usuario_id'], unique=False)
+
+    with op.batch_alter_table('transacao', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('recorrente_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_transacao_recorrente_id', 'transacao_recorrente', ['recorrente_id'], ['id'], ondelete='SET NULL'
+        )
+        batch_op.create_index('uq_transacao_recorrente_data', ['recorrente_id', 'data'], unique=True)
+
+    _recriar_triggers_busca()
+
+
+def downgrade():
+    with op.batch_alter_table('transacao', schema=None) as batch_op:
+        batch_op.drop_index('uq_transacao_recorrente_data')
+        batch_op.drop_constraint('fk_transacao_recorrente_id', type_='foreignkey')
+        batch_op.drop_column('recorrente_id')
+
+    _recriar_triggers_busca()
+
+    with op.batch_alter_table('transacao_recorrente', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_transacao_recorrente_usuario_id'))
+        batch_op.drop_index('ix_transacao_recorrente_ativa_proxima')
+
+    op.drop_table('transacao_recorrente')
@@ -0,0 +1,33 @@
+"""metas de orçamento mensais
+
+Revision ID: 3e8f1a5c9b27
+Revises: 2d7e9b4f6a13
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e8f1a5c9b27'
+down_revision = '2d7e9b4f6a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'meta_orcamento',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('categoria', sa.String(length=50), nullable=True),
+        sa.Column('valor', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('usuario_id', 'categoria', name='uq_meta_orcamento_chave')
+    )
+
+
+def downgrade():
+    op.drop_table('meta_orcamento')
@@ -0,0 +1,26 @@
+"""indices compostos em transacao
+
+Revision ID: 7c4e2d8a5b31
+Revises: 3a1f0c2b9d10
+Create Date: 2026-10-17 09:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4e2d8a5b31'
+down_revision = '3a1f0c2b9d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # if_not_exists: bancos criados por db.create_all() já recebem os índices do modelo
+    op.create_index('ix_transacao_usuario_data', 'transacao', ['usuario_id', 'data'], unique=False, if_not_exists=True)
+    op.create_index('ix_transacao_usuario_tipo_data', 'transacao', ['usuario_id', 'tipo', 'data'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_transacao_usuario_tipo_data', table_name='transacao')
+    op.drop_index('ix_transacao_usuario_data', table_name='transacao')
@@ -0,0 +1,39 @@
+"""resumo_mensal.categoria não nula
+
+Revision ID: a6d3f9c18e42
+Revises: 3e8f1a5c9b27
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d3f9c18e42'
+down_revision = '3e8f1a5c9b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Linhas com categoria NULL escapavam do índice único (e do upsert) e
+    # podiam se repetir: o resumo é recalculado com '' no lugar de NULL
+    if op.get_bind().dialect.name == 'sqlite':
+        mes = "strftime('%Y-%m', data)"
+    else:
+        mes = "to_char(data, 'YYYY-MM')"
+    op.execute("DELETE FROM resumo_mensal")
+    op.execute(
+        "INSERT INTO resumo_mensal (usuario_id, mes, tipo, categoria, total, quantidade) "
+        f"SELECT usuario_id, {mes}, tipo, COALESCE(categoria, ''), SUM(valor), COUNT(id) "
+        f"FROM transacao GROUP BY usuario_id, {mes}, tipo, COALESCE(categoria, '')"
+    )
+
+    with op.batch_alter_table('resumo_mensal', schema=None) as batch_op:
+        batch_op.alter_column('categoria', existing_type=sa.String(length=50), nullable=False, server_default='')
+
+
+def downgrade():
+    with op.batch_alter_table('resumo_mensal', schema=None) as batch_op:
+        batch_op.alter_column('categoria', existing_type=sa.String(length=50), nullable=True, server_default=None)
@@ -0,0 +1,47 @@
+"""tabela resumo_mensal
+
+Revision ID: b5d91e7f2c44
+Revises: 7c4e2d8a5b31
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d91e7f2c44'
+down_revision = '7c4e2d8a5b31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('resumo_mensal',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('mes', sa.String(length=7), nullable=False),
+    sa.Column('tipo', sa.String(length=10), nullable=False),
+    sa.Column('categoria', sa.String(length=50), nullable=True),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('usuario_id', 'mes', 'tipo', 'categoria', name='uq_resumo_mensal_chave'),
+    if_not_exists=True
+    )
+    # preenche o resumo a partir das transações existentes
+    if op.get_bind().dialect.name == 'sqlite':
+        mes = "strftime('%Y-%m', data)"
+    else:
+        mes = "to_char(data, 'YYYY-MM')"
+    op.execute("DELETE FROM resumo_mensal")
+    op.execute(
+        "INSERT INTO resumo_mensal (usuario_id, mes, tipo, categoria, total, quantidade) "
+        f"SELECT usuario_id, {mes}, tipo, categoria, SUM(valor), COUNT(id) "
+        f"FROM transacao GROUP BY usuario_id, {mes}, tipo, categoria"
+    )
+
+
+def downgrade():
+    op.drop_table('resumo_mensal')
@@ -0,0 +1,45 @@
+"""valores monetários em BIGINT
+
+Revision ID: c4e8a1d7b359
+Revises: a6d3f9c18e42
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+from models import DDL_BUSCA_TRANSACAO
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1d7b359'
+down_revision = 'a6d3f9c18e42'
+branch_labels = None
+depends_on = None
+
+
+def _recriar_triggers_busca():
+    # O modo batch do SQLite recria a tabela transacao e perde os triggers da busca (f4c6a2d8e913)
+    if op.get_bind().dialect.name == 'sqlite':
+        for comando in DDL_BUSCA_TRANSACAO:
+            op.execute(comando)
+
+
+def upgrade():
+    # Em centavos, INTEGER de 32 bits estoura a partir de R$ 21 milhões (PostgreSQL)
+    with op.batch_alter_table('transacao', schema=None) as batch_op:
+        batch_op.alter_column('valor', existing_type=sa.Integer(), type_=sa.BigInteger(), existing_nullable=False)
+
+    with op.batch_alter_table('resumo_mensal', schema=None) as batch_op:
+        batch_op.alter_column('total', existing_type=sa.Integer(), type_=sa.BigInteger(), existing_nullable=False)
+
+    _recriar_triggers_busca()
+
+
+def downgrade():
+    with op.batch_alter_table('resumo_mensal', schema=None) as batch_op:
+        batch_op.alter_column('total', existing_type=sa.BigInteger(), type_=sa.Integer(), existing_nullable=False)
+
+    with op.batch_alter_table('transacao', schema=None) as batch_op:
+        batch_op.alter_column('valor', existing_type=sa.BigInteger(), type_=sa.Integer(), existing_nullable=False)
+
+    _recriar_triggers_busca()
@@ -0,0 +1,41 @@
+"""tabela tarefa_exportacao
+
+Revision ID: d2a7c9e41f08
+Revises: b5d91e7f2c44
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7c9e41f08'
+down_revision = 'b5d91e7f2c44'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tarefa_exportacao',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('formato', sa.String(length=3), nullable=False),
+    sa.Column('filtros', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=12), nullable=False),
+    sa.Column('arquivo', sa.String(length=255), nullable=True),
+    sa.Column('erro', sa.String(length=500), nullable=True),
+    sa.Column('criada_em', sa.DateTime(), nullable=True),
+    sa.Column('concluida_em', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tarefa_exportacao', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tarefa_exportacao_usuario_id'), ['usuario_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tarefa_exportacao', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tarefa_exportacao_usuario_id'))
+
+    op.drop_table('tarefa_exportacao')
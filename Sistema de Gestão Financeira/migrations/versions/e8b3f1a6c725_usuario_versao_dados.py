@@ -0,0 +1,26 @@
+"""coluna usuario.versao_dados
+
+Revision ID: e8b3f1a6c725
+Revises: d2a7c9e41f08
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b3f1a6c725'
+down_revision = 'd2a7c9e41f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('usuario', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('versao_dados', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('usuario', schema=None) as batch_op:
+        batch_op.drop_column('versao_dados')
@@ -0,0 +1,37 @@
+"""índice de busca transacao_fts (FTS5)
+
+Revision ID: f4c6a2d8e913
+Revises: e8b3f1a6c725
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+from models import DDL_BUSCA_TRANSACAO
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4c6a2d8e913'
+down_revision = 'e8b3f1a6c725'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 só existe no SQLite; nos demais bancos a busca usa ILIKE (ver busca.py)
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for comando in DDL_BUSCA_TRANSACAO:
+        op.execute(comando)
+    # indexa as transações existentes
+    op.execute("INSERT INTO transacao_fts(transacao_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS transacao_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS transacao_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS transacao_fts_ai")
+    op.execute("DROP TABLE IF EXISTS transacao_fts")
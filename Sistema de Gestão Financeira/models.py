@@ -1,7 +1,9 @@
 from extensions import db
+from dinheiro import Dinheiro
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from senhas import gerar_hash, verificar_hash, precisa_rehash
 from datetime import datetime
+import uuid
 
 
 class Usuario(db.Model, UserMixin):
@@ -11,26 +13,129 @@ class Usuario(db.Model, UserMixin):
     nome = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     senha_hash = db.Column(db.String(200), nullable=False)
+    versao_dados = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # incrementada a cada escrita; compõe as chaves de cache
+    dados_alterados_em = db.Column(db.DateTime)  # UTC da última escrita; Last-Modified da API de estatísticas
     transacoes = db.relationship('Transacao', backref='usuario', lazy=True)
 
     def set_password(self, senha):
         """Define a senha do usuário, com validação mínima de 8 caracteres."""
         if not senha or len(senha) < 8:
             raise ValueError("A senha deve ter pelo menos 8 caracteres.")
-        self.senha_hash = generate_password_hash(senha)
+        self.senha_hash = gerar_hash(senha)
 
     def check_password(self, senha):
         """Verifica se a senha informada confere com o hash armazenado."""
-        return check_password_hash(self.senha_hash, senha)
+        return verificar_hash(self.senha_hash, senha)
+
+    def precisa_rehash(self):
+        """Indica se o hash armazenado usa parâmetros diferentes de SENHA_METODO."""
+        return precisa_rehash(self.senha_hash)
 
 
 class Transacao(db.Model):
     __tablename__ = "transacao"
+    __table_args__ = (
+        db.Index('ix_transacao_usuario_data', 'usuario_id', 'data'),
+        db.Index('ix_transacao_usuario_tipo_data', 'usuario_id', 'tipo', 'data'),
+        # Uma ocorrência por regra e data: torna a materialização das recorrências idempotente
+        db.Index('uq_transacao_recorrente_data', 'recorrente_id', 'data', unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     descricao = db.Column(db.String(150), nullable=False)
-    valor = db.Column(db.Float, nullable=False)
+    valor = db.Column(Dinheiro, nullable=False)  # centavos
     tipo = db.Column(db.String(10), nullable=False)  # 'entrada' ou 'saida'
     categoria = db.Column(db.String(50))
     data = db.Column(db.Date, default=datetime.utcnow)
-    usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), nullable=False)
\ No newline at end of file
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), nullable=False)
+    recorrente_id = db.Column(db.Integer, db.ForeignKey('transacao_recorrente.id', ondelete='SET NULL'))
+
+# Índice de busca textual (SQLite FTS5) sobre descricao/categoria, sincronizado por triggers.
+# remove_diacritics faz "alimentacao" encontrar "Alimentação". As migrações usam a mesma lista.
+DDL_BUSCA_TRANSACAO = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS transacao_fts USING fts5(
+        descricao, categoria,
+        content='transacao', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2"
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS transacao_fts_ai AFTER INSERT ON transacao BEGIN
+        INSERT INTO transacao_fts(rowid, descricao, categoria) VALUES (new.id, new.descricao, new.categoria);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transacao_fts_ad AFTER DELETE ON transacao BEGIN
+        INSERT INTO transacao_fts(transacao_fts, rowid, descricao, categoria) VALUES ('delete', old.id, old.descricao, old.categoria);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transacao_fts_au AFTER UPDATE OF descricao, categoria ON transacao BEGIN
+        INSERT INTO transacao_fts(transacao_fts, rowid, descricao, categoria) VALUES ('delete', old.id, old.descricao, old.categoria);
+        INSERT INTO transacao_fts(rowid, descricao, categoria) VALUES (new.id, new.descricao, new.categoria);
+    END""",
+]
+
+for _comando in DDL_BUSCA_TRANSACAO:
+    db.event.listen(Transacao.__table__, 'after_create', db.DDL(_comando).execute_if(dialect='sqlite'))
+
+
+class ResumoMensal(db.Model):
+    """Totais por usuário, mês, tipo e categoria, mantidos a cada escrita em Transacao."""
+    __tablename__ = "resumo_mensal"
+    __table_args__ = (
+        db.UniqueConstraint('usuario_id', 'mes', 'tipo', 'categoria', name='uq_resumo_mensal_chave'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), nullable=False)
+    mes = db.Column(db.String(7), nullable=False)  # 'AAAA-MM'
+    tipo = db.Column(db.String(10), nullable=False)
+    categoria = db.Column(db.String(50), nullable=False, default='', server_default='')  # '' = sem categoria
+    total = db.Column(Dinheiro, nullable=False, default=0)  # centavos
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+
+
+class MetaOrcamento(db.Model):
+    """Meta de gastos mensais do usuário: total de despesas (categoria NULL) ou por categoria."""
+    __tablename__ = "meta_orcamento"
+    __table_args__ = (
+        db.UniqueConstraint('usuario_id', 'categoria', name='uq_meta_orcamento_chave'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), nullable=False)
+    categoria = db.Column(db.String(50))
+    valor = db.Column(Dinheiro, nullable=False)  # centavos
+
+
+class TransacaoRecorrente(db.Model):
+    """Regra de transação recorrente (aluguel, salário, assinaturas), materializada por recorrencias.py."""
+    __tablename__ = "transacao_recorrente"
+    __table_args__ = (
+        # O agendador só lê as regras ativas já vencidas
+        db.Index('ix_transacao_recorrente_ativa_proxima', 'ativa', 'proxima_data'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), nullable=False, index=True)
+    descricao = db.Column(db.String(150), nullable=False)
+    valor = db.Column(Dinheiro, nullable=False)  # centavos
+    tipo = db.Column(db.String(10), nullable=False)
+    categoria = db.Column(db.String(50))
+    frequencia = db.Column(db.String(10), nullable=False, default='mensal')  # 'semanal', 'mensal' ou 'anual'
+    dia = db.Column(db.Integer, nullable=False)  # dia do mês original (31 volta a ser 31 depois de fevereiro)
+    proxima_data = db.Column(db.Date, nullable=False)
+    data_fim = db.Column(db.Date)
+    ativa = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())
+    criada_em = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class TarefaExportacao(db.Model):
+    """Exportação (CSV/PDF) processada em segundo plano; o arquivo gerado fica em instance/exportacoes."""
+    __tablename__ = "tarefa_exportacao"
+
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), nullable=False, index=True)
+    formato = db.Column(db.String(3), nullable=False)  # 'csv' ou 'pdf'
+    filtros = db.Column(db.Text)  # JSON com os filtros do dashboard
+    status = db.Column(db.String(12), nullable=False, default='pendente')  # pendente, processando, concluida, erro
+    arquivo = db.Column(db.String(255))
+    erro = db.Column(db.String(500))
+    criada_em = db.Column(db.DateTime, default=datetime.utcnow)
+    concluida_em = db.Column(db.DateTime)
+    usuario = db.relationship('Usuario')
@@ -0,0 +1,203 @@
+from extensions import db, cache
+from models import Usuario, Transacao, TransacaoRecorrente, ResumoMensal
+from estatisticas import proximo_mes, primeiro_dia_mes
+from recorrencias import data_seguinte
+from replica import no_principal
+from dinheiro import em_centavos, para_centavos, para_reais
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, func
+
+# Dias de histórico usados no ajuste e pseudo-observações que puxam os fatores
+# sazonais para 1 quando há poucos dias de dados num grupo
+JANELA_DIAS = 120
+SUAVIZACAO = 4
+
+
+def consulta_despesas_diarias(usuario_id, inicio, fim):
+    """Despesas não recorrentes do usuário por dia e categoria, em centavos, no período [inicio, fim)."""
+    return select(
+        Transacao.data,
+        Transacao.categoria,
+        em_centavos(func.sum(Transacao.valor))
+    ).where(
+        Transacao.usuario_id == usuario_id,
+        Transacao.tipo == 'despesa',
+        Transacao.data >= inicio,
+        Transacao.data < fim,
+        Transacao.recorrente_id.is_(None)
+    ).group_by(Transacao.data, Transacao.categoria)
+
+
+def _dias_do_mes(inicio, quantidade):
+    """Dia do mês (1-31) de `quantidade` dias consecutivos a partir de `inicio`."""
+    import numpy as np
+
+    dias = np.datetime64(inicio, 'D') + np.arange(quantidade)
+    return (dias - dias.astype('datetime64[M]')).astype(int) + 1
+
+
+def _fatores(matriz, grupos, quantidade_grupos, media):
+    """
+    Fator sazonal de cada grupo de dias (dia da semana, terço do mês) por
+    categoria: média do grupo / média geral, suavizada para 1. Forma (grupos, categorias).
+    """
+    import numpy as np
+
+    somas = np.zeros((quantidade_grupos, matriz.shape[1]))
+    np.add.at(somas, grupos, matriz)
+    contagens = np.bincount(grupos, minlength=quantidade_grupos)[:, None]
+    return (somas + SUAVIZACAO * media) / ((contagens + SUAVIZACAO) * np.where(media > 0, media, 1))
+
+
+def projetar_variaveis(linhas, hoje, fim_mes):
+    """
+    Projeta as despesas variáveis de amanhã até `fim_mes` (inclusive) a partir
+    das linhas (data, categoria, centavos): média diária por categoria
+    ajustada pelos fatores de dia da semana e de terço do mês. Retorna
+    {categoria: centavos previstos}. O NumPy só é importado aqui, no primeiro
+    cálculo, e não na inicialização da aplicação.
+    """
+    import numpy as np
+
+    if not linhas or fim_mes <= hoje:
+        return {}
+
+    categorias = list(dict.fromkeys(categoria for _, categoria, _ in linhas))
+    indice = {categoria: i for i, categoria in enumerate(categorias)}
+    inicio = min(data for data, _, _ in linhas)
+    quantidade = (hoje - inicio).days + 1
+
+    matriz = np.zeros((quantidade, len(categorias)))
+    for data, categoria, total in linhas:
+        matriz[(data - inicio).days, indice[categoria]] += total
+
+    media = matriz.mean(axis=0)
+    semana = (inicio.weekday() + np.arange(quantidade)) % 7
+    terco = np.minimum((_dias_do_mes(inicio, quantidade) - 1) // 10, 2)
+    fator_semana = _fatores(matriz, semana, 7, media)
+    fator_terco = _fatores(matriz, terco, 3, media)
+
+    amanha = hoje + timedelta(days=1)
+    restantes = (fim_mes - hoje).days
+    semana_futura = (amanha.weekday() + np.arange(restantes)) % 7
+    terco_futuro = np.minimum((_dias_do_mes(amanha, restantes) - 1) // 10, 2)
+    previsto = (media * fator_semana[semana_futura] * fator_terco[terco_futuro]).sum(axis=0)
+
+    return {categoria: int(round(previsto[i])) for categoria, i in indice.items()}
+
+
+def projetar_recorrentes(usuario_id, inicio_mes, fim_mes):
+    """
+    Ocorrências ainda não lançadas das despesas recorrentes entre `inicio_mes`
+    e `fim_mes`: {categoria: centavos}. As atrasadas de meses anteriores (sem
+    o agendador, só são lançadas quando o usuário age) não entram no mês.
+    """
+    regras = TransacaoRecorrente.query.filter(
+        TransacaoRecorrente.usuario_id == usuario_id,
+        TransacaoRecorrente.ativa.is_(True),
+        TransacaoRecorrente.tipo == 'despesa',
+        TransacaoRecorrente.proxima_data <= fim_mes
+    )
+    previsto = {}
+    for regra in regras:
+        data = regra.proxima_data
+        while data < inicio_mes:
+            data = data_seguinte(regra.frequencia, data, regra.dia)
+        while data <= fim_mes and (regra.data_fim is None or data <= regra.data_fim):
+            previsto[regra.categoria] = previsto.get(regra.categoria, 0) + para_centavos(regra.valor)
+            data = data_seguinte(regra.frequencia, data, regra.dia)
+    return previsto
+
+
+def calcular_previsao(usuario_id, hoje=None):
+    """
+    Previsão das despesas do mês corrente: gasto até hoje (contadores do resumo
+    mensal) + despesas variáveis projetadas + recorrentes ainda por lançar,
+    no total e por categoria, em reais.
+    """
+    hoje = hoje or date.today()
+    mes = hoje.strftime('%Y-%m')
+    fim_mes = proximo_mes(hoje) - timedelta(days=1)
+
+    gasto = dict(db.session.query(
+        ResumoMensal.categoria, em_centavos(ResumoMensal.total)
+    ).filter(
+        ResumoMensal.usuario_id == usuario_id,
+        ResumoMensal.mes == mes,
+        ResumoMensal.tipo == 'despesa'
+    ).all())
+
+    inicio = hoje - timedelta(days=JANELA_DIAS - 1)
+    linhas = db.session.execute(consulta_despesas_diarias(usuario_id, inicio, hoje + timedelta(days=1))).all()
+    variavel = projetar_variaveis(linhas, hoje, fim_mes)
+    recorrente = projetar_recorrentes(usuario_id, primeiro_dia_mes(hoje), fim_mes)
+
+    categorias = [
+        {
+            'categoria': categoria,
+            'gasto_atual': para_reais(gasto.get(categoria, 0)),
+            'previsao': para_reais(gasto.get(categoria, 0) + variavel.get(categoria, 0) + recorrente.get(categoria, 0))
+        }
+        for categoria in dict.fromkeys([*gasto, *variavel, *recorrente])
+    ]
+    categorias.sort(key=lambda item: item['previsao'], reverse=True)
+
+    return {
+        'mes': mes,
+        'gasto_atual': para_reais(sum(gasto.values())),
+        'variavel': para_reais(sum(variavel.values())),
+        'recorrente': para_reais(sum(recorrente.values())),
+        'total': para_reais(sum(gasto.values()) + sum(variavel.values()) + sum(recorrente.values())),
+        'categorias': categorias
+    }
+
+
+def _chave_previsao(usuario, hoje):
+    return f'previsao:{usuario.id}:{usuario.versao_dados}:{hoje.isoformat()}'
+
+
+def _segundos_ate_amanha():
+    agora = datetime.now()
+    return int((datetime.combine(agora.date() + timedelta(days=1), datetime.min.time()) - agora).total_seconds()) + 1
+
+
+def previsao_usuario(usuario):
+    """
+    Versão em cache de calcular_previsao(), válida até a próxima escrita do
+    usuário (versao_dados) ou até o fim do dia. Calculada no banco principal,
+    como as estatísticas.
+    """
+    hoje = date.today()
+    chave = _chave_previsao(usuario, hoje)
+    resultado = cache.get(chave)
+    if resultado is None:
+        with no_principal():
+            resultado = calcular_previsao(usuario.id, hoje)
+        cache.set(chave, resultado, timeout=_segundos_ate_amanha())
+    return resultado
+
+
+def precalcular_previsoes(tamanho_lote=500):
+    """
+    Calcula e guarda no cache a previsão de todos os usuários que ainda não a
+    têm na versão atual, percorrendo Usuario em lotes por id. Retorna o número
+    de previsões calculadas.
+    """
+    hoje = date.today()
+    calculadas = 0
+    ultimo_id = 0
+    while True:
+        usuarios = db.session.execute(
+            select(Usuario.id, Usuario.versao_dados).where(Usuario.id > ultimo_id)
+            .order_by(Usuario.id).limit(tamanho_lote)
+        ).all()
+        if not usuarios:
+            break
+        for usuario in usuarios:
+            chave = _chave_previsao(usuario, hoje)
+            if not cache.has(chave):
+                cache.set(chave, calcular_previsao(usuario.id, hoje), timeout=_segundos_ate_amanha())
+                calculadas += 1
+        ultimo_id = usuarios[-1].id
+        db.session.rollback()  # libera o snapshot de leitura entre os lotes
+    return calculadas
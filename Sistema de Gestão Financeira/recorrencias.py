@@ -0,0 +1,157 @@
+from extensions import db
+from models import Transacao, TransacaoRecorrente
+from resumo import ajustar_resumo_em_lote
+from estatisticas import invalidar_estatisticas
+from dinheiro import para_centavos, para_reais
+from datetime import date, datetime, timedelta
+from sqlalchemy import select
+import calendar
+import threading
+import time
+
+FREQUENCIAS = ('semanal', 'mensal', 'anual')
+
+
+def somar_meses(data, meses, dia):
+    """Soma `meses` à data, no dia `dia` (limitado ao último dia do mês: 31/01 -> 28/02 -> 31/03)."""
+    indice = data.month - 1 + meses
+    ano, mes = data.year + indice // 12, indice % 12 + 1
+    return date(ano, mes, min(dia, calendar.monthrange(ano, mes)[1]))
+
+
+def data_seguinte(frequencia, data, dia):
+    """Próxima ocorrência de uma regra depois de `data`."""
+    if frequencia == 'semanal':
+        return data + timedelta(days=7)
+    return somar_meses(data, 12 if frequencia == 'anual' else 1, dia)
+
+
+def criar_recorrencia(transacao, frequencia):
+    """
+    Cria a regra recorrente a partir da primeira ocorrência (a própria
+    `transacao`, já lançada), vencendo na data seguinte. Não faz commit.
+    """
+    inicio = transacao.data.date() if isinstance(transacao.data, datetime) else transacao.data
+    regra = TransacaoRecorrente(
+        usuario_id=transacao.usuario_id,
+        descricao=transacao.descricao,
+        valor=transacao.valor,
+        tipo=transacao.tipo,
+        categoria=transacao.categoria,
+        frequencia=frequencia,
+        dia=inicio.day,
+        proxima_data=data_seguinte(frequencia, inicio, inicio.day)
+    )
+    db.session.add(regra)
+    db.session.flush()
+    transacao.recorrente_id = regra.id
+    return regra
+
+
+def encerrar_recorrencia(regra, data_fim=None):
+    """
+    Encerra a regra em `data_fim` (inclusive): ocorrências posteriores não
+    são lançadas. Sem data, ou com data antes da próxima ocorrência, a regra
+    é desativada já. Não faz commit.
+    """
+    regra.data_fim = data_fim
+    if data_fim is None or data_fim < regra.proxima_data:
+        regra.ativa = False
+    invalidar_estatisticas(regra.usuario_id)
+
+
+def _insert_ignorando_duplicadas():
+    """INSERT em transacao que ignora ocorrências já lançadas (índice único recorrente_id + data)."""
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    tabela = Transacao.__table__
+    return insert(tabela).on_conflict_do_nothing(index_elements=['recorrente_id', 'data']).returning(
+        tabela.c.usuario_id, tabela.c.data, tabela.c.tipo, tabela.c.categoria, tabela.c.valor
+    )
+
+
+def consulta_recorrencias_vencidas(hoje, tamanho_lote=500):
+    """Próximo lote de regras ativas vencidas até `hoje` (no PostgreSQL, pula as travadas por outro processo)."""
+    return select(TransacaoRecorrente).where(
+        TransacaoRecorrente.ativa.is_(True),
+        TransacaoRecorrente.proxima_data <= hoje
+    ).order_by(TransacaoRecorrente.proxima_data, TransacaoRecorrente.id).limit(tamanho_lote).with_for_update(skip_locked=True)
+
+
+def materializar_recorrencias(hoje=None, tamanho_lote=500):
+    """
+    Lança as ocorrências vencidas até `hoje` de todas as regras ativas, em lotes
+    de `tamanho_lote` regras: um INSERT executemany por lote, com o resumo
+    mensal e a versão do cache de cada usuário atualizados no mesmo commit.
+    Idempotente: a data da regra avança junto e ocorrências repetidas são
+    ignoradas pelo índice único. Retorna o número de transações criadas.
+    """
+    hoje = hoje or date.today()
+    criadas = 0
+
+    while True:
+        regras = db.session.scalars(consulta_recorrencias_vencidas(hoje, tamanho_lote)).all()
+        if not regras:
+            break
+
+        linhas = []
+        for regra in regras:
+            data = regra.proxima_data
+            while data <= hoje and (regra.data_fim is None or data <= regra.data_fim):
+                linhas.append({
+                    'descricao': regra.descricao,
+                    'valor': regra.valor,
+                    'tipo': regra.tipo,
+                    'categoria': regra.categoria,
+                    'data': data,
+                    'usuario_id': regra.usuario_id,
+                    'recorrente_id': regra.id,
+                })
+                data = data_seguinte(regra.frequencia, data, regra.dia)
+            regra.proxima_data = data
+            if regra.data_fim is not None and data > regra.data_fim:
+                regra.ativa = False
+
+        inseridas = db.session.connection().execute(_insert_ignorando_duplicadas(), linhas).all() if linhas else []
+
+        grupos = {}
+        for usuario_id, data, tipo, categoria, valor in inseridas:
+            chave = (data.strftime('%Y-%m'), tipo, categoria)
+            grupos_usuario = grupos.setdefault(usuario_id, {})
+            total, quantidade = grupos_usuario.get(chave, (0, 0))
+            grupos_usuario[chave] = (total + para_centavos(valor), quantidade + 1)
+        for usuario_id, grupos_usuario in grupos.items():
+            ajustar_resumo_em_lote(usuario_id, {
+                chave: (para_reais(total), quantidade) for chave, (total, quantidade) in grupos_usuario.items()
+            })
+            invalidar_estatisticas(usuario_id)
+
+        db.session.commit()
+        criadas += len(inseridas)
+
+    return criadas
+
+
+def iniciar_agendador(app, intervalo, tamanho_lote=500):
+    """
+    Roda materializar_recorrencias() a cada `intervalo` segundos numa thread
+    daemon deste processo. Com vários workers, cada um roda a sua; o
+    resultado continua correto porque a materialização é idempotente.
+    """
+    def executar():
+        while True:
+            with app.app_context():
+                try:
+                    criadas = materializar_recorrencias(tamanho_lote=tamanho_lote)
+                    if criadas:
+                        app.logger.info('%d transação(ões) recorrente(s) lançada(s)', criadas)
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception('Falha ao lançar transações recorrentes')
+            time.sleep(intervalo)
+
+    thread = threading.Thread(target=executar, name='recorrencias', daemon=True)
+    thread.start()
+    return thread
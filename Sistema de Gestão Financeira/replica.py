@@ -0,0 +1,79 @@
+from flask import current_app, g, session, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from contextlib import contextmanager
+from functools import wraps
+import time
+
+BIND_REPLICA = 'replica'
+
+
+class SessaoRoteada(Session):
+    """
+    Sessão que envia os SELECTs das rotas marcadas com @leitura_replica ao
+    bind 'replica' (SQLALCHEMY_BINDS). Escritas, flushes e tudo fora dessas
+    rotas continuam no banco principal.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        # getattr cobre também as consultas montadas com lambda_stmt (filtros.py)
+        if (bind is None and getattr(clause, 'is_select', False) and not self._flushing
+                and has_request_context() and g.get('usar_replica')
+                and BIND_REPLICA in self._db.engines):
+            return self._db.engines[BIND_REPLICA]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(SessaoRoteada, 'after_flush')
+def _marcar_flush(sessao, contexto):
+    sessao.info['escreveu'] = True
+
+
+@event.listens_for(SessaoRoteada, 'do_orm_execute')
+def _marcar_execucao(estado):
+    if estado.is_insert or estado.is_update or estado.is_delete:
+        estado.session.info['escreveu'] = True
+
+
+@event.listens_for(SessaoRoteada, 'after_commit')
+def _registrar_escrita(sessao):
+    # guardado no cookie de sessão, vale para qualquer worker que atender o usuário
+    if sessao.info.pop('escreveu', False) and has_request_context():
+        session['ultima_escrita'] = time.time()
+
+
+@event.listens_for(SessaoRoteada, 'after_rollback')
+def _descartar_escrita(sessao):
+    sessao.info.pop('escreveu', None)
+
+
+def leitura_replica(f):
+    """
+    Marca uma rota somente leitura para usar a réplica. Se o usuário gravou
+    algo nos últimos REPLICA_JANELA_LEITURA segundos, a rota continua no
+    principal para que ele veja as próprias escritas (read-your-writes).
+    """
+    @wraps(f)
+    def decorada(*args, **kwargs):
+        ultima_escrita = session.get('ultima_escrita', 0)
+        g.usar_replica = time.time() - ultima_escrita > current_app.config['REPLICA_JANELA_LEITURA']
+        return f(*args, **kwargs)
+    return decorada
+
+
+@contextmanager
+def no_principal():
+    """
+    Roda o bloco no banco principal mesmo dentro de uma rota @leitura_replica.
+    Usado no que vai para o cache sob a versao_dados do principal: calculado
+    numa réplica atrasada, um resultado antigo ficaria guardado na versão nova.
+    """
+    if not has_request_context():
+        yield
+        return
+    anterior = g.get('usar_replica', False)
+    g.usar_replica = False
+    try:
+        yield
+    finally:
+        g.usar_replica = anterior
@@ -0,0 +1,171 @@
+from extensions import db
+from models import Transacao, ResumoMensal
+from dinheiro import em_centavos, para_centavos, para_reais
+from sqlalchemy import func, insert, update, delete
+
+
+def _upsert_resumo():
+    """
+    INSERT em resumo_mensal que, se a linha (usuario_id, mes, tipo, categoria)
+    já existe, soma total e quantidade a ela (índice único da chave), num
+    único comando: duas primeiras escritas simultâneas não colidem.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+    else:
+        from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+    tabela = ResumoMensal.__table__
+    comando = insert_dialeto(tabela)
+    return comando.on_conflict_do_update(
+        index_elements=['usuario_id', 'mes', 'tipo', 'categoria'],
+        set_={
+            'total': tabela.c.total + comando.excluded.total,
+            'quantidade': tabela.c.quantidade + comando.excluded.quantidade
+        }
+    )
+
+
+def ajustar_resumo(usuario_id, mes, tipo, categoria, valor, quantidade):
+    """
+    Soma `valor` e `quantidade` na linha (usuario_id, mes, tipo, categoria) do
+    resumo mensal, criando-a se necessário, e apaga a linha que ficar sem
+    transações. Sem categoria conta como '' (NULL escaparia do índice único).
+    Roda na transação da sessão atual, portanto é gravado no mesmo commit da
+    transação que o originou.
+    """
+    categoria = categoria or ''
+    db.session.execute(_upsert_resumo().values(
+        usuario_id=usuario_id,
+        mes=mes,
+        tipo=tipo,
+        categoria=categoria,
+        total=valor,
+        quantidade=quantidade
+    ))
+    if quantidade < 0:
+        db.session.execute(delete(ResumoMensal).where(
+            ResumoMensal.usuario_id == usuario_id,
+            ResumoMensal.mes == mes,
+            ResumoMensal.tipo == tipo,
+            ResumoMensal.categoria == categoria,
+            ResumoMensal.quantidade <= 0
+        ))
+
+
+def ajustar_resumo_em_lote(usuario_id, grupos):
+    """
+    Versão em lote de ajustar_resumo() para inclusões: `grupos` mapeia
+    (mes, tipo, categoria) -> (valor, quantidade). Um único upsert
+    executemany, em vez de dois comandos por grupo.
+    """
+    if not grupos:
+        return
+
+    linhas = {}
+    for (mes, tipo, categoria), (valor, quantidade) in grupos.items():
+        # None e '' caem na mesma linha do resumo
+        chave = (mes, tipo, categoria or '')
+        total, soma = linhas.get(chave, (0, 0))
+        linhas[chave] = (total + para_centavos(valor), soma + quantidade)
+
+    db.session.execute(_upsert_resumo(), [
+        {
+            'usuario_id': usuario_id, 'mes': mes, 'tipo': tipo, 'categoria': categoria,
+            'total': para_reais(total), 'quantidade': quantidade
+        }
+        for (mes, tipo, categoria), (total, quantidade) in linhas.items()
+    ])
+
+
+def registrar_transacao(transacao, sinal=1):
+    """Aplica (sinal=1) ou remove (sinal=-1) uma transação do resumo mensal."""
+    ajustar_resumo(
+        transacao.usuario_id,
+        transacao.data.strftime('%Y-%m'),
+        transacao.tipo,
+        transacao.categoria,
+        sinal * transacao.valor,
+        sinal
+    )
+
+
+def expressao_mes(coluna):
+    """Expressão SQL 'AAAA-MM' de uma coluna de data, no dialeto do banco em uso."""
+    if db.engine.dialect.name == 'sqlite':
+        return func.strftime('%Y-%m', coluna)
+    return func.to_char(coluna, 'YYYY-MM')
+
+
+def consulta_agregada(usuario_id=None):
+    """Agrega Transacao por usuário, mês, tipo e categoria (sem categoria = ''), no formato de ResumoMensal."""
+    mes = expressao_mes(Transacao.data)
+    categoria = func.coalesce(Transacao.categoria, '')
+    consulta = db.session.query(
+        Transacao.usuario_id,
+        mes.label('mes'),
+        Transacao.tipo,
+        categoria.label('categoria'),
+        func.sum(Transacao.valor).label('total'),
+        func.count(Transacao.id).label('quantidade')
+    )
+    if usuario_id is not None:
+        consulta = consulta.filter(Transacao.usuario_id == usuario_id)
+    return consulta.group_by(Transacao.usuario_id, mes, Transacao.tipo, categoria)
+
+
+def reconstruir_resumo(usuario_id=None):
+    """Apaga e recalcula o resumo mensal (de um usuário ou de todos) a partir de Transacao."""
+    apagar = delete(ResumoMensal)
+    if usuario_id is not None:
+        apagar = apagar.where(ResumoMensal.usuario_id == usuario_id)
+    db.session.execute(apagar)
+
+    resultado = db.session.execute(
+        insert(ResumoMensal).from_select(
+            ['usuario_id', 'mes', 'tipo', 'categoria', 'total', 'quantidade'],
+            consulta_agregada(usuario_id).statement
+        )
+    )
+    db.session.commit()
+    return resultado.rowcount
+
+
+def reconciliar_resumo(usuario_id=None):
+    """
+    Compara o resumo mensal com a agregação de Transacao e corrige apenas as
+    linhas divergentes (contadores com deriva, linhas faltando ou sobrando),
+    sem reescrever a tabela. Retorna {'corrigidas': n, 'criadas': n, 'removidas': n}.
+    """
+    esperado = {
+        (linha.usuario_id, linha.mes, linha.tipo, linha.categoria): (para_centavos(linha.total), linha.quantidade)
+        for linha in consulta_agregada(usuario_id)
+    }
+    consulta = db.session.query(
+        ResumoMensal.id, ResumoMensal.usuario_id, ResumoMensal.mes, ResumoMensal.tipo,
+        ResumoMensal.categoria, em_centavos(ResumoMensal.total), ResumoMensal.quantidade
+    )
+    if usuario_id is not None:
+        consulta = consulta.filter(ResumoMensal.usuario_id == usuario_id)
+
+    resultado = {'corrigidas': 0, 'criadas': 0, 'removidas': 0}
+    tabela = ResumoMensal.__table__
+    for id_resumo, *chave, total, quantidade in consulta.all():
+        valores = esperado.pop(tuple(chave), None)
+        if valores is None:
+            db.session.execute(delete(tabela).where(tabela.c.id == id_resumo))
+            resultado['removidas'] += 1
+        elif valores != (total, quantidade):
+            db.session.execute(update(tabela).where(tabela.c.id == id_resumo).values(
+                total=para_reais(valores[0]), quantidade=valores[1]
+            ))
+            resultado['corrigidas'] += 1
+
+    for (usuario, mes, tipo, categoria), (total, quantidade) in esperado.items():
+        db.session.execute(insert(tabela).values(
+            usuario_id=usuario, mes=mes, tipo=tipo, categoria=categoria,
+            total=para_reais(total), quantidade=quantidade
+        ))
+        resultado['criadas'] += 1
+
+    db.session.commit()
+    return resultado
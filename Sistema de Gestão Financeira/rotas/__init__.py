@@ -0,0 +1 @@
+"""Blueprints das rotas: auth (cadastro e login), transacoes, dashboard (painel e APIs de estatísticas) e exportacoes."""
@@ -0,0 +1,84 @@
+from flask import Blueprint, current_app, render_template, redirect, url_for, request, flash
+from flask_login import login_user, logout_user, login_required
+from extensions import db, limiter
+from models import Usuario
+from validacao import validar_senha_forte, sanitizar_texto, validar_email
+from senhas import SenhasSobrecarregadas
+
+bp = Blueprint('auth', __name__)
+
+
+@bp.route('/register', methods=['GET', 'POST'])
+@limiter.limit(lambda: current_app.config['LIMITE_REGISTRO'])
+def register():
+    if request.method == 'POST':
+        nome = sanitizar_texto(request.form.get('nome', '').strip())
+        email = request.form.get('email', '').strip().lower()
+        senha = request.form.get('senha', '')
+
+        if not nome or len(nome) < 2:
+            flash('Nome deve ter pelo menos 2 caracteres.', 'error')
+            return redirect(url_for('auth.register'))
+        
+        if not validar_email(email):
+            flash('E-mail inválido.', 'error')
+            return redirect(url_for('auth.register'))
+
+        if Usuario.query.filter_by(email=email).first():
+            flash('E-mail já cadastrado!', 'error')
+            return redirect(url_for('auth.register'))
+
+        senha_valida, mensagem = validar_senha_forte(senha)
+        if not senha_valida:
+            flash(mensagem, 'error')
+            return redirect(url_for('auth.register'))
+
+        try:
+            novo_usuario = Usuario(nome=nome, email=email)
+            novo_usuario.set_password(senha)
+            db.session.add(novo_usuario)
+            db.session.commit()
+            flash('Cadastro realizado com sucesso! Faça o login.', 'success')
+            return redirect(url_for('auth.login'))
+        except ValueError as e:
+            flash(str(e), 'error')
+        except SenhasSobrecarregadas:
+            db.session.rollback()
+            flash('Muitos acessos no momento. Tente novamente em instantes.', 'error')
+
+    return render_template('register.html')
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        email = request.form.get('email', '').strip().lower()
+        senha = request.form.get('senha', '')
+
+        if not validar_email(email):
+            flash('E-mail ou senha inválidos.', 'error')
+            return redirect(url_for('auth.login'))
+
+        usuario = Usuario.query.filter_by(email=email).first()
+
+        try:
+            if usuario and usuario.check_password(senha):
+                if usuario.precisa_rehash():
+                    # Hash antigo (método ou custo diferente de SENHA_METODO): atualiza com a senha já validada
+                    usuario.set_password(senha)
+                    db.session.commit()
+                login_user(usuario)
+                flash('Login realizado com sucesso!', 'success')
+                return redirect(url_for('dashboard.dashboard'))
+            else:
+                flash('E-mail ou senha inválidos.', 'error')
+        except SenhasSobrecarregadas:
+            flash('Muitos acessos no momento. Tente novamente em instantes.', 'error')
+
+    return render_template('login.html')
+
+@bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    flash('Você saiu da sua conta.', 'success')
+    return redirect(url_for('auth.login'))
@@ -0,0 +1,169 @@
+from flask import Blueprint, current_app, render_template, redirect, url_for, request, flash, make_response, jsonify
+from flask_login import login_required, current_user
+from extensions import db
+from estatisticas import estatisticas_usuario, serie_mensal, distribuicao_categorias, totais_dashboard
+from validacao import sanitizar_texto, validar_valor_meta
+from listagem import pagina_transacoes, transacao_para_json
+from filtros import FiltroTransacoes
+from replica import leitura_replica
+from metas import salvar_meta
+from previsao import previsao_usuario
+from datetime import datetime, timezone
+import hashlib
+
+bp = Blueprint('dashboard', __name__)
+
+
+@bp.route('/')
+def home():
+    if current_user.is_authenticated:
+        return redirect(url_for('dashboard.dashboard'))
+    return redirect(url_for('auth.login'))
+
+@bp.route('/definir_meta', methods=['POST'])
+@login_required
+def definir_meta():
+    categoria = sanitizar_texto(request.form.get('categoria', '').strip()) or None
+    meta, erro = validar_valor_meta(request.form.get('meta_mensal', 0))
+    if erro:
+        flash(erro, 'error')
+    else:
+        salvar_meta(current_user.id, categoria, meta)
+        db.session.commit()
+        alvo = f'de {categoria}' if categoria else 'mensal'
+        if meta:
+            flash(f'Meta {alvo} definida para R$ {meta:.2f}!', 'success')
+        else:
+            flash(f'Meta {alvo} removida.', 'success')
+
+    return redirect(url_for('dashboard.dashboard'))
+
+@bp.route('/dashboard', methods=['GET'])
+@login_required
+@leitura_replica
+def dashboard():
+    filtro = FiltroTransacoes.de_args(current_user.id, request.args)
+    for erro in filtro.erros:
+        flash(erro, 'error')
+
+    estatisticas, relatorio_mensal, categorias_disponiveis = estatisticas_usuario(current_user)
+    previsao = previsao_usuario(current_user)
+
+    transacoes, proximo_cursor = pagina_transacoes(filtro, limite=current_app.config['TAMANHO_PAGINA'])
+
+    totais = db.session.execute(filtro.consulta_totais()).one() if filtro.precisa_totais else None
+    total_receitas, total_despesas, relatorio_mensal = totais_dashboard(filtro, relatorio_mensal, totais)
+    saldo = total_receitas - total_despesas
+
+    return render_template('dashboard.html',
+                           transacoes=transacoes,
+                           proximo_cursor=proximo_cursor,
+                           total_receitas=total_receitas,
+                           total_despesas=total_despesas,
+                           saldo=saldo,
+                           relatorio_mensal=relatorio_mensal,
+                           data_inicial_str=filtro.data_inicial_str,
+                           data_final_str=filtro.data_final_str,
+                           filtro_tipo=filtro.tipo,
+                           filtro_categoria=filtro.categoria,
+                           filtro_busca=filtro.busca,
+                           categorias_disponiveis=categorias_disponiveis,
+                           estatisticas=estatisticas,
+                           previsao=previsao)
+
+@bp.route('/api/dashboard')
+@login_required
+@leitura_replica
+def api_dashboard():
+    """Dados do dashboard em JSON (mesmos filtros); também servido pelo modo assíncrono (ver assincrono.py)."""
+    filtro = FiltroTransacoes.de_args(current_user.id, request.args)
+    estatisticas, relatorio_mensal, categorias_disponiveis = estatisticas_usuario(current_user)
+    transacoes, proximo_cursor = pagina_transacoes(filtro, limite=current_app.config['TAMANHO_PAGINA'])
+    totais = db.session.execute(filtro.consulta_totais()).one() if filtro.precisa_totais else None
+    return jsonify(dashboard_para_json(
+        filtro, estatisticas, relatorio_mensal, categorias_disponiveis, totais, transacoes, proximo_cursor
+    ))
+
+def dashboard_para_json(filtro, estatisticas, relatorio_mensal, categorias_disponiveis, totais, transacoes, proximo_cursor):
+    """Resposta de /api/dashboard, a partir das mesmas consultas do dashboard."""
+    total_receitas, total_despesas, relatorio_mensal = totais_dashboard(filtro, relatorio_mensal, totais)
+    return {
+        'total_receitas': total_receitas,
+        'total_despesas': total_despesas,
+        'saldo': total_receitas - total_despesas,
+        'relatorio_mensal': relatorio_mensal,
+        'categorias_disponiveis': categorias_disponiveis,
+        'estatisticas': estatisticas,
+        'transacoes': [transacao_para_json(t) for t in transacoes],
+        'proximo_cursor': proximo_cursor,
+        'erros': filtro.erros
+    }
+
+def validadores_estatisticas(usuario, requisicao):
+    """
+    (etag, alterado_em, atual) das APIs de estatísticas: ETag da versão dos
+    dados do usuário + parâmetros, Last-Modified da última escrita e se o
+    cliente já tem a versão atual (If-None-Match / If-Modified-Since).
+    """
+    etag = hashlib.sha1(
+        f'{usuario.id}:{usuario.versao_dados}:{requisicao.full_path}'.encode()
+    ).hexdigest()
+    alterado_em = usuario.dados_alterados_em
+    if alterado_em is not None:
+        alterado_em = alterado_em.replace(microsecond=0, tzinfo=timezone.utc)
+
+    if requisicao.if_none_match:
+        atual = requisicao.if_none_match.contains_weak(etag)
+    else:
+        atual = alterado_em is not None and requisicao.if_modified_since is not None and requisicao.if_modified_since >= alterado_em
+    return etag, alterado_em, atual
+
+def preparar_resposta_estatisticas(resposta, etag, alterado_em):
+    """Aplica ETag, Last-Modified e Cache-Control à resposta (200 ou 304) de estatísticas."""
+    resposta.set_etag(etag, weak=True)
+    if alterado_em is not None:
+        resposta.last_modified = alterado_em
+    resposta.headers['Cache-Control'] = 'private, no-cache'
+    return resposta
+
+def resposta_estatisticas(calcular):
+    """
+    JSON de estatísticas com ETag e Last-Modified (ver validadores_estatisticas).
+    Se o cliente já tem a versão atual, responde 304 sem consultar o banco.
+    """
+    etag, alterado_em, atual = validadores_estatisticas(current_user, request)
+    resposta = make_response('', 304) if atual else jsonify(calcular())
+    return preparar_resposta_estatisticas(resposta, etag, alterado_em)
+
+def parametros_categorias(args):
+    """(tipo, mes, erro) de /api/stats/categorias; `erro` é a mensagem do 400, se houver."""
+    tipo = args.get('tipo', 'despesa')
+    if tipo not in ('receita', 'despesa'):
+        return tipo, None, 'Tipo inválido.'
+    mes = args.get('mes')
+    if mes:
+        try:
+            datetime.strptime(mes, '%Y-%m')
+        except ValueError:
+            return tipo, mes, 'Mês inválido (use AAAA-MM).'
+    return tipo, mes, None
+
+@bp.route('/api/stats/mensal')
+@login_required
+def api_stats_mensal():
+    """Receitas, despesas, saldo, saldo acumulado e média móvel de 3 meses das despesas, por mês."""
+    return resposta_estatisticas(lambda: {'meses': serie_mensal(current_user.id)})
+
+@bp.route('/api/stats/categorias')
+@login_required
+def api_stats_categorias():
+    """Distribuição por categoria (?tipo=despesa|receita, ?mes=AAAA-MM opcional)."""
+    tipo, mes, erro = parametros_categorias(request.args)
+    if erro:
+        return jsonify({'erro': erro}), 400
+
+    return resposta_estatisticas(lambda: {
+        'tipo': tipo,
+        'mes': mes,
+        'categorias': distribuicao_categorias(current_user.id, tipo, mes)
+    })
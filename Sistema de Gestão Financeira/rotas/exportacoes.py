@@ -0,0 +1,100 @@
+from flask import Blueprint, current_app, url_for, request, Response, stream_with_context, send_file, jsonify, abort
+from flask_login import login_required, current_user
+from extensions import db, limiter
+from models import TarefaExportacao
+from exportacao import gerar_csv, gerar_pdf, criar_tarefa, manter_exportacoes
+from filtros import FiltroTransacoes
+from replica import leitura_replica
+from datetime import datetime
+import os
+import tempfile
+
+bp = Blueprint('exportacoes', __name__)
+
+
+@bp.route('/export/csv')
+@login_required
+@leitura_replica
+def export_csv():
+    # Aplicar os mesmos filtros do dashboard
+    filtro = FiltroTransacoes.de_args(current_user.id, request.args)
+
+    # Criar resposta, enviada em blocos de TAMANHO_LOTE_EXPORTACAO linhas
+    output = Response(stream_with_context(gerar_csv(filtro, current_app.config['TAMANHO_LOTE_EXPORTACAO'])), mimetype='text/csv')
+    output.headers["Content-Disposition"] = f"attachment; filename=transacoes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    output.headers["Content-type"] = "text/csv; charset=utf-8"
+    
+    return output
+
+@bp.route('/export/pdf')
+@login_required
+@leitura_replica
+def export_pdf():
+    # Aplicar os mesmos filtros do dashboard
+    filtro = FiltroTransacoes.de_args(current_user.id, request.args)
+
+    # Criar PDF em memória; acima de PDF_MAX_MEMORIA bytes o conteúdo vai para um arquivo temporário
+    buffer = tempfile.SpooledTemporaryFile(max_size=current_app.config['PDF_MAX_MEMORIA'])
+    gerar_pdf(buffer, filtro, current_user.nome)
+    
+    # Criar resposta
+    buffer.seek(0)
+    response = send_file(
+        buffer,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=f"relatorio_financeiro_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    )
+    
+    return response
+
+@bp.route('/exportacoes', methods=['POST'])
+@login_required
+def nova_exportacao():
+    formato = request.form.get('formato', '')
+    if formato not in ['csv', 'pdf']:
+        return jsonify({'erro': 'Formato inválido.'}), 400
+
+    tarefa = criar_tarefa(current_user.id, formato, request.form)
+    return jsonify(tarefa_para_json(tarefa)), 202
+
+# Consultada a cada poucos segundos pelo dashboard enquanto a exportação roda
+@bp.route('/exportacoes/<tarefa_id>')
+@limiter.exempt
+@login_required
+def status_exportacao(tarefa_id):
+    manter_exportacoes()
+    tarefa = db.session.get(TarefaExportacao, tarefa_id)
+    if tarefa is None or tarefa.usuario_id != current_user.id:
+        return jsonify({'erro': 'Exportação não encontrada.'}), 404
+    return jsonify(tarefa_para_json(tarefa))
+
+@bp.route('/exportacoes/<tarefa_id>/download')
+@login_required
+def download_exportacao(tarefa_id):
+    tarefa = db.session.get(TarefaExportacao, tarefa_id)
+    if tarefa is None or tarefa.usuario_id != current_user.id:
+        abort(404)
+    if tarefa.status != 'concluida' or not tarefa.arquivo or not os.path.exists(tarefa.arquivo):
+        return jsonify(tarefa_para_json(tarefa)), 409
+
+    prefixo = 'transacoes' if tarefa.formato == 'csv' else 'relatorio_financeiro'
+    return send_file(
+        tarefa.arquivo,
+        mimetype='text/csv' if tarefa.formato == 'csv' else 'application/pdf',
+        as_attachment=True,
+        download_name=f"{prefixo}_{tarefa.criada_em.strftime('%Y%m%d_%H%M%S')}.{tarefa.formato}"
+    )
+
+def tarefa_para_json(tarefa):
+    """Representação de uma tarefa de exportação para as rotas /exportacoes."""
+    return {
+        'id': tarefa.id,
+        'formato': tarefa.formato,
+        'status': tarefa.status,
+        'erro': tarefa.erro,
+        'criada_em': tarefa.criada_em.isoformat() if tarefa.criada_em else None,
+        'concluida_em': tarefa.concluida_em.isoformat() if tarefa.concluida_em else None,
+        'url_status': url_for('exportacoes.status_exportacao', tarefa_id=tarefa.id),
+        'url_download': url_for('exportacoes.download_exportacao', tarefa_id=tarefa.id) if tarefa.status == 'concluida' else None
+    }
@@ -0,0 +1,170 @@
+from flask import Blueprint, current_app, render_template, redirect, url_for, request, flash, jsonify
+from flask_login import login_required, current_user
+from extensions import db
+from models import Transacao, TransacaoRecorrente
+from estatisticas import invalidar_estatisticas
+from resumo import registrar_transacao
+from validacao import validar_dados_transacao
+from importacao import ler_csv, ler_ofx, importar_transacoes
+from listagem import pagina_transacoes, transacao_para_json
+from filtros import FiltroTransacoes
+from replica import leitura_replica
+from recorrencias import FREQUENCIAS, criar_recorrencia, encerrar_recorrencia
+from datetime import datetime
+import io
+
+bp = Blueprint('transacoes', __name__)
+
+
+@bp.route('/api/transacoes')
+@login_required
+@leitura_replica
+def api_transacoes():
+    filtro = FiltroTransacoes.de_args(current_user.id, request.args)
+    limite = min(request.args.get('limite', current_app.config['TAMANHO_PAGINA'], type=int) or 1, 100)
+    transacoes, proximo_cursor = pagina_transacoes(filtro, request.args.get('cursor'), max(limite, 1))
+
+    resposta = {
+        'transacoes': [transacao_para_json(t) for t in transacoes],
+        'proximo_cursor': proximo_cursor
+    }
+    if request.args.get('html'):
+        resposta['html'] = render_template('_linhas_transacoes.html', transacoes=transacoes)
+    return jsonify(resposta)
+
+@bp.route('/nova', methods=['GET', 'POST'])
+@login_required
+def nova_transacao():
+    if request.method == 'POST':
+        dados, erro = validar_dados_transacao(
+            request.form.get('descricao', ''),
+            request.form.get('categoria', ''),
+            request.form.get('tipo', ''),
+            request.form.get('valor', 0),
+            request.form.get('data', '')
+        )
+        if erro:
+            flash(erro, 'error')
+            return redirect(url_for('transacoes.nova_transacao'))
+
+        frequencia = request.form.get('recorrencia', '')
+        if frequencia and frequencia not in FREQUENCIAS:
+            flash('Recorrência inválida.', 'error')
+            return redirect(url_for('transacoes.nova_transacao'))
+
+        transacao = Transacao(usuario_id=current_user.id, **dados)
+        db.session.add(transacao)
+        if frequencia:
+            criar_recorrencia(transacao, frequencia)
+        registrar_transacao(transacao)
+        invalidar_estatisticas(current_user.id)
+        db.session.commit()
+        flash('Transação adicionada!', 'success')
+        return redirect(url_for('dashboard.dashboard'))
+
+    return render_template('transaction_form.html')
+
+@bp.route('/delete/<int:id>')
+@login_required
+def delete(id):
+    transacao = Transacao.query.get_or_404(id)
+    if transacao.usuario_id != current_user.id:
+        flash('Acesso negado.', 'error')
+        return redirect(url_for('dashboard.dashboard'))
+
+    registrar_transacao(transacao, -1)
+    invalidar_estatisticas(current_user.id)
+    db.session.delete(transacao)
+    db.session.commit()
+    flash('Transação excluída.', 'success')
+    return redirect(url_for('dashboard.dashboard'))
+
+@bp.route('/editar/<int:id>', methods=['GET', 'POST'])
+@login_required
+def editar_transacao(id):
+    transacao = Transacao.query.get_or_404(id)
+    
+    if transacao.usuario_id != current_user.id:
+        flash('Acesso negado.', 'error')
+        return redirect(url_for('dashboard.dashboard'))
+    
+    if request.method == 'POST':
+        dados, erro = validar_dados_transacao(
+            request.form.get('descricao', ''),
+            request.form.get('categoria', ''),
+            request.form.get('tipo', ''),
+            request.form.get('valor', 0),
+            request.form.get('data', '')
+        )
+        if erro:
+            flash(erro, 'error')
+            return redirect(url_for('transacoes.editar_transacao', id=id))
+        
+        registrar_transacao(transacao, -1)
+        for campo, valor in dados.items():
+            setattr(transacao, campo, valor)
+        registrar_transacao(transacao)
+        invalidar_estatisticas(current_user.id)
+        
+        db.session.commit()
+        flash('Transação atualizada com sucesso!', 'success')
+        return redirect(url_for('dashboard.dashboard'))
+    
+    return render_template('transaction_form.html', transacao=transacao)
+
+@bp.route('/importar', methods=['GET', 'POST'])
+@login_required
+def importar():
+    if request.method == 'POST':
+        arquivo = request.files.get('arquivo')
+        if not arquivo or not arquivo.filename:
+            flash('Selecione um arquivo CSV ou OFX.', 'error')
+            return redirect(url_for('transacoes.importar'))
+
+        nome = arquivo.filename.lower()
+        if not nome.endswith(('.csv', '.ofx', '.qfx')):
+            flash('Formato de arquivo não suportado. Use CSV ou OFX.', 'error')
+            return redirect(url_for('transacoes.importar'))
+
+        entrada = io.TextIOWrapper(arquivo.stream, encoding='utf-8-sig', errors='replace', newline='')
+        leitor = ler_csv(entrada) if nome.endswith('.csv') else ler_ofx(entrada)
+        resultado = importar_transacoes(current_user.id, leitor, current_app.config['TAMANHO_LOTE_IMPORTACAO'])
+
+        if resultado['importadas']:
+            flash(f"{resultado['importadas']} transação(ões) importada(s)!", 'success')
+        if resultado['total_erros']:
+            flash(f"{resultado['total_erros']} linha(s) não foram importadas.", 'error')
+        return render_template('importar.html', resultado=resultado)
+
+    return render_template('importar.html')
+
+@bp.route('/recorrencias')
+@login_required
+def recorrencias():
+    regras = TransacaoRecorrente.query.filter_by(usuario_id=current_user.id).order_by(
+        TransacaoRecorrente.ativa.desc(), TransacaoRecorrente.proxima_data
+    ).all()
+    return render_template('recorrencias.html', regras=regras)
+
+@bp.route('/recorrencias/<int:id>/encerrar', methods=['POST'])
+@login_required
+def encerrar(id):
+    regra = TransacaoRecorrente.query.get_or_404(id)
+    if regra.usuario_id != current_user.id:
+        flash('Acesso negado.', 'error')
+        return redirect(url_for('transacoes.recorrencias'))
+
+    data_fim = request.form.get('data_fim', '')
+    try:
+        data_fim = datetime.strptime(data_fim, '%Y-%m-%d').date() if data_fim else None
+    except ValueError:
+        flash('Data inválida.', 'error')
+        return redirect(url_for('transacoes.recorrencias'))
+
+    encerrar_recorrencia(regra, data_fim)
+    db.session.commit()
+    if regra.ativa:
+        flash(f"Recorrência termina em {data_fim.strftime('%d/%m/%Y')}.", 'success')
+    else:
+        flash('Recorrência encerrada.', 'success')
+    return redirect(url_for('transacoes.recorrencias'))
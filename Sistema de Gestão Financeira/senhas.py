@@ -0,0 +1,84 @@
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from functools import lru_cache
+import os
+import threading
+
+
+class SenhasSobrecarregadas(Exception):
+    """O pool de hashing está cheio ou não atendeu a tempo (pico de logins)."""
+
+
+_executor = None
+_vagas = None
+
+
+def executor_senhas():
+    """
+    Pool limitado onde rodam os hashes de senha. hashlib.scrypt e pbkdf2_hmac
+    liberam o GIL, então threads bastam; o limite de SENHA_THREADS impede que
+    um pico de logins ocupe todos os núcleos do worker.
+    """
+    global _executor, _vagas
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=current_app.config['SENHA_THREADS'],
+            thread_name_prefix='senhas'
+        )
+        # Hashes rodando + na fila: o pool sozinho aceitaria uma fila sem limite
+        _vagas = threading.BoundedSemaphore(current_app.config['SENHA_THREADS'] + current_app.config['SENHA_FILA'])
+    return _executor
+
+
+def _descartar_executor():
+    # As threads do pool não existem no processo filho de um fork (gunicorn --preload)
+    global _executor, _vagas
+    _executor = None
+    _vagas = None
+
+
+os.register_at_fork(after_in_child=_descartar_executor)
+
+
+def _executar(funcao, *args):
+    """
+    Roda o hash no pool. Sem vaga (SENHA_THREADS rodando e SENHA_FILA
+    esperando) recusa na hora; a vaga só é liberada quando o hash termina ou
+    é cancelado antes de começar, e não quando a espera estoura o tempo.
+    """
+    executor = executor_senhas()
+    vagas = _vagas
+    if not vagas.acquire(blocking=False):
+        raise SenhasSobrecarregadas()
+    try:
+        futuro = executor.submit(funcao, *args)
+    except BaseException:
+        vagas.release()
+        raise
+    futuro.add_done_callback(lambda _: vagas.release())
+    try:
+        return futuro.result(timeout=current_app.config['SENHA_TEMPO_MAXIMO'])
+    except TimeoutError:
+        futuro.cancel()
+        raise SenhasSobrecarregadas()
+
+
+@lru_cache(maxsize=8)
+def prefixo_metodo(metodo):
+    """Prefixo gravado no hash pelo método, com os parâmetros explícitos ('scrypt' -> 'scrypt:32768:8:1')."""
+    return generate_password_hash('', method=metodo, salt_length=1).split('$', 1)[0]
+
+
+def gerar_hash(senha):
+    """Gera o hash da senha com o método e custo de SENHA_METODO."""
+    return _executar(generate_password_hash, senha, current_app.config['SENHA_METODO'])
+
+
+def verificar_hash(senha_hash, senha):
+    return _executar(check_password_hash, senha_hash, senha)
+
+
+def precisa_rehash(senha_hash):
+    """Indica se o hash foi gerado com método ou parâmetros diferentes dos configurados."""
+    return senha_hash.split('$', 1)[0] != prefixo_metodo(current_app.config['SENHA_METODO'])
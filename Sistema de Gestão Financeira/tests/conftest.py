@@ -0,0 +1,68 @@
+from app import create_app
+from extensions import db
+from models import Usuario
+from flask import g, has_app_context
+from flask.testing import FlaskClient
+from flask_migrate import upgrade
+import pytest
+import uuid
+
+CONFIG_TESTE = {
+    'TESTING': True,
+    'SECRET_KEY': 'teste',
+    'RATELIMIT_STORAGE_URI': 'memory://',
+    'RATELIMIT_ENABLED': False,
+    'WTF_CSRF_ENABLED': False,
+}
+
+
+class ClienteTeste(FlaskClient):
+    """
+    Cliente de teste para requisições feitas dentro do app context do teste
+    (fixture `contexto`), que as requisições reaproveitam junto com o `g`: o
+    usuário carregado pelo Flask-Login numa requisição não passa para a próxima.
+    """
+
+    def open(self, *args, **kwargs):
+        if has_app_context():
+            g.pop('_login_user', None)
+        return super().open(*args, **kwargs)
+
+
+def criar_app_teste(caminho_banco, **config):
+    """Aplicação sobre um SQLite novo em `caminho_banco`, criado pelas migrações como em produção."""
+    app = create_app({**CONFIG_TESTE, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{caminho_banco}', **config})
+    app.test_client_class = ClienteTeste
+    with app.app_context():
+        upgrade()
+    return app
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    return criar_app_teste(tmp_path_factory.mktemp('banco') / 'teste.db')
+
+
+@pytest.fixture
+def contexto(app):
+    with app.app_context():
+        yield
+        db.session.rollback()
+
+
+@pytest.fixture
+def usuario(contexto):
+    """Usuário novo a cada teste (o banco da sessão é compartilhado)."""
+    usuario = Usuario(nome='Teste', email=f'{uuid.uuid4().hex}@exemplo.com', senha_hash='x')
+    db.session.add(usuario)
+    db.session.commit()
+    return usuario
+
+
+@pytest.fixture
+def cliente(app, usuario):
+    """Cliente de teste com `usuario` logado."""
+    cliente = app.test_client()
+    with cliente.session_transaction() as sessao:
+        sessao['_user_id'] = str(usuario.id)
+    return cliente
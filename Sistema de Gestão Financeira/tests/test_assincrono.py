@@ -0,0 +1,81 @@
+from assincrono import AplicacaoAssincrona
+from extensions import db, limiter
+from models import Usuario
+from tests.conftest import criar_app_teste
+import asyncio
+import pytest
+
+
+def chamar(asgi, scope, mensagens):
+    """Roda uma conexão ASGI até o fim e devolve as mensagens enviadas pelo app."""
+    enviadas = []
+    entrada = iter(mensagens)
+
+    async def receive():
+        return next(entrada)
+
+    async def send(mensagem):
+        enviadas.append(mensagem)
+
+    asyncio.run(asgi(scope, receive, send))
+    return enviadas
+
+
+def scope_http(caminho, cookie=None):
+    cabecalhos = [(b'host', b'localhost')]
+    if cookie:
+        cabecalhos.append((b'cookie', f'session={cookie}'.encode()))
+    return {
+        'type': 'http', 'method': 'GET', 'path': caminho, 'query_string': b'', 'headers': cabecalhos,
+        'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+    }
+
+
+def status(enviadas):
+    return next(m['status'] for m in enviadas if m['type'] == 'http.response.start')
+
+
+@pytest.fixture
+def asgi(app, tmp_path):
+    """App ASGI com limite baixo; o limiter (global) volta à configuração do app da sessão no fim."""
+    app_limitado = criar_app_teste(tmp_path / 'assincrono.db', RATELIMIT_ENABLED=True, RATELIMIT_DEFAULT='3 per minute')
+    aplicacao = AplicacaoAssincrona(app_limitado)
+    yield aplicacao
+    asyncio.run(aplicacao.engine.dispose())
+    aplicacao.threads_wsgi.shutdown()
+    limiter.init_app(app)
+
+
+def test_websocket_fechado(asgi):
+    scope = {'type': 'websocket', 'path': '/api/dashboard', 'headers': []}
+    enviadas = chamar(asgi, scope, [{'type': 'websocket.connect'}])
+    assert enviadas == [{'type': 'websocket.close', 'code': 1000}]
+
+
+def test_websocket_404_com_resposta_http(asgi):
+    scope = {'type': 'websocket', 'path': '/', 'headers': [], 'extensions': {'websocket.http.response': {}}}
+    enviadas = chamar(asgi, scope, [{'type': 'websocket.connect'}])
+    assert enviadas[0] == {'type': 'websocket.http.response.start', 'status': 404, 'headers': []}
+
+
+def test_tipo_desconhecido_recusado(asgi):
+    with pytest.raises(ValueError):
+        chamar(asgi, {'type': 'webtransport'}, [])
+
+
+def test_limite_compartilhado_com_flask(asgi):
+    """A rota atendida pelo modo assíncrono e a mesma rota no Flask gastam o mesmo contador."""
+    app = asgi.app
+    with app.app_context():
+        usuario = Usuario(nome='Teste', email='limite@exemplo.com', senha_hash='x')
+        db.session.add(usuario)
+        db.session.commit()
+        usuario_id = usuario.id
+    cookie = app.session_interface.get_signing_serializer(app).dumps({'_user_id': str(usuario_id)})
+    cliente = app.test_client()
+
+    assert status(chamar(asgi, scope_http('/api/dashboard', cookie), [])) == 200
+    assert cliente.get('/api/dashboard').status_code == 302
+    assert status(chamar(asgi, scope_http('/api/dashboard', cookie), [])) == 200
+    assert cliente.get('/api/dashboard').status_code == 429
+    assert status(chamar(asgi, scope_http('/api/dashboard', cookie), [])) == 429
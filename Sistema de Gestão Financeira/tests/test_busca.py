@@ -0,0 +1,75 @@
+from extensions import db
+from models import Transacao
+from filtros import FiltroTransacoes
+from busca import criterio_busca
+from listagem import consulta_pagina
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy import select
+import busca
+import io
+import pytest
+
+
+@pytest.fixture
+def transacoes(usuario):
+    for descricao in ['Desconto 50% off', 'Desconto 500 off', 'arquivo_novo', 'arquivoXnovo']:
+        db.session.add(Transacao(
+            usuario_id=usuario.id, descricao=descricao, valor=10, tipo='despesa',
+            categoria='Compras', data=datetime(2026, 1, 5)
+        ))
+    db.session.commit()
+    return usuario
+
+
+def descricoes(usuario, criterio):
+    return sorted(db.session.scalars(
+        select(Transacao.descricao).where(Transacao.usuario_id == usuario.id, criterio)
+    ))
+
+
+@pytest.mark.parametrize('texto', ['!!!', '"*"', '% _'])
+def test_texto_sem_palavras_nao_encontra_nada(transacoes, texto):
+    assert descricoes(transacoes, criterio_busca(texto)) == []
+    filtro = FiltroTransacoes.de_args(transacoes.id, {'busca': texto})
+    assert db.session.scalars(consulta_pagina(filtro, limite=10)).all() == []
+
+
+@pytest.mark.parametrize('texto, esperado', [
+    ('50%', ['Desconto 50% off']),
+    ('arquivo_', ['arquivo_novo']),
+    ('desconto', ['Desconto 50% off', 'Desconto 500 off']),
+])
+def test_ilike_trata_curingas_como_texto(transacoes, monkeypatch, texto, esperado):
+    # Fora do SQLite: o ILIKE roda igual no SQLite (lower() LIKE lower() ESCAPE)
+    monkeypatch.setattr(busca, 'db', SimpleNamespace(engine=SimpleNamespace(dialect=SimpleNamespace(name='postgresql'))))
+    assert descricoes(transacoes, criterio_busca(texto)) == esperado
+
+
+def buscar(cliente, texto):
+    return [t['descricao'] for t in cliente.get('/api/transacoes', query_string={'busca': texto}).json['transacoes']]
+
+
+def test_indice_fts_acompanha_inclusao_edicao_e_exclusao(cliente, usuario):
+    cliente.post('/nova', data={
+        'descricao': 'Padaria Estrela', 'valor': '12.00', 'tipo': 'despesa', 'categoria': 'Alimentação', 'data': '2026-01-05'
+    })
+    assert buscar(cliente, 'estre') == ['Padaria Estrela']
+    assert buscar(cliente, 'alim') == ['Padaria Estrela']
+
+    transacao = Transacao.query.filter_by(usuario_id=usuario.id).one()
+    cliente.post(f'/editar/{transacao.id}', data={
+        'descricao': 'Farmácia Central', 'valor': '12.00', 'tipo': 'despesa', 'categoria': 'Saúde', 'data': '2026-01-05'
+    })
+    assert buscar(cliente, 'estrela') == [] and buscar(cliente, 'alimentação') == []
+    assert buscar(cliente, 'farm') == ['Farmácia Central']
+    assert buscar(cliente, 'saúde') == ['Farmácia Central']
+
+    cliente.get(f'/delete/{transacao.id}')
+    assert buscar(cliente, 'farm') == []
+
+
+def test_indice_fts_recebe_importacao_em_lote(cliente, usuario):
+    extrato = b'data;descricao;valor;categoria\n05/01/2026;Posto Ipiranga;-150,00;Transporte\n06/01/2026;Uber;-25,00;Transporte\n'
+    cliente.post('/importar', data={'arquivo': (io.BytesIO(extrato), 'extrato.csv')}, content_type='multipart/form-data')
+    assert buscar(cliente, 'transp') == ['Uber', 'Posto Ipiranga']
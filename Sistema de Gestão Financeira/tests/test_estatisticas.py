@@ -0,0 +1,71 @@
+from extensions import db
+from models import ResumoMensal
+from estatisticas import serie_mensal, estatisticas_usuario
+from datetime import date
+
+
+def resumo(usuario, mes, tipo, total):
+    db.session.add(ResumoMensal(usuario_id=usuario.id, mes=mes, tipo=tipo, categoria='Moradia', total=total, quantidade=1))
+    db.session.commit()
+
+
+def test_serie_mensal_conta_meses_sem_movimento(usuario):
+    resumo(usuario, '2025-12', 'receita', 1000)
+    resumo(usuario, '2025-12', 'despesa', 300)
+    resumo(usuario, '2026-03', 'despesa', 300)
+
+    serie = serie_mensal(usuario.id)
+
+    assert [linha['mes'] for linha in serie] == ['2025-12', '2026-01', '2026-02', '2026-03']
+    assert [linha['despesas'] for linha in serie] == [300.0, 0.0, 0.0, 300.0]
+    assert [linha['media_movel_despesas'] for linha in serie] == [300.0, 150.0, 100.0, 100.0]
+    assert [linha['saldo_acumulado'] for linha in serie] == [700.0, 700.0, 700.0, 400.0]
+
+
+def test_media_movel_de_tres_meses(usuario):
+    resumo(usuario, '2026-01', 'despesa', 300)
+    resumo(usuario, '2026-03', 'despesa', 300)
+
+    assert serie_mensal(usuario.id)[-1]['media_movel_despesas'] == 200.0
+
+
+def test_serie_mensal_sem_dados(usuario):
+    assert serie_mensal(usuario.id) == []
+
+
+def despesas_do_mes(usuario):
+    db.session.refresh(usuario)
+    return estatisticas_usuario(usuario)[0]['comparacao_mensal']['despesas_atual']
+
+
+def test_estatisticas_em_cache_ate_a_versao_mudar(cliente, usuario):
+    hoje = date.today()
+    assert despesas_do_mes(usuario) == 0
+    versao = usuario.versao_dados
+
+    # Escrita direta no resumo, sem invalidar_estatisticas(): o cache continua valendo
+    resumo(usuario, hoje.strftime('%Y-%m'), 'despesa', 50)
+    assert despesas_do_mes(usuario) == 0
+
+    cliente.post('/nova', data={
+        'descricao': 'Mercado', 'valor': '30.00', 'tipo': 'despesa', 'categoria': 'Moradia', 'data': hoje.isoformat()
+    })
+    assert despesas_do_mes(usuario) == 80.0
+    assert usuario.versao_dados == versao + 1
+
+
+def test_api_stats_responde_304_enquanto_os_dados_nao_mudam(cliente, usuario):
+    primeira = cliente.get('/api/stats/mensal')
+    etag = primeira.headers['ETag']
+    assert primeira.status_code == 200 and primeira.json == {'meses': []}
+
+    repetida = cliente.get('/api/stats/mensal', headers={'If-None-Match': etag})
+    assert repetida.status_code == 304 and repetida.data == b''
+    assert cliente.get('/api/stats/categorias', headers={'If-None-Match': etag}).status_code == 200
+
+    cliente.post('/nova', data={
+        'descricao': 'Aluguel', 'valor': '900.00', 'tipo': 'despesa', 'categoria': 'Moradia', 'data': '2026-01-05'
+    })
+    depois = cliente.get('/api/stats/mensal', headers={'If-None-Match': etag})
+    assert depois.status_code == 200 and depois.headers['ETag'] != etag
+    assert depois.json['meses'][0]['despesas'] == 900.0
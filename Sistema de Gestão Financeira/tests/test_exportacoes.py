@@ -0,0 +1,122 @@
+from extensions import db
+from models import TarefaExportacao
+from exportacao import limpar_exportacoes, recuperar_tarefas_paradas
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from sqlalchemy import delete
+import exportacao
+import os
+import pytest
+
+AGORA = datetime(2026, 10, 17, 12, 0)
+
+
+@pytest.fixture
+def diretorio(app, contexto, tmp_path, monkeypatch):
+    """Diretório de exportações temporário e nenhuma tarefa de outros testes."""
+    monkeypatch.setitem(app.config, 'EXPORTACAO_DIRETORIO', str(tmp_path))
+    db.session.execute(delete(TarefaExportacao))
+    db.session.commit()
+    return tmp_path
+
+
+def criar_tarefa(usuario, status, idade, diretorio=None):
+    tarefa = TarefaExportacao(usuario_id=usuario.id, formato='csv', status=status, criada_em=AGORA - idade)
+    db.session.add(tarefa)
+    db.session.flush()
+    if diretorio is not None:
+        tarefa.arquivo = str(diretorio / f'{tarefa.id}.csv')
+        open(tarefa.arquivo, 'w').close()
+    db.session.commit()
+    return tarefa
+
+
+def arquivo_solto(diretorio, nome, idade):
+    caminho = diretorio / nome
+    caminho.write_text('parcial')
+    momento = (AGORA - idade - datetime(1970, 1, 1)).total_seconds()
+    os.utime(caminho, (momento, momento))
+    return caminho
+
+
+def test_limpar_exportacoes_apaga_tarefas_e_arquivos_expirados(usuario, diretorio):
+    antiga = criar_tarefa(usuario, 'concluida', timedelta(days=2), diretorio)
+    antiga_erro = criar_tarefa(usuario, 'erro', timedelta(days=2))
+    recente = criar_tarefa(usuario, 'concluida', timedelta(hours=1), diretorio)
+    em_andamento = criar_tarefa(usuario, 'processando', timedelta(days=2))
+    solto_antigo = arquivo_solto(diretorio, 'abandonado.pdf', timedelta(days=2))
+    solto_recente = arquivo_solto(diretorio, 'gerando.pdf', timedelta(minutes=5))
+    arquivo_antiga, arquivo_recente = antiga.arquivo, recente.arquivo
+    ids = antiga.id, antiga_erro.id, recente.id, em_andamento.id
+
+    assert limpar_exportacoes(AGORA) == 2
+    db.session.expire_all()
+    assert [db.session.get(TarefaExportacao, id_) is not None for id_ in ids] == [False, False, True, True]
+    assert not os.path.exists(arquivo_antiga) and os.path.exists(arquivo_recente)
+    assert not solto_antigo.exists() and solto_recente.exists()
+
+
+def test_recuperar_tarefas_paradas(usuario, diretorio):
+    parada = criar_tarefa(usuario, 'processando', timedelta(hours=2))
+    perdida = criar_tarefa(usuario, 'pendente', timedelta(hours=2))
+    rodando = criar_tarefa(usuario, 'processando', timedelta(minutes=5))
+    parcial = diretorio / f'{parada.id}.csv'
+    parcial.write_text('data,descricao')
+
+    assert recuperar_tarefas_paradas(AGORA) == 2
+    assert [parada.status, perdida.status, rodando.status] == ['erro', 'erro', 'processando']
+    assert 'Gere novamente' in parada.erro
+    assert not parcial.exists()
+
+
+def test_dashboard_exporta_pela_fila_de_tarefas(cliente):
+    html = cliente.get('/dashboard?tipo=despesa').get_data(as_text=True)
+    assert 'data-url="/exportacoes"' in html
+    assert '"tipo": "despesa"' in html
+    assert '/export/pdf' not in html and '/export/csv' not in html
+
+
+class PoolFalso:
+    """Pool de processos que guarda as tarefas enviadas, ou quebrado (como depois de um processo morrer)."""
+    criados = []
+
+    def __init__(self, quebrado=False, **opcoes):
+        self.quebrado, self.enviadas, self.encerrado = quebrado, [], False
+        PoolFalso.criados.append(self)
+
+    def submit(self, funcao, *args):
+        if self.quebrado:
+            raise BrokenProcessPool('Um processo do pool morreu.')
+        self.enviadas.append(args)
+
+    def shutdown(self, wait=True):
+        self.encerrado = True
+
+
+@pytest.fixture
+def pool_quebrado(diretorio, monkeypatch):
+    PoolFalso.criados = []
+    quebrado = PoolFalso(quebrado=True)
+    monkeypatch.setattr(exportacao, '_executor', quebrado)
+    return quebrado
+
+
+def test_pool_quebrado_e_substituido(usuario, pool_quebrado, monkeypatch):
+    monkeypatch.setattr(exportacao, 'ProcessPoolExecutor', PoolFalso)
+
+    tarefa = exportacao.criar_tarefa(usuario.id, 'pdf', {})
+
+    novo = exportacao._executor
+    assert pool_quebrado.encerrado and novo is not pool_quebrado
+    assert novo.enviadas == [(tarefa.id,)]
+    assert tarefa.status == 'pendente'
+
+
+def test_tarefa_vira_erro_se_o_pool_novo_tambem_falha(usuario, pool_quebrado, monkeypatch):
+    monkeypatch.setattr(exportacao, 'ProcessPoolExecutor', lambda **opcoes: PoolFalso(quebrado=True))
+
+    tarefa = exportacao.criar_tarefa(usuario.id, 'pdf', {})
+
+    db.session.expire_all()
+    assert db.session.get(TarefaExportacao, tarefa.id).status == 'erro'
+    assert 'Tente novamente' in tarefa.erro
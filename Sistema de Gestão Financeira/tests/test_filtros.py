@@ -0,0 +1,58 @@
+from extensions import db
+from models import Transacao
+from filtros import FiltroTransacoes
+from listagem import totais_transacoes
+from datetime import date
+import pytest
+
+
+@pytest.fixture
+def transacoes(usuario):
+    for descricao, valor, tipo, categoria, data in [
+        ('Padaria', 10, 'despesa', 'Alimentação', date(2026, 1, 5)),
+        ('Mercado', 200, 'despesa', 'Alimentação', date(2026, 2, 10)),
+        ('Ônibus', 5, 'despesa', 'Transporte', date(2026, 2, 11)),
+        ('Salário', 3000, 'receita', 'Salário', date(2026, 2, 5)),
+    ]:
+        db.session.add(Transacao(usuario_id=usuario.id, descricao=descricao, valor=valor, tipo=tipo, categoria=categoria, data=data))
+    db.session.commit()
+    return usuario
+
+
+def descricoes(usuario, **args):
+    filtro = FiltroTransacoes.de_args(usuario.id, args)
+    return sorted(t.descricao for t in db.session.scalars(filtro.consulta_transacoes()))
+
+
+def chave(usuario, **args):
+    return FiltroTransacoes.de_args(usuario.id, args).consulta_transacoes()._generate_cache_key()
+
+
+@pytest.mark.parametrize('campo, valores', [
+    ('categoria', {'Alimentação': ['Mercado', 'Padaria'], 'Transporte': ['Ônibus']}),
+    ('tipo', {'receita': ['Salário'], 'despesa': ['Mercado', 'Padaria', 'Ônibus']}),
+    ('busca', {'padaria': ['Padaria'], 'merc': ['Mercado'], 'salario': ['Salário'], 'aluguel': []}),
+    ('data_inicial', {'2026-02-06': ['Mercado', 'Ônibus'], '2026-01-01': ['Mercado', 'Padaria', 'Salário', 'Ônibus']}),
+])
+def test_mesma_estrutura_com_valores_diferentes(transacoes, campo, valores):
+    # A segunda rodada usa o statement já em cache: os valores não podem ter ficado presos na primeira
+    for _ in range(2):
+        for valor, esperado in valores.items():
+            assert descricoes(transacoes, **{campo: valor}) == esperado
+
+
+def test_valores_viram_parametros_do_mesmo_statement(transacoes):
+    alimentacao = chave(transacoes, categoria='Alimentação', data_inicial='2026-01-01', data_final='2026-01-31')
+    transporte = chave(transacoes, categoria='Transporte', data_inicial='2026-02-01', data_final='2026-02-28')
+    assert alimentacao.key == transporte.key
+    assert [p.value for p in alimentacao.bindparams] != [p.value for p in transporte.bindparams]
+
+    assert chave(transacoes, categoria='Alimentação').key != chave(transacoes, tipo='despesa').key
+    assert chave(transacoes, busca='padaria').key == chave(transacoes, busca='mercado').key
+
+
+def test_totais_com_periodos_diferentes(transacoes):
+    janeiro = FiltroTransacoes.de_args(transacoes.id, {'data_inicial': '2026-01-01', 'data_final': '2026-01-31'})
+    fevereiro = FiltroTransacoes.de_args(transacoes.id, {'data_inicial': '2026-02-01', 'data_final': '2026-02-28'})
+    assert totais_transacoes(janeiro) == (0.0, 10.0, 1)
+    assert totais_transacoes(fevereiro) == (3000.0, 205.0, 3)
@@ -0,0 +1,27 @@
+from comandos import plano_consulta, indices_do_plano, consultas_indexadas
+
+
+def test_consultas_usam_os_indices_esperados(contexto):
+    faltando = {}
+    for nome, (stmt, esperados) in consultas_indexadas(usuario_id=1).items():
+        plano = plano_consulta(stmt)
+        if not esperados <= indices_do_plano(plano):
+            faltando[nome] = plano
+    assert faltando == {}
+
+
+def test_indices_do_plano_le_indice_e_fts():
+    plano = [
+        'SEARCH transacao USING INDEX ix_transacao_usuario_data (usuario_id=?)',
+        'SEARCH resumo_mensal USING COVERING INDEX sqlite_autoindex_resumo_mensal_1 (usuario_id=?)',
+        'LIST SUBQUERY 1',
+        'SCAN transacao_fts VIRTUAL TABLE INDEX 0:M2',
+        'SCAN transacao',
+    ]
+    assert indices_do_plano(plano) == {'ix_transacao_usuario_data', 'sqlite_autoindex_resumo_mensal_1', 'transacao_fts'}
+
+
+def test_indice_errado_nao_passa():
+    # Um plano com outro índice da mesma tabela não satisfaz a consulta por tipo
+    plano = ['SEARCH transacao USING INDEX ix_transacao_usuario_data (usuario_id=? AND data>?)']
+    assert not {'ix_transacao_usuario_tipo_data'} <= indices_do_plano(plano)
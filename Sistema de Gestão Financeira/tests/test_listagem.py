@@ -0,0 +1,66 @@
+from extensions import db
+from models import Transacao
+from datetime import date, timedelta
+
+
+def criar_transacoes(usuario, quantidade):
+    """`quantidade` despesas, três por dia (datas repetidas exercitam o desempate por id)."""
+    for i in range(quantidade):
+        db.session.add(Transacao(
+            usuario_id=usuario.id, descricao=f'Compra {i}', valor=i + 1, tipo='despesa',
+            categoria='Compras', data=date(2026, 1, 1) + timedelta(days=i // 3)
+        ))
+    db.session.commit()
+    return Transacao.query.filter_by(usuario_id=usuario.id).order_by(Transacao.data.desc(), Transacao.id.desc()).all()
+
+
+def paginas(cliente, limite, **filtros):
+    """Percorre /api/transacoes seguindo proximo_cursor; retorna a lista de páginas (ids)."""
+    resultado, cursor = [], None
+    while True:
+        resposta = cliente.get('/api/transacoes', query_string={'limite': limite, 'cursor': cursor or '', **filtros}).json
+        resultado.append([t['id'] for t in resposta['transacoes']])
+        cursor = resposta['proximo_cursor']
+        if cursor is None:
+            return resultado
+
+
+def test_cursor_percorre_tudo_sem_repetir_nem_pular(cliente, usuario):
+    esperado = [t.id for t in criar_transacoes(usuario, 25)]
+
+    resultado = paginas(cliente, 10)
+
+    assert [len(pagina) for pagina in resultado] == [10, 10, 5]
+    assert sum(resultado, []) == esperado
+
+
+def test_pagina_exata_nao_gera_cursor_vazio(cliente, usuario):
+    criar_transacoes(usuario, 20)
+    assert [len(pagina) for pagina in paginas(cliente, 10)] == [10, 10]
+
+
+def test_insercao_entre_paginas_nao_duplica(cliente, usuario):
+    ordem = criar_transacoes(usuario, 12)
+    primeira = cliente.get('/api/transacoes', query_string={'limite': 5}).json
+
+    # Transação mais recente criada depois da primeira página: fica antes do cursor
+    db.session.add(Transacao(usuario_id=usuario.id, descricao='Nova', valor=1, tipo='despesa', data=date(2026, 2, 1)))
+    db.session.commit()
+    segunda = cliente.get('/api/transacoes', query_string={'limite': 5, 'cursor': primeira['proximo_cursor']}).json
+
+    assert [t['id'] for t in segunda['transacoes']] == [t.id for t in ordem[5:10]]
+
+
+def test_cursor_invalido_volta_ao_inicio(cliente, usuario):
+    ordem = criar_transacoes(usuario, 3)
+    resposta = cliente.get('/api/transacoes', query_string={'cursor': 'lixo', 'limite': 2}).json
+    assert [t['id'] for t in resposta['transacoes']] == [t.id for t in ordem[:2]]
+
+
+def test_cursor_respeita_os_filtros(cliente, usuario):
+    criar_transacoes(usuario, 9)
+    db.session.add(Transacao(usuario_id=usuario.id, descricao='Salário', valor=100, tipo='receita', data=date(2026, 1, 2)))
+    db.session.commit()
+
+    ids = sum(paginas(cliente, 2, tipo='receita'), [])
+    assert [db.session.get(Transacao, id_).descricao for id_ in ids] == ['Salário']
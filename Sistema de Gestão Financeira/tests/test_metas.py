@@ -0,0 +1,51 @@
+from extensions import db
+from models import MetaOrcamento
+from estatisticas import estatisticas_usuario
+from datetime import date, timedelta
+import pytest
+
+
+@pytest.mark.parametrize('valor', ['nan', 'NaN', '0.001'])
+def test_definir_meta_rejeita_valor_invalido(cliente, usuario, valor):
+    resposta = cliente.post('/definir_meta', data={'meta_mensal': valor})
+    assert resposta.status_code == 302
+    assert MetaOrcamento.query.filter_by(usuario_id=usuario.id).count() == 0
+
+
+def test_definir_e_remover_meta(cliente, usuario):
+    cliente.post('/definir_meta', data={'meta_mensal': '1500.50', 'categoria': 'Lazer'})
+    meta = MetaOrcamento.query.filter_by(usuario_id=usuario.id).one()
+    assert (meta.categoria, meta.valor) == ('Lazer', 1500.5)
+
+    cliente.post('/definir_meta', data={'meta_mensal': '0', 'categoria': 'Lazer'})
+    assert MetaOrcamento.query.filter_by(usuario_id=usuario.id).count() == 0
+
+
+def metas(usuario):
+    db.session.refresh(usuario)
+    return {meta['categoria']: meta for meta in estatisticas_usuario(usuario)[0]['metas']}
+
+
+def despesa(cliente, valor, categoria, data=None):
+    cliente.post('/nova', data={
+        'descricao': 'Compra', 'valor': valor, 'tipo': 'despesa', 'categoria': categoria,
+        'data': (data or date.today()).isoformat()
+    })
+
+
+def test_progresso_das_metas_no_mes(cliente, usuario):
+    cliente.post('/definir_meta', data={'meta_mensal': '1000'})
+    cliente.post('/definir_meta', data={'meta_mensal': '100', 'categoria': 'Lazer'})
+    despesa(cliente, '85.00', 'Lazer')
+    despesa(cliente, '300.00', 'Moradia')
+    despesa(cliente, '999.00', 'Moradia', date.today().replace(day=1) - timedelta(days=1))  # mês anterior
+
+    progresso = metas(usuario)
+    assert progresso[None] == {
+        'categoria': None, 'meta': 1000.0, 'gasto': 385.0, 'restante': 615.0, 'percentual': 38.5, 'situacao': 'ok'
+    }
+    assert (progresso['Lazer']['percentual'], progresso['Lazer']['situacao']) == (85.0, 'alerta')
+
+    despesa(cliente, '20.00', 'Lazer')
+    progresso = metas(usuario)
+    assert (progresso['Lazer']['restante'], progresso['Lazer']['situacao']) == (-5.0, 'excedida')
@@ -0,0 +1,31 @@
+from extensions import db
+from models import TransacaoRecorrente
+from previsao import calcular_previsao, projetar_recorrentes
+from datetime import date
+from decimal import Decimal
+
+
+def regra(usuario, proxima_data, valor='39.90', frequencia='mensal', **campos):
+    regra = TransacaoRecorrente(
+        usuario_id=usuario.id, descricao='Assinatura', valor=Decimal(valor), tipo='despesa',
+        categoria='Serviços', frequencia=frequencia, dia=proxima_data.day, proxima_data=proxima_data, **campos
+    )
+    db.session.add(regra)
+    db.session.commit()
+    return regra
+
+
+def test_recorrente_atrasada_conta_so_no_mes_corrente(usuario):
+    regra(usuario, date(2026, 1, 31))
+
+    previsao = calcular_previsao(usuario.id, date(2026, 10, 17))
+
+    assert previsao['recorrente'] == 39.90
+    assert previsao['categorias'] == [{'categoria': 'Serviços', 'gasto_atual': 0.0, 'previsao': 39.90}]
+
+
+def test_recorrentes_do_mes(usuario):
+    regra(usuario, date(2026, 9, 28), valor='10.00', frequencia='semanal')  # 05, 12, 19 e 26/10
+    regra(usuario, date(2026, 10, 20), valor='5.00', data_fim=date(2026, 10, 10))
+
+    assert projetar_recorrentes(usuario.id, date(2026, 10, 1), date(2026, 10, 31)) == {'Serviços': 4000}
@@ -0,0 +1,70 @@
+from extensions import db
+from models import Usuario, Transacao, TransacaoRecorrente, ResumoMensal
+from recorrencias import materializar_recorrencias
+from datetime import date
+import pytest
+
+
+@pytest.fixture
+def regra(cliente, usuario):
+    """Regra mensal criada pelo formulário de nova transação, com a primeira ocorrência em 10/01/2026."""
+    cliente.post('/nova', data={
+        'descricao': 'Streaming', 'valor': '39.90', 'tipo': 'despesa', 'categoria': 'Lazer',
+        'data': '2026-01-10', 'recorrencia': 'mensal'
+    })
+    return TransacaoRecorrente.query.filter_by(usuario_id=usuario.id).one()
+
+
+def test_lista_recorrencias(cliente, regra):
+    html = cliente.get('/recorrencias').get_data(as_text=True)
+    assert 'Streaming' in html and '10/02/2026' in html
+    assert f'/recorrencias/{regra.id}/encerrar' in html
+
+
+def test_encerrar_sem_data_desativa(cliente, regra):
+    cliente.post(f'/recorrencias/{regra.id}/encerrar')
+    db.session.refresh(regra)
+    assert not regra.ativa
+
+    materializar_recorrencias(date(2026, 6, 1))
+    assert Transacao.query.filter_by(recorrente_id=regra.id).count() == 1
+
+
+def test_encerrar_com_data_lanca_ate_ela(cliente, regra):
+    cliente.post(f'/recorrencias/{regra.id}/encerrar', data={'data_fim': '2026-03-31'})
+    db.session.refresh(regra)
+    assert regra.ativa and regra.data_fim == date(2026, 3, 31)
+
+    materializar_recorrencias(date(2026, 6, 1))
+    db.session.refresh(regra)
+    assert Transacao.query.filter_by(recorrente_id=regra.id).count() == 3
+    assert not regra.ativa
+
+
+def test_encerrar_regra_de_outro_usuario(cliente, regra):
+    outro = Usuario(nome='Outro', email=f'outro{regra.id}@exemplo.com', senha_hash='x')
+    db.session.add(outro)
+    db.session.commit()
+    regra.usuario_id = outro.id
+    db.session.commit()
+
+    cliente.post(f'/recorrencias/{regra.id}/encerrar')
+    db.session.refresh(regra)
+    assert regra.ativa
+
+
+def test_materializacao_idempotente(regra, usuario):
+    assert materializar_recorrencias(date(2026, 4, 15)) >= 3
+    assert materializar_recorrencias(date(2026, 4, 15)) == 0
+    db.session.refresh(regra)
+    assert regra.proxima_data == date(2026, 5, 10)
+
+    # Outro worker que leu a regra antes do avanço tenta lançar as mesmas datas: o índice único ignora
+    regra.proxima_data = date(2026, 2, 10)
+    db.session.commit()
+    assert materializar_recorrencias(date(2026, 4, 15)) == 0
+
+    datas = sorted(t.data for t in Transacao.query.filter_by(recorrente_id=regra.id))
+    assert datas == [date(2026, 1, 10), date(2026, 2, 10), date(2026, 3, 10), date(2026, 4, 10)]
+    resumo = {linha.mes: (linha.total, linha.quantidade) for linha in ResumoMensal.query.filter_by(usuario_id=usuario.id)}
+    assert resumo == {'2026-01': (39.9, 1), '2026-02': (39.9, 1), '2026-03': (39.9, 1), '2026-04': (39.9, 1)}
@@ -0,0 +1,46 @@
+from tests.conftest import criar_app_teste
+from extensions import db
+from models import Usuario, Transacao
+from replica import BIND_REPLICA
+from importacao import importar_transacoes, ler_csv
+from estatisticas import estatisticas_usuario, calcular_estatisticas
+from previsao import previsao_usuario, calcular_previsao
+from flask import g
+from datetime import date
+from sqlalchemy import select, func, text
+import io
+import pytest
+
+
+@pytest.fixture
+def replica_atrasada(tmp_path):
+    """
+    Principal e réplica (SQLALCHEMY_BINDS) com o mesmo usuário, mas as
+    transações só no principal, como numa réplica que ainda não recebeu a escrita.
+    """
+    replica = tmp_path / 'replica.db'
+    app = criar_app_teste(tmp_path / 'principal.db', SQLALCHEMY_BINDS={BIND_REPLICA: f'sqlite:///{replica}'})
+    with app.app_context():
+        usuario = Usuario(nome='Réplica', email='replica@exemplo.com', senha_hash='x')
+        db.session.add(usuario)
+        db.session.commit()
+        db.session.execute(text(f"VACUUM INTO '{replica}'"))
+
+        hoje = date.today().strftime('%d/%m/%Y')
+        extrato = io.StringIO(f'data;descricao;valor;categoria\n{hoje};Mercado;-150,00;Alimentação\n{hoje};Salário;3000,00;Salário\n')
+        importar_transacoes(usuario.id, ler_csv(extrato))
+        yield app, db.session.get(Usuario, usuario.id)
+
+
+def test_caches_do_dashboard_sao_calculados_no_principal(replica_atrasada):
+    app, usuario = replica_atrasada
+    esperado_estatisticas = calcular_estatisticas(usuario.id)
+    esperado_previsao = calcular_previsao(usuario.id, date.today())
+
+    with app.test_request_context():
+        g.usar_replica = True
+        assert db.session.scalar(select(func.count(Transacao.id))) == 0
+        assert estatisticas_usuario(usuario) == esperado_estatisticas
+        assert previsao_usuario(usuario) == esperado_previsao
+        # O restante da rota continua lendo da réplica
+        assert g.usar_replica is True
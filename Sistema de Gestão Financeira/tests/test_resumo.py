@@ -0,0 +1,57 @@
+from extensions import db
+from models import Transacao, ResumoMensal
+from resumo import ajustar_resumo, ajustar_resumo_em_lote, reconciliar_resumo
+from sqlalchemy import select
+
+
+def linhas_resumo(usuario):
+    return sorted(db.session.execute(select(
+        ResumoMensal.mes, ResumoMensal.tipo, ResumoMensal.categoria, ResumoMensal.total, ResumoMensal.quantidade
+    ).where(ResumoMensal.usuario_id == usuario.id)).all())
+
+
+def nova(cliente, descricao, valor, data, categoria='Lazer', tipo='despesa'):
+    cliente.post('/nova', data={'descricao': descricao, 'valor': valor, 'tipo': tipo, 'categoria': categoria, 'data': data})
+
+
+def test_resumo_acompanha_inclusao_edicao_e_exclusao(cliente, usuario):
+    nova(cliente, 'Cinema', '40.00', '2026-01-10')
+    nova(cliente, 'Show', '100.00', '2026-01-20')
+    assert linhas_resumo(usuario) == [('2026-01', 'despesa', 'Lazer', 140.0, 2)]
+
+    show = Transacao.query.filter_by(usuario_id=usuario.id, descricao='Show').one()
+    cliente.post(f'/editar/{show.id}', data={
+        'descricao': 'Show', 'valor': '120.00', 'tipo': 'despesa', 'categoria': 'Música', 'data': '2026-02-01'
+    })
+    assert linhas_resumo(usuario) == [
+        ('2026-01', 'despesa', 'Lazer', 40.0, 1),
+        ('2026-02', 'despesa', 'Música', 120.0, 1),
+    ]
+
+    cinema = Transacao.query.filter_by(usuario_id=usuario.id, descricao='Cinema').one()
+    cliente.get(f'/delete/{cinema.id}')
+    assert linhas_resumo(usuario) == [('2026-02', 'despesa', 'Música', 120.0, 1)]
+    assert reconciliar_resumo(usuario.id) == {'corrigidas': 0, 'criadas': 0, 'removidas': 0}
+
+
+def test_sem_categoria_fica_numa_linha_so(contexto, usuario):
+    ajustar_resumo(usuario.id, '2026-01', 'despesa', None, 10, 1)
+    ajustar_resumo(usuario.id, '2026-01', 'despesa', '', 5, 1)
+    ajustar_resumo_em_lote(usuario.id, {('2026-01', 'despesa', None): (1, 1), ('2026-01', 'despesa', ''): (2, 1)})
+    db.session.commit()
+    assert linhas_resumo(usuario) == [('2026-01', 'despesa', '', 18.0, 4)]
+
+    ajustar_resumo(usuario.id, '2026-01', 'despesa', None, -18, -4)
+    assert linhas_resumo(usuario) == []
+
+
+def test_lote_soma_em_linhas_existentes_e_cria_as_novas(contexto, usuario):
+    ajustar_resumo(usuario.id, '2026-01', 'receita', 'Salário', 3000, 1)
+    ajustar_resumo_em_lote(usuario.id, {
+        ('2026-01', 'receita', 'Salário'): (500.5, 1),
+        ('2026-02', 'receita', 'Salário'): (3000, 1),
+    })
+    assert linhas_resumo(usuario) == [
+        ('2026-01', 'receita', 'Salário', 3500.5, 2),
+        ('2026-02', 'receita', 'Salário', 3000.0, 1),
+    ]
@@ -0,0 +1,67 @@
+from senhas import SenhasSobrecarregadas, _executar
+import senhas
+import threading
+import time
+import pytest
+
+
+@pytest.fixture
+def pool(app, contexto, monkeypatch):
+    """Pool de hashing novo com 1 thread; devolve uma função que ocupa uma vaga até `liberar` ser setado."""
+    monkeypatch.setitem(app.config, 'SENHA_THREADS', 1)
+    monkeypatch.setattr(senhas, '_executor', None)
+    monkeypatch.setattr(senhas, '_vagas', None)
+    liberar = threading.Event()
+
+    def ocupar():
+        def rodar():
+            with app.app_context():
+                _executar(liberar.wait)
+        thread = threading.Thread(target=rodar)
+        thread.start()
+        return thread
+
+    yield ocupar, liberar
+    liberar.set()
+    if senhas._executor is not None:
+        senhas._executor.shutdown(wait=True)
+
+
+def esperar_vagas(quantidade):
+    for _ in range(200):
+        if senhas._vagas is not None and senhas._vagas._value == quantidade:
+            return
+        time.sleep(0.01)
+    raise AssertionError('vagas não ocupadas')
+
+
+def test_recusa_na_hora_com_pool_e_fila_cheios(app, pool, monkeypatch):
+    monkeypatch.setitem(app.config, 'SENHA_FILA', 1)
+    ocupar, liberar = pool
+    threads = [ocupar(), ocupar()]
+    esperar_vagas(0)
+
+    inicio = time.monotonic()
+    with pytest.raises(SenhasSobrecarregadas):
+        _executar(lambda: 'nunca')
+    assert time.monotonic() - inicio < 0.5
+
+    liberar.set()
+    for thread in threads:
+        thread.join()
+    assert _executar(lambda: 'ok') == 'ok'
+
+
+def test_hash_que_estourou_o_tempo_segura_a_vaga_ate_terminar(app, pool, monkeypatch):
+    monkeypatch.setitem(app.config, 'SENHA_FILA', 0)
+    monkeypatch.setitem(app.config, 'SENHA_TEMPO_MAXIMO', 0.05)
+    liberar = pool[1]
+
+    with pytest.raises(SenhasSobrecarregadas):
+        _executar(liberar.wait)
+    with pytest.raises(SenhasSobrecarregadas):
+        _executar(lambda: 'nunca')
+
+    liberar.set()
+    esperar_vagas(1)
+    assert _executar(lambda: 'ok') == 'ok'
@@ -0,0 +1,60 @@
+from validacao import validar_dados_transacao, validar_valor_meta
+from importacao import importar_transacoes, ler_csv
+import io
+import pytest
+
+
+def validar(valor):
+    return validar_dados_transacao('Mercado', 'Alimentação', 'despesa', valor, '2026-01-05')
+
+
+@pytest.mark.parametrize('valor', ['nan', 'NaN', 'inf', '-Infinity', 'abc', '', None, float('nan')])
+def test_valor_nao_numerico_ou_infinito(valor):
+    assert validar(valor) == (None, 'Valor inválido.')
+
+
+@pytest.mark.parametrize('valor', ['0', '-5', '0.001', '0.004', '-0.001', 0.0049])
+def test_valor_que_viraria_zero_centavos(valor):
+    assert validar(valor) == (None, 'Valor deve ser maior que zero.')
+
+
+@pytest.mark.parametrize('valor', ['1e10', '999999999.01'])
+def test_valor_muito_alto(valor):
+    assert validar(valor) == (None, 'Valor muito alto.')
+
+
+@pytest.mark.parametrize('valor, esperado', [('0.005', 0.01), ('12.345', 12.35), (' 10 ', 10.0), (19.999, 20.0)])
+def test_valor_volta_arredondado_em_centavos(valor, esperado):
+    dados, erro = validar(valor)
+    assert erro is None
+    assert dados['valor'] == esperado
+
+
+def test_importacao_rejeita_nan_e_fracoes_de_centavo(contexto):
+    extrato = io.StringIO(
+        'data;descricao;valor\n'
+        '05/01/2026;Tarifa;-0,001\n'
+        '05/01/2026;Estorno;nan\n'
+        '05/01/2026;Mercado;-12,345\n'
+    )
+    resultado = importar_transacoes(usuario_id=1, registros=ler_csv(extrato))
+    assert resultado['importadas'] == 1
+    assert resultado['erros'] == [(2, 'Valor deve ser maior que zero.'), (3, 'Valor inválido.')]
+
+
+@pytest.mark.parametrize('valor, erro', [
+    ('nan', 'Valor inválido para meta.'),
+    ('NaN', 'Valor inválido para meta.'),
+    ('inf', 'Valor inválido para meta.'),
+    ('abc', 'Valor inválido para meta.'),
+    ('-1', 'A meta deve ser um valor positivo.'),
+    ('1e10', 'Valor da meta muito alto.'),
+    ('0.001', 'A meta deve ser de pelo menos R$ 0,01.'),
+])
+def test_meta_invalida(valor, erro):
+    assert validar_valor_meta(valor) == (None, erro)
+
+
+@pytest.mark.parametrize('valor, esperado', [('0', 0), (0, 0), ('500', 500.0), ('99.999', 100.0)])
+def test_meta_valida(valor, esperado):
+    assert validar_valor_meta(valor) == (esperado, None)
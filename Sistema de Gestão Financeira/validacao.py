@@ -0,0 +1,107 @@
+import re
+from dinheiro import para_centavos, para_reais
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+def validar_senha_forte(senha):
+    """
+    Valida se a senha atende aos requisitos mínimos de segurança:
+    - Mínimo 8 caracteres
+    - Pelo menos uma letra maiúscula
+    - Pelo menos uma letra minúscula
+    - Pelo menos um número
+    - Pelo menos um caractere especial
+    """
+    if len(senha) < 8:
+        return False, "A senha deve ter no mínimo 8 caracteres."
+    
+    if not re.search(r'[A-Z]', senha):
+        return False, "A senha deve conter pelo menos uma letra maiúscula."
+    
+    if not re.search(r'[a-z]', senha):
+        return False, "A senha deve conter pelo menos uma letra minúscula."
+    
+    if not re.search(r'\d', senha):
+        return False, "A senha deve conter pelo menos um número."
+    
+    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', senha):
+        return False, "A senha deve conter pelo menos um caractere especial (!@#$%^&*(),.?\":{}|<>)."
+    
+    return True, "Senha válida."
+
+def sanitizar_texto(texto):
+    """Remove caracteres potencialmente perigosos de inputs de texto"""
+    if not texto:
+        return texto
+    # Remove tags HTML e scripts
+    texto = re.sub(r'<[^>]*>', '', texto)
+    # Remove caracteres de controle
+    texto = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', texto)
+    return texto.strip()
+
+def validar_email(email):
+    """Valida formato de email"""
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return re.match(pattern, email) is not None
+
+def validar_dados_transacao(descricao, categoria, tipo, valor, data):
+    """
+    Aplica as regras de validação de uma transação aos valores brutos do
+    formulário (strings). Retorna (dados, None) com os campos já convertidos
+    ou (None, mensagem_de_erro).
+    """
+    descricao = sanitizar_texto((descricao or '').strip())
+    categoria = sanitizar_texto((categoria or '').strip())
+
+    if not descricao or len(descricao) < 2:
+        return None, 'Descrição deve ter pelo menos 2 caracteres.'
+
+    if tipo not in ['receita', 'despesa']:
+        return None, 'Tipo de transação inválido.'
+
+    # Validado já em centavos: NaN/infinito não passam pelas comparações e
+    # valores abaixo de meio centavo seriam gravados como zero
+    try:
+        numero = Decimal(str(valor).strip())
+    except InvalidOperation:
+        return None, 'Valor inválido.'
+    if not numero.is_finite():
+        return None, 'Valor inválido.'
+    if numero > 999999999:
+        return None, 'Valor muito alto.'
+    if numero <= 0 or para_centavos(numero) <= 0:
+        return None, 'Valor deve ser maior que zero.'
+    valor = para_reais(para_centavos(numero))
+
+    try:
+        data = datetime.strptime(data or '', '%Y-%m-%d')
+    except ValueError:
+        return None, 'Data inválida.'
+
+    return {
+        'descricao': descricao,
+        'categoria': categoria,
+        'tipo': tipo,
+        'valor': valor,
+        'data': data
+    }, None
+
+def validar_valor_meta(valor):
+    """
+    Valida o valor de uma meta mensal vindo do formulário, como o valor das
+    transações: já em centavos. Zero remove a meta. Retorna (valor em reais,
+    None) ou (None, mensagem_de_erro).
+    """
+    try:
+        numero = Decimal(str(valor).strip())
+    except InvalidOperation:
+        return None, 'Valor inválido para meta.'
+    if not numero.is_finite():
+        return None, 'Valor inválido para meta.'
+    if numero < 0:
+        return None, 'A meta deve ser um valor positivo.'
+    if numero > 999999999:
+        return None, 'Valor da meta muito alto.'
+    if numero and para_centavos(numero) == 0:
+        return None, 'A meta deve ser de pelo menos R$ 0,01.'
+    return para_reais(para_centavos(numero)), None
@@ -0,0 +1,4 @@
+"""Ponto de entrada WSGI: `gunicorn wsgi:app` (o esquema vem de `flask db upgrade`)."""
+from app import create_app
+
+app = create_app()